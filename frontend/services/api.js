@@ -62,6 +62,23 @@ export const articleAPI = {
   },
 };
 
+// Sync API
+export const syncAPI = {
+  // 마지막 버전 이후 추가/삭제된 글 (since=0 이면 전체)
+  changes: async (since = 0) => {
+    const response = await api.get('/api/sync', { params: { since } });
+    return response.data;
+  },
+
+  // 학습 세션에 필요한 글, 문장 순서, 단어 힌트, 진도를 한 번에 조회
+  session: async (articleId, learnerId) => {
+    const response = await api.get(`/api/sync/session/${articleId}`, {
+      params: learnerId ? { learner_id: learnerId } : {},
+    });
+    return response.data;
+  },
+};
+
 // Translation API
 export const translationAPI = {
   // 번역 체크
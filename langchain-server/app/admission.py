@@ -0,0 +1,221 @@
+"""
+Priority-aware admission control.
+
+Every /api request is mapped to a priority class. Each class has its own
+concurrency limit, a bounded FIFO queue and a latency budget (the longest a
+request may wait for a slot). A request is rejected with 503 + Retry-After
+instead of queueing when the queue is full or when its estimated wait already
+exceeds the budget, and a queued request is shed when its deadline passes.
+
+Limits are per worker. The defaults keep the sum of class limits below the
+threadpool size so that a generation burst cannot take the threads that
+interactive grading needs:
+
+- interactive: translation checks and reviews
+- standard:    article, search and vocabulary reads
+- bulk:        content generation and bulk archive/delete
+
+Override with ADMISSION_<CLASS>_CONCURRENCY / _QUEUE / _BUDGET, or disable
+with ADMISSION_CONTROL=0. Queue depth, wait time and sheds are reported under
+admission_* in /metrics.
+"""
+import asyncio
+import json
+import math
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from .metrics import metrics
+
+
+@dataclass
+class PriorityClass:
+    name: str
+    max_concurrent: int
+    max_queue: int
+    latency_budget: float  # seconds a request may wait for a slot
+    expected_service_time: float  # initial estimate before any request finishes
+
+
+DEFAULT_CLASSES = [
+    PriorityClass("interactive", max_concurrent=16, max_queue=128, latency_budget=2.0, expected_service_time=1.0),
+    PriorityClass("standard", max_concurrent=8, max_queue=64, latency_budget=5.0, expected_service_time=0.2),
+    PriorityClass("bulk", max_concurrent=2, max_queue=8, latency_budget=30.0, expected_service_time=20.0),
+]
+
+# (method or None for any, path prefix, class); first match wins
+DEFAULT_ROUTES = [
+    ("POST", "/api/articles/generate-from-voa", "bulk"),
+    ("POST", "/api/articles/bulk", "bulk"),
+    (None, "/api/translation", "interactive"),
+    (None, "/api/review", "interactive"),
+    (None, "/api/", "standard"),
+]
+
+
+def _class_from_env(c: PriorityClass) -> PriorityClass:
+    prefix = f"ADMISSION_{c.name.upper()}_"
+    return PriorityClass(
+        c.name,
+        max_concurrent=int(os.getenv(prefix + "CONCURRENCY", c.max_concurrent)),
+        max_queue=int(os.getenv(prefix + "QUEUE", c.max_queue)),
+        latency_budget=float(os.getenv(prefix + "BUDGET", c.latency_budget)),
+        expected_service_time=c.expected_service_time,
+    )
+
+
+def latency_budget(name: str) -> float:
+    """Configured latency budget of a priority class, for work done inside its lane"""
+    return next(_class_from_env(c).latency_budget for c in DEFAULT_CLASSES if c.name == name)
+
+
+class Shed(Exception):
+    def __init__(self, reason: str, retry_after: float):
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionLane:
+    """Concurrency slots plus a FIFO wait queue for one priority class"""
+
+    SMOOTHING = 0.2
+
+    def __init__(self, priority: PriorityClass):
+        self.priority = priority
+        self.active = 0
+        self.waiters = deque()
+        self.service_time = priority.expected_service_time
+
+    def estimated_wait(self) -> float:
+        """Seconds until a newly queued request would get a slot"""
+        if self.active < self.priority.max_concurrent and not self.waiters:
+            return 0.0
+        rounds = math.ceil((len(self.waiters) + 1) / self.priority.max_concurrent)
+        return rounds * self.service_time
+
+    async def acquire(self):
+        """Take a slot, waiting up to the latency budget; raises Shed otherwise"""
+        name = self.priority.name
+        if self.active < self.priority.max_concurrent and not self.waiters:
+            self.active += 1
+            metrics.observe("admission_wait_seconds", 0.0, priority=name)
+            self._report()
+            return
+
+        estimate = self.estimated_wait()
+        if len(self.waiters) >= self.priority.max_queue:
+            raise Shed("queue_full", estimate)
+        if estimate > self.priority.latency_budget:
+            raise Shed("over_budget", estimate)
+
+        start = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        self._report()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.priority.latency_budget)
+        except asyncio.TimeoutError:
+            pass
+        except asyncio.CancelledError:
+            # Client went away while queued; hand a granted slot back
+            if waiter.done() and not waiter.cancelled():
+                self.release(None)
+            else:
+                waiter.cancel()
+                self._discard(waiter)
+            raise
+
+        if not waiter.done():
+            waiter.cancel()
+            self._discard(waiter)
+            raise Shed("deadline", self.estimated_wait())
+        metrics.observe("admission_wait_seconds", time.monotonic() - start, priority=name)
+
+    def release(self, service_time):
+        """Free a slot, passing it straight to the next live waiter"""
+        if service_time is not None:
+            self.service_time += self.SMOOTHING * (service_time - self.service_time)
+        while self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                self._report()
+                return
+        self.active -= 1
+        self._report()
+
+    def _discard(self, waiter):
+        try:
+            self.waiters.remove(waiter)
+        except ValueError:
+            pass
+        self._report()
+
+    def _report(self):
+        metrics.set_gauge("admission_queue_depth", len(self.waiters), priority=self.priority.name)
+        metrics.set_gauge("admission_in_flight", self.active, priority=self.priority.name)
+
+
+class AdmissionController:
+    def __init__(self, classes=None, routes=None):
+        self.lanes = {c.name: AdmissionLane(c) for c in (classes or DEFAULT_CLASSES)}
+        self.routes = routes or DEFAULT_ROUTES
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        return cls([_class_from_env(c) for c in DEFAULT_CLASSES])
+
+    def classify(self, method: str, path: str):
+        for route_method, prefix, name in self.routes:
+            if (route_method is None or route_method == method) and path.startswith(prefix):
+                return self.lanes[name]
+        return None
+
+
+class AdmissionMiddleware:
+    """ASGI middleware that admits, queues or sheds each request by priority"""
+
+    def __init__(self, app, controller: AdmissionController = None):
+        self.app = app
+        self.controller = controller or AdmissionController.from_env()
+        self.enabled = os.getenv("ADMISSION_CONTROL", "1") != "0"
+
+    async def __call__(self, scope, receive, send):
+        lane = None
+        if self.enabled and scope["type"] == "http":
+            lane = self.controller.classify(scope["method"], scope["path"])
+        if lane is None:
+            await self.app(scope, receive, send)
+            return
+
+        name = lane.priority.name
+        try:
+            await lane.acquire()
+        except Shed as shed:
+            metrics.inc("admission_shed_total", priority=name, reason=shed.reason)
+            await self._reject(send, shed)
+            return
+
+        metrics.inc("admission_admitted_total", priority=name)
+        start = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            lane.release(time.monotonic() - start)
+
+    @staticmethod
+    async def _reject(send, shed: Shed):
+        retry_after = str(max(1, math.ceil(shed.retry_after)))
+        body = json.dumps({"detail": "Server busy, please retry", "reason": shed.reason}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", retry_after.encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,10 @@
+from .backends import BatchBackend, BatchStatus, LocalBatchBackend, OpenAIBatchBackend
+from .pipeline import ContentBatchPipeline
+
+__all__ = [
+    "BatchBackend",
+    "BatchStatus",
+    "LocalBatchBackend",
+    "OpenAIBatchBackend",
+    "ContentBatchPipeline",
+]
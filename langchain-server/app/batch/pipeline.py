@@ -0,0 +1,334 @@
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+from sqlalchemy.orm import Session
+
+from ..models import Article
+from ..services import ArticleService
+from ..services.content_generator import ContentGeneratorService
+from ..services.content_validator import ContentValidator
+from ..services.voa_service import VOAService
+from .backends import BatchBackend, CHAT_COMPLETIONS_URL
+
+logger = logging.getLogger(__name__)
+
+# USD per 1M tokens (input, output) on the batch API, which is half the
+# synchronous price
+BATCH_PRICING = {
+    "gpt-4o-mini": (0.075, 0.30),
+}
+
+STAGES = ["collected", "written", "submitted", "downloaded", "ingested"]
+
+
+class ContentBatchPipeline:
+    """
+    Nightly library refresh through a provider batch API.
+
+    Stages, each checkpointed to <run_dir>/state.json so an interrupted run
+    resumes where it stopped:
+
+    1. collect    new VOA entries whose source_url is not in the library yet,
+                  one per source_url
+    2. write      requests.jsonl in the OpenAI batch format
+    3. submit     hand the file to the BatchBackend and wait for it to finish
+    4. download   results.jsonl
+    5. ingest     parse and validate results (ContentValidator) and insert
+                  Article/Sentence rows in bulk, committing every
+                  `ingest_chunk_size` articles; invalid output counts as failed
+
+    Token usage, estimated cost and throughput are kept in the state file and
+    appended to <run_dir>/../runs.jsonl when the run completes.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        backend: BatchBackend,
+        run_dir: str,
+        voa_service: Optional[VOAService] = None,
+        ingest_chunk_size: int = 50,
+        poll_interval: float = 60.0,
+        progress: Optional[Callable[[str], None]] = None,
+    ):
+        self.db = db
+        self.backend = backend
+        self.run_dir = run_dir
+        self.voa_service = voa_service or VOAService()
+        self.ingest_chunk_size = ingest_chunk_size
+        self.poll_interval = poll_interval
+        self.progress = progress or (lambda message: logger.info(message))
+
+        os.makedirs(run_dir, exist_ok=True)
+        self.state_path = os.path.join(run_dir, "state.json")
+        self.requests_path = os.path.join(run_dir, "requests.jsonl")
+        self.results_path = os.path.join(run_dir, "results.jsonl")
+        self.state = self._load_state()
+
+    # -- checkpointing -------------------------------------------------
+
+    def _load_state(self) -> dict:
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)
+        return {
+            "stage": None,
+            "model": ContentGeneratorService.MODEL,
+            "backend": self.backend.name,
+            "started_at": datetime.utcnow().isoformat(),
+            "entries": {},
+            "batch_id": None,
+            "ingested": [],
+            "failed": {},
+            "usage": {},  # custom_id -> [prompt_tokens, completion_tokens]
+            "elapsed_seconds": 0.0,
+        }
+
+    def _save_state(self):
+        # Write then rename so a crash never leaves a half-written checkpoint
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def _reached(self, stage: str) -> bool:
+        current = self.state["stage"]
+        return current is not None and STAGES.index(current) >= STAGES.index(stage)
+
+    def _advance(self, stage: str):
+        self.state["stage"] = stage
+        self._save_state()
+        self.progress(f"✓ {stage}")
+
+    # -- stages --------------------------------------------------------
+
+    def collect(self, difficulties: list[str], category: Optional[str] = None, limit: int = 50):
+        """Fetch VOA entries and keep the ones not yet in the library"""
+        if self._reached("collected"):
+            return
+
+        candidates = []
+        for difficulty in difficulties:
+            candidates.extend(self.voa_service.fetch_articles(difficulty=difficulty, category=category, limit=limit))
+
+        urls = [c["source_url"] for c in candidates if c.get("source_url")]
+        existing = {
+            row.source_url
+            for row in self.db.query(Article.source_url).filter(Article.source_url.in_(urls))
+        } if urls else set()
+
+        # The same story is often listed in several category or difficulty
+        # feeds; generate it once, for the first feed it appears in
+        entries, seen, duplicates = {}, set(), 0
+        for i, entry in enumerate(candidates):
+            url = entry.get("source_url")
+            if url in existing:
+                continue
+            if url and url in seen:
+                duplicates += 1
+                continue
+            seen.add(url)
+            entries[f"voa-{i:05d}"] = entry
+
+        self.state["entries"] = entries
+        self.progress(
+            f"  collected {len(entries)} new entries "
+            f"({len(candidates) - len(entries) - duplicates} already in library, {duplicates} duplicates)"
+        )
+        self._advance("collected")
+
+    def write_requests(self):
+        """Write one batch request per entry"""
+        if self._reached("written"):
+            return
+
+        with open(self.requests_path, "w", encoding="utf-8") as f:
+            for custom_id, entry in self.state["entries"].items():
+                request = {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": CHAT_COMPLETIONS_URL,
+                    "body": {
+                        "model": self.state["model"],
+                        "temperature": ContentGeneratorService.TEMPERATURE,
+                        "messages": ContentGeneratorService.render_messages(
+                            title=entry["title"],
+                            summary=entry["summary"],
+                            difficulty=entry["difficulty"],
+                            category=entry["category"],
+                        ),
+                    },
+                }
+                f.write(json.dumps(request, ensure_ascii=False) + "\n")
+
+        self._advance("written")
+
+    def submit_and_wait(self):
+        """Submit the batch (once) and poll until the backend finishes it"""
+        if self._reached("submitted"):
+            return
+        if not self.state["entries"]:
+            self._advance("submitted")
+            return
+
+        if not self.state["batch_id"]:
+            self.state["batch_id"] = self.backend.submit(self.requests_path)
+            self._save_state()
+            self.progress(f"  submitted batch {self.state['batch_id']}")
+
+        while True:
+            status = self.backend.status(self.state["batch_id"])
+            self.progress(f"  batch {status.status}: {status.completed}/{status.total} done, {status.failed} failed")
+            if status.done:
+                break
+            time.sleep(self.poll_interval)
+
+        if status.status != "completed":
+            raise RuntimeError(f"Batch {status.batch_id} ended with status '{status.status}'")
+        self._advance("submitted")
+
+    def download(self):
+        if self._reached("downloaded"):
+            return
+        if self.state["batch_id"]:
+            self.backend.download_results(self.state["batch_id"], self.results_path)
+        else:
+            open(self.results_path, "w").close()
+        self._advance("downloaded")
+
+    def _read_results(self):
+        with open(self.results_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def ingest(self):
+        """Parse results and insert articles in bulk, checkpointing every chunk"""
+        if self._reached("ingested"):
+            return
+
+        ingested = set(self.state["ingested"])
+        # A crash between a chunk's commit and its checkpoint would otherwise
+        # insert that chunk twice on resume
+        urls = [e["source_url"] for e in self.state["entries"].values() if e.get("source_url")]
+        in_library = {
+            row.source_url
+            for row in self.db.query(Article.source_url).filter(Article.source_url.in_(urls))
+        } if urls else set()
+        pending_items, pending_ids = [], []
+
+        def flush():
+            if not pending_items:
+                return
+            ArticleService.create_articles_bulk(self.db, pending_items)
+            self.state["ingested"].extend(pending_ids)
+            self._save_state()
+            self.progress(f"  ingested {len(self.state['ingested'])}/{len(self.state['entries'])}")
+            pending_items.clear()
+            pending_ids.clear()
+
+        for result in self._read_results():
+            custom_id = result["custom_id"]
+            if custom_id in ingested or custom_id in self.state["failed"]:
+                continue
+            entry = self.state["entries"].get(custom_id)
+            if entry is None or entry.get("source_url") in in_library:
+                continue
+
+            response = result.get("response") or {}
+            if result.get("error") or response.get("status_code") != 200:
+                self.state["failed"][custom_id] = str(result.get("error") or response.get("status_code"))
+                continue
+
+            body = response["body"]
+            # Keyed by request so re-reading results on resume doesn't double count
+            usage = body.get("usage") or {}
+            self.state["usage"][custom_id] = [usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)]
+
+            try:
+                content = ContentGeneratorService.parse_output(body["choices"][0]["message"]["content"])
+            except Exception as e:
+                self.state["failed"][custom_id] = f"parse error: {e}"
+                continue
+            report = ContentValidator.validate(content)
+            if not report.valid:
+                issues = [issue for part_issues in report.issues.values() for issue in part_issues]
+                self.state["failed"][custom_id] = "invalid content: " + "; ".join(issues)
+                continue
+
+            published_date = None
+            if entry.get("published_date"):
+                published_date = datetime.fromisoformat(entry["published_date"])
+
+            pending_items.append(dict(
+                title=entry["title"],
+                content=content.reading_passage,
+                difficulty=entry["difficulty"],
+                category=entry["category"],
+                source_url=entry["source_url"],
+                vocabulary=[v.model_dump() for v in content.vocabulary],
+                questions=[q.model_dump() for q in content.questions],
+                published_date=published_date,
+            ))
+            pending_ids.append(custom_id)
+            # Checkpoints written before collect() deduplicated may list a story twice
+            in_library.add(entry["source_url"])
+
+            if len(pending_items) >= self.ingest_chunk_size:
+                flush()
+
+        flush()
+        self._advance("ingested")
+
+    # -- accounting ----------------------------------------------------
+
+    def summary(self) -> dict:
+        prompt_tokens = sum(u[0] for u in self.state["usage"].values())
+        completion_tokens = sum(u[1] for u in self.state["usage"].values())
+        input_price, output_price = BATCH_PRICING.get(self.state["model"], (0.0, 0.0))
+        cost = (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+        articles = len(self.state["ingested"])
+        elapsed = self.state["elapsed_seconds"]
+        return {
+            "run_dir": self.run_dir,
+            "model": self.state["model"],
+            "backend": self.state["backend"],
+            "batch_id": self.state["batch_id"],
+            "requested": len(self.state["entries"]),
+            "ingested": articles,
+            "failed": len(self.state["failed"]),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "estimated_cost_usd": round(cost, 6),
+            "cost_per_article_usd": round(cost / articles, 6) if articles else None,
+            "elapsed_seconds": round(elapsed, 2),
+            "articles_per_minute": round(articles / elapsed * 60, 2) if elapsed else None,
+        }
+
+    def run(self, difficulties: list[str], category: Optional[str] = None, limit: int = 50) -> dict:
+        """Run (or resume) every stage and return the run summary"""
+        start = time.monotonic()
+        try:
+            self.collect(difficulties, category, limit)
+            self.write_requests()
+            self.submit_and_wait()
+            self.download()
+            self.ingest()
+        finally:
+            # Wall time accumulates across resumed invocations
+            self.state["elapsed_seconds"] += time.monotonic() - start
+            self._save_state()
+
+        summary = self.summary()
+        if self.state.get("recorded"):
+            return summary
+
+        with open(os.path.join(os.path.dirname(os.path.abspath(self.run_dir)), "runs.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps({**summary, "finished_at": datetime.utcnow().isoformat()}) + "\n")
+        self.state["recorded"] = True
+        self._save_state()
+        return summary
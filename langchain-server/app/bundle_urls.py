@@ -0,0 +1,15 @@
+"""
+Public URLs of static bundle files.
+
+Kept out of BundleService so response schemas can fill in bundle_url
+without importing the service layer.
+"""
+import os
+from typing import Optional
+
+
+def bundle_url(path: Optional[str]) -> Optional[str]:
+    """Public URL of a path relative to BUNDLE_DIR, under BUNDLE_BASE_URL"""
+    if not path:
+        return None
+    return f"{os.getenv('BUNDLE_BASE_URL', '/bundles').rstrip('/')}/{path}"
@@ -1,22 +1,106 @@
 import os
-from sqlalchemy import create_engine
+from fastapi import Request
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from .metrics import metrics
+
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./biteread.db")
 
-# SQLite needs check_same_thread=False, PostgreSQL does not
-connect_args = {"check_same_thread": False} if SQLALCHEMY_DATABASE_URL.startswith("sqlite") else {}
+# Optional read replica for read-only endpoints; writes always go to the primary
+REPLICA_DATABASE_URL = os.getenv("REPLICA_DATABASE_URL")
+
+# After a client writes, its reads stay on the primary for this many seconds
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+
+
+def _create_engine(url: str):
+    # SQLite needs check_same_thread=False, PostgreSQL does not
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    new_engine = create_engine(url, connect_args=connect_args)
+
+    if url.startswith("sqlite"):
+        # SQLite ignores foreign keys (and ON DELETE CASCADE) unless asked per connection
+        @event.listens_for(new_engine, "connect")
+        def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
+
+    return new_engine
+
+
+engine = _create_engine(SQLALCHEMY_DATABASE_URL)
+replica_engine = _create_engine(REPLICA_DATABASE_URL) if REPLICA_DATABASE_URL else None
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args=connect_args)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine or engine)
 
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency for getting database session"""
+@event.listens_for(ReplicaSessionLocal, "before_flush")
+def _reject_replica_writes(session, flush_context, instances):
+    raise RuntimeError("Sessions from get_read_db are read-only; use get_db to write")
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _mark_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _stick_to_primary(session):
+    client = session.info.get("client_key")
+    if session.info.pop("wrote", False) and client:
+        from .shared import get_shared_backend
+        try:
+            get_shared_backend().set(f"db-sticky:{client}", "1", ttl=REPLICA_STICKY_SECONDS)
+        except Exception:
+            pass
+
+
+def _client_key(request: Request) -> str:
+    """Identify a client for read-your-writes (X-Client-Id, else its address)"""
+    return request.headers.get("x-client-id") or (request.client.host if request.client else "")
+
+
+def _reads_from_primary(client: str) -> bool:
+    from .shared import get_shared_backend
+    try:
+        return get_shared_backend().get(f"db-sticky:{client}") is not None
+    except Exception:
+        # Can't tell whether the client just wrote; the primary is always safe
+        return True
+
+
+def get_db(request: Request):
+    """Dependency for a session on the primary (use for anything that writes)"""
     db = SessionLocal()
+    if replica_engine is not None:
+        db.info["client_key"] = _client_key(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_read_db(request: Request):
+    """
+    Dependency for a read-only session.
+    Uses the replica when REPLICA_DATABASE_URL is set, except for clients that
+    wrote within the last REPLICA_STICKY_SECONDS, which read from the primary
+    so they see their own writes despite replication lag.
+    """
+    if replica_engine is None:
+        db = ReplicaSessionLocal()
+    elif _reads_from_primary(_client_key(request)):
+        metrics.inc("db_reads_total", target="primary")
+        db = SessionLocal()
+    else:
+        metrics.inc("db_reads_total", target="replica")
+        db = ReplicaSessionLocal()
     try:
         yield db
     finally:
@@ -24,5 +108,22 @@ def get_db():
 
 
 def init_db():
-    """Initialize database tables"""
-    Base.metadata.create_all(bind=engine)
+    """
+    Check the schema version and apply pending migrations.
+    When the database is already current this is a single query, which keeps
+    cold starts cheap. Set AUTO_MIGRATE=0 to refuse to start instead of
+    migrating (e.g. when migrations run as a separate deploy step).
+    """
+    from .migrations import current_version, head_version, upgrade
+
+    current, head = current_version(engine), head_version()
+    if current == head:
+        return
+    if current > head:
+        raise RuntimeError(f"Database schema version {current} is newer than this code ({head})")
+    if os.getenv("AUTO_MIGRATE", "1") == "0":
+        raise RuntimeError(
+            f"Database schema is at version {current}, code expects {head}. "
+            "Run: python migrate_db.py upgrade"
+        )
+    upgrade(engine)
@@ -1,4 +1,7 @@
 from .articles import router as articles_router
 from .translation import router as translation_router
+from .vocabulary import router as vocabulary_router
+from .review import router as review_router
+from .sync import router as sync_router
 
-__all__ = ["articles_router", "translation_router"]
+__all__ = ["articles_router", "translation_router", "vocabulary_router", "review_router", "sync_router"]
@@ -1,12 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import math
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Literal, Optional
+from datetime import datetime
 
-from ..database import get_db
-from ..schemas import ArticleCreate, ArticleResponse
+from ..database import get_db, get_read_db
+from ..schemas import (
+    ArticleCreate, ArticleResponse, SearchResult, ArticleBulkRequest, ArticleBulkResponse, BundleIndexResponse
+)
+from ..models import Article
 from ..services import ArticleService
+from ..services.search_service import SearchService
+from ..services.bundle_service import BundleService
 from ..services.voa_service import VOAService
-from ..services.content_generator import ContentGeneratorService
+from ..services.content_generator import ContentGeneratorService, InvalidContentError, estimate_tokens
+from ..quota import GENERATION_MAX_BATCH, enforce_quota
+from ..shared import RateLimitExceeded
 
 router = APIRouter(prefix="/api/articles", tags=["articles"])
 
@@ -46,18 +57,80 @@ def create_article(article: ArticleCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=List[ArticleResponse])
-def get_articles(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+def get_articles(
+    skip: int = 0,
+    limit: int = 100,
+    sort: Optional[Literal["newest", "oldest", "easiest", "hardest"]] = Query(
+        None, description="'easiest'/'hardest' order by Flesch-Kincaid grade"
+    ),
+    difficulty: Optional[str] = Query(None, description="'beginner' or 'intermediate'"),
+    min_grade: Optional[float] = Query(None, description="Minimum reading grade level"),
+    max_grade: Optional[float] = Query(None, description="Maximum reading grade level"),
+    db: Session = Depends(get_read_db)
+):
     """
-    Get all articles with their sentences.
+    Get all articles with their sentences, optionally filtered and sorted by
+    reading difficulty.
     """
-    articles = ArticleService.get_all_articles(db=db, skip=skip, limit=limit)
+    articles = ArticleService.get_all_articles(
+        db=db,
+        skip=skip,
+        limit=limit,
+        sort=sort,
+        difficulty=difficulty,
+        min_grade=min_grade,
+        max_grade=max_grade
+    )
     return articles
 
 
+@router.get("/search", response_model=List[SearchResult])
+def search_articles(
+    q: str = Query(..., min_length=1, description="Words to search for in titles, passages and vocabulary"),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Full-text search over articles, ranked best first with highlighted snippets.
+    """
+    return SearchService.search(db=db, query=q, limit=limit)
+
+
+@router.get("/bundles", response_model=BundleIndexResponse)
+def get_bundle_index():
+    """
+    URLs of the static article index pages (newest first).
+    Clients read pages and articles from there instead of the list endpoint.
+    """
+    if not BundleService.enabled():
+        raise HTTPException(status_code=404, detail="Static bundles are not enabled")
+    manifest = BundleService.load_manifest()
+    return BundleIndexResponse(
+        manifest_url=BundleService.url(BundleService.MANIFEST),
+        page_size=manifest["page_size"],
+        total=manifest.get("total", 0),
+        pages=[{"page": p["page"], "url": BundleService.url(p["path"]), "count": p["count"]} for p in manifest["pages"]],
+    )
+
+
+@router.get("/{article_id}/bundle", status_code=307)
+def get_article_bundle(article_id: int, db: Session = Depends(get_read_db)):
+    """
+    Redirect to the static copy of an article.
+    """
+    bundle_path = db.query(Article.bundle_path).filter(
+        Article.id == article_id, Article.archived_at.is_(None)
+    ).scalar()
+    if not bundle_path:
+        raise HTTPException(status_code=404, detail="No bundle for this article")
+    return RedirectResponse(BundleService.url(bundle_path), status_code=307)
+
+
 @router.get("/{article_id}", response_model=ArticleResponse)
-def get_article(article_id: int, db: Session = Depends(get_db)):
+def get_article(article_id: int, db: Session = Depends(get_read_db)):
     """
     Get a specific article by ID with all sentences.
+    Archived articles are not found.
     """
     article = ArticleService.get_article(db=db, article_id=article_id)
     if not article:
@@ -69,28 +142,50 @@ def get_article(article_id: int, db: Session = Depends(get_db)):
 def delete_article(article_id: int, db: Session = Depends(get_db)):
     """
     Delete a specific article by ID.
-    This will also delete all associated sentences due to cascade delete.
+    Sentences, learner progress and vocabulary links are deleted by the
+    database (ON DELETE CASCADE).
     """
-    from ..models.article import Article
-
-    article = db.query(Article).filter(Article.id == article_id).first()
-    if not article:
+    if not ArticleService.delete_article(db=db, article_id=article_id):
         raise HTTPException(status_code=404, detail="Article not found")
 
-    db.delete(article)
-    db.commit()
-
     return {
         "message": f"Article {article_id} deleted successfully",
         "deleted_id": article_id
     }
 
 
+@router.post("/bulk", response_model=ArticleBulkResponse)
+def bulk_articles(request: ArticleBulkRequest, db: Session = Depends(get_db)):
+    """
+    Archive or delete every article matching the filters.
+    Archived articles are hidden from listings and search but keep their
+    sentences and learner progress; deletes cascade in the database.
+    At least one filter is required.
+    """
+    filters = dict(
+        category=request.category,
+        difficulty=request.difficulty,
+        created_after=request.created_after,
+        created_before=request.created_before,
+    )
+    if not any(v is not None for v in filters.values()):
+        raise HTTPException(status_code=400, detail="At least one filter is required")
+
+    if request.action == "delete":
+        ids = ArticleService.bulk_delete(db=db, **filters)
+    else:
+        ids = ArticleService.bulk_archive(db=db, **filters)
+
+    return ArticleBulkResponse(action=request.action, count=len(ids), article_ids=ids)
+
+
 @router.post("/generate-from-voa", status_code=201)
 def generate_from_voa(
+    http_request: Request,
+    http_response: Response,
     difficulty: str = Query(..., description="'beginner' or 'intermediate'"),
     category: Optional[str] = Query(None, description="VOA category (e.g., 'as_it_is', 'science', 'health')"),
-    limit: int = Query(1, description="Number of articles to generate"),
+    limit: int = Query(1, ge=1, le=GENERATION_MAX_BATCH, description="Number of articles to generate"),
     db: Session = Depends(get_db)
 ):
     """
@@ -103,7 +198,16 @@ def generate_from_voa(
     4. Returns the generated articles
 
     IMPORTANT: Original VOA content is NOT stored, only used as reference for AI rewriting.
+
+    `limit` is capped at GENERATION_MAX_BATCH. The whole `limit` is reserved
+    from the caller's generation quota up front (see app/quota.py), and
+    requests for articles that never reached the model are refunded: feeds
+    returning fewer articles, rate limiting or errors. Articles generated but
+    rejected as invalid still count, since they used the model.
     """
+    quota = enforce_quota(http_request, http_response, "generation", amount=limit)
+    attempted = 0
+
     try:
         # Get service instances
         voa_svc = get_voa_service()
@@ -120,40 +224,48 @@ def generate_from_voa(
             raise HTTPException(status_code=404, detail="No VOA articles found")
 
         generated_articles = []
+        skipped = 0
 
         # Step 2: Generate content for each article
         for voa_article in voa_articles:
-            # Generate AI-rewritten content
-            generated_content = content_gen.generate_content(
-                title=voa_article['title'],
-                summary=voa_article['summary'],
-                difficulty=difficulty,
-                category=voa_article['category']
+            # Generate AI-rewritten content, validated locally and repaired
+            # part by part before anything is stored
+            try:
+                generated_content = content_gen.generate_validated(
+                    title=voa_article['title'],
+                    summary=voa_article['summary'],
+                    difficulty=difficulty,
+                    category=voa_article['category']
+                )
+            except InvalidContentError:
+                # Still invalid after the repairs: never stored (logged and counted in metrics)
+                attempted += 1
+                skipped += 1
+                continue
+            attempted += 1
+            quota.charge_tokens(
+                estimate_tokens("".join(m["content"] for m in content_gen.render_messages(
+                    voa_article['title'], voa_article['summary'], difficulty, voa_article['category']
+                ))) + estimate_tokens(generated_content.model_dump_json())
             )
 
             # Step 3: Store in database (AI-generated content only)
-            new_article = ArticleService.create_article(
+            published_date = None
+            if voa_article.get('published_date'):
+                published_date = datetime.fromisoformat(voa_article['published_date'])
+
+            db_article = ArticleService.create_article(
                 db=db,
                 title=voa_article['title'],
-                content=generated_content.reading_passage
+                content=generated_content.reading_passage,
+                difficulty=difficulty,
+                category=voa_article['category'],
+                source_url=voa_article['source_url'],
+                vocabulary=[v.dict() for v in generated_content.vocabulary],
+                questions=[q.dict() for q in generated_content.questions],
+                published_date=published_date
             )
 
-            # Update with VOA-specific fields
-            from ..models.article import Article
-            db_article = db.query(Article).filter(Article.id == new_article.id).first()
-            db_article.difficulty = difficulty
-            db_article.category = voa_article['category']
-            db_article.source_url = voa_article['source_url']
-            db_article.vocabulary = [v.dict() for v in generated_content.vocabulary]
-            db_article.questions = [q.dict() for q in generated_content.questions]
-
-            if voa_article.get('published_date'):
-                from datetime import datetime
-                db_article.published_date = datetime.fromisoformat(voa_article['published_date'])
-
-            db.commit()
-            db.refresh(db_article)
-
             generated_articles.append({
                 "id": db_article.id,
                 "title": db_article.title,
@@ -164,10 +276,19 @@ def generate_from_voa(
 
         return {
             "message": f"Successfully generated {len(generated_articles)} articles",
-            "articles": generated_articles
+            "articles": generated_articles,
+            "skipped": skipped
         }
 
+    except RateLimitExceeded as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+        )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating content: {str(e)}")
+    finally:
+        quota.refund(limit - attempted)
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List
+
+from ..database import get_db
+from ..schemas import ReviewItem
+from ..services.srs_scheduler import SRSScheduler
+
+router = APIRouter(prefix="/api/review", tags=["review"])
+
+
+@router.get("/next", response_model=List[ReviewItem])
+def get_next_reviews(
+    learner_id: str = Query(..., min_length=1, max_length=64),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the learner's sentences that are due for review, most overdue first.
+    Schedules are updated by POST /api/translation/check when a learner_id is sent.
+    """
+    return SRSScheduler.next_due(db=db, learner_id=learner_id, limit=limit)
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from ..database import get_read_db
+from ..schemas import SyncResponse, SessionBundle
+from ..services.sync_service import SyncService
+
+router = APIRouter(prefix="/api/sync", tags=["sync"])
+
+
+@router.get("", response_model=SyncResponse)
+def sync_articles(
+    since: int = Query(0, ge=0, description="Version returned by the previous sync (0 for everything)"),
+    limit: int = Query(500, ge=1, le=2000),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Articles created and ids deleted or archived since a version token.
+    Replaces re-fetching GET /api/articles on every visit.
+    """
+    return SyncService.changes_since(db=db, since=since, limit=limit)
+
+
+@router.get("/session/{article_id}", response_model=SessionBundle)
+def get_session_bundle(
+    article_id: int,
+    learner_id: Optional[str] = Query(None, max_length=64),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Everything a study session needs in one response: the article, its
+    sentences in order with next_id resolved (no next-sentence lookups while
+    grading), per-sentence vocabulary hints and the learner's progress.
+    """
+    bundle = SyncService.session_bundle(db=db, article_id=article_id, learner_id=learner_id)
+    if bundle is None:
+        raise HTTPException(status_code=404, detail="Article not found")
+    return bundle
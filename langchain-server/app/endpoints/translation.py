@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException
+import math
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..schemas import TranslationCheckRequest, TranslationCheckResponse
 from ..services import TranslationService, ArticleService
 from ..models import Sentence
+from ..services.srs_scheduler import SRSScheduler
+from ..quota import enforce_quota
+from ..shared import RateLimitExceeded
 
 router = APIRouter(prefix="/api/translation", tags=["translation"])
 
@@ -23,24 +28,31 @@ def get_translation_service():
 @router.post("/check", response_model=TranslationCheckResponse)
 def check_translation(
     request: TranslationCheckRequest,
-    db: Session = Depends(get_db)
+    http_request: Request,
+    http_response: Response,
+    db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db)
 ):
     """
     Check user's translation against the original sentence.
     Returns feedback and next sentence if correct.
+    Charged to the caller's grading quota (see app/quota.py).
     """
     # Get the sentence
-    sentence = db.query(Sentence).filter(Sentence.id == request.sentence_id).first()
+    sentence = read_db.query(Sentence).filter(Sentence.id == request.sentence_id).first()
     if not sentence:
         raise HTTPException(status_code=404, detail="Sentence not found")
 
+    quota = enforce_quota(http_request, http_response, "grading", learner_id=request.learner_id)
+
     try:
         # Get LLM feedback
         translation_service = get_translation_service()
-        feedback_result = translation_service.check_translation(
+        feedback_result, stats = translation_service.check_translation_with_stats(
             original_sentence=sentence.text,
             user_translation=request.user_translation
         )
+        quota.charge_tokens(stats.input_tokens + stats.output_tokens)
 
         # Prepare response
         response = TranslationCheckResponse(
@@ -51,13 +63,31 @@ def check_translation(
             next_sentence_id=None
         )
 
+        # Record progress and reschedule the sentence for this learner
+        if request.learner_id:
+            progress = SRSScheduler.record_review(
+                db,
+                learner_id=request.learner_id,
+                sentence_id=sentence.id,
+                user_translation=request.user_translation,
+                result=feedback_result.result,
+                is_correct=feedback_result.is_correct
+            )
+            response.next_review_at = progress.due_at
+
         # If correct, get next sentence
         if feedback_result.is_correct:
-            next_sentence = ArticleService.get_next_sentence(db, request.sentence_id)
+            next_sentence = ArticleService.get_next_sentence(read_db, request.sentence_id)
             if next_sentence:
                 response.next_sentence_id = next_sentence.id
 
         return response
 
+    except RateLimitExceeded as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))},
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Translation check failed: {str(e)}")
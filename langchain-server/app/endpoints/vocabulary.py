@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List
+
+from ..database import get_read_db
+from ..schemas import WordArticleResponse, WordSentenceResponse, WordListEntry
+from ..services.vocabulary_service import VocabularyService
+
+router = APIRouter(prefix="/api/vocabulary", tags=["vocabulary"])
+
+
+@router.get("/", response_model=List[WordListEntry])
+def get_word_list(
+    article_ids: List[int] = Query(..., description="Articles to build the word list from"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Build a deduplicated word list from a set of articles.
+    """
+    return VocabularyService.article_word_list(db=db, article_ids=article_ids)
+
+
+@router.get("/{word}/articles", response_model=List[WordArticleResponse])
+def get_word_articles(
+    word: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_read_db)
+):
+    """
+    List articles that teach a word (matched by lemma, e.g. "studies" finds "study").
+    """
+    return VocabularyService.find_articles(db=db, word=word, skip=skip, limit=limit)
+
+
+@router.get("/{word}/sentences", response_model=List[WordSentenceResponse])
+def get_word_sentences(
+    word: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_read_db)
+):
+    """
+    List sentences in which a vocabulary word occurs.
+    """
+    return VocabularyService.find_sentences(db=db, word=word, skip=skip, limit=limit)
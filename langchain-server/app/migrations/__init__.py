@@ -0,0 +1,35 @@
+"""
+Versioned schema migrations for SQLite and PostgreSQL.
+
+Each module in app/migrations/versions defines:
+
+    VERSION = 3                 # strictly increasing integer
+    DESCRIPTION = "..."
+    def upgrade(ctx): ...       # ctx is a MigrationContext
+
+The applied version is stored in the single-row schema_version table.
+Migration steps are written to be idempotent (add_column / create_index skip
+existing objects, backfills resume from their last committed chunk), so a
+migration interrupted half way can simply be run again.
+
+Data migrations that use ORM models must restrict queries with load_only():
+the models describe the latest schema, which may have columns that do not
+exist yet at the migration's version.
+"""
+from .framework import (
+    MigrationContext,
+    Migration,
+    load_migrations,
+    current_version,
+    head_version,
+    upgrade,
+)
+
+__all__ = [
+    "MigrationContext",
+    "Migration",
+    "load_migrations",
+    "current_version",
+    "head_version",
+    "upgrade",
+]
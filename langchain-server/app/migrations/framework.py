@@ -0,0 +1,377 @@
+import importlib
+import logging
+import pkgutil
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Callable, Optional, Union
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary constant used for pg_advisory_lock so only one process migrates at a time
+PG_LOCK_ID = 7_204_531
+
+
+@dataclass
+class Migration:
+    version: int
+    description: str
+    module: ModuleType
+
+    def upgrade(self, ctx: "MigrationContext"):
+        self.module.upgrade(ctx)
+
+
+def load_migrations() -> list[Migration]:
+    """Discover migrations in app/migrations/versions, ordered by version"""
+    from . import versions
+
+    migrations = []
+    for info in pkgutil.iter_modules(versions.__path__):
+        module = importlib.import_module(f"{versions.__name__}.{info.name}")
+        migrations.append(Migration(module.VERSION, module.DESCRIPTION, module))
+
+    migrations.sort(key=lambda m: m.version)
+    seen = [m.version for m in migrations]
+    if len(seen) != len(set(seen)):
+        raise RuntimeError(f"Duplicate migration versions: {seen}")
+    return migrations
+
+
+def head_version() -> int:
+    """Latest version known to this code"""
+    migrations = load_migrations()
+    return migrations[-1].version if migrations else 0
+
+
+def current_version(engine: Engine) -> int:
+    """Version recorded in the database, 0 on a fresh database"""
+    with engine.connect() as conn:
+        if not inspect(conn).has_table("schema_version"):
+            return 0
+        return conn.execute(text("SELECT version FROM schema_version")).scalar() or 0
+
+
+def _set_version(conn: Connection, version: int):
+    conn.execute(text("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)"))
+    conn.execute(text("DELETE FROM schema_version"))
+    conn.execute(text("INSERT INTO schema_version (version) VALUES (:v)"), {"v": version})
+
+
+class MigrationContext:
+    """Helpers available to a migration's upgrade() function"""
+
+    def __init__(self, engine: Engine, version: int, progress: Optional[Callable[[str], None]] = None):
+        self.engine = engine
+        self.version = version
+        self.dialect = engine.dialect.name
+        self.progress = progress or (lambda message: logger.info(message))
+
+    @property
+    def is_postgres(self) -> bool:
+        return self.dialect == "postgresql"
+
+    @property
+    def is_sqlite(self) -> bool:
+        return self.dialect == "sqlite"
+
+    def execute(self, sql: str, params: Optional[dict] = None):
+        """Run one statement in its own transaction"""
+        with self.engine.begin() as conn:
+            conn.execute(text(sql), params or {})
+
+    def has_table(self, table: str) -> bool:
+        with self.engine.connect() as conn:
+            return inspect(conn).has_table(table)
+
+    def has_column(self, table: str, column: str) -> bool:
+        with self.engine.connect() as conn:
+            return column in {c["name"] for c in inspect(conn).get_columns(table)}
+
+    def add_column(self, table: str, column: str, ddl_type: str):
+        """ALTER TABLE ... ADD COLUMN, skipped if the column exists"""
+        if self.has_column(table, column):
+            return
+        self.execute(f'ALTER TABLE {table} ADD COLUMN {column} {ddl_type}')
+        self.progress(f"  + {table}.{column}")
+
+    def create_all(self, tables: Optional[list[str]] = None):
+        """
+        Create missing tables and their model-declared indexes: every table,
+        or only the named ones (a migration adding one table should pass it,
+        so it doesn't create tables that later migrations own).
+        """
+        from ..database import Base
+        from .. import models  # noqa: F401  (registers tables on Base)
+
+        selected = [Base.metadata.tables[name] for name in tables] if tables is not None else None
+        Base.metadata.create_all(bind=self.engine, tables=selected)
+
+    def create_index(
+        self,
+        name: str,
+        table: str,
+        columns: list[str],
+        unique: bool = False,
+        where: Optional[str] = None,
+        using: Optional[str] = None,
+    ):
+        """
+        Create an index if missing.
+
+        On PostgreSQL the index is built with CREATE INDEX CONCURRENTLY outside
+        a transaction, so writes to the table are not blocked while it builds.
+        An INVALID index left by an interrupted concurrent build is dropped and
+        rebuilt.
+        """
+        cols = ", ".join(f'"{c}"' if c == "order" else c for c in columns)
+        unique_sql = "UNIQUE " if unique else ""
+        using_sql = f" USING {using}" if using else ""
+        where_sql = f" WHERE {where}" if where else ""
+
+        if self.is_postgres:
+            with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                valid = conn.execute(
+                    text(
+                        "SELECT i.indisvalid FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+                        "WHERE c.relname = :name"
+                    ),
+                    {"name": name},
+                ).scalar()
+                if valid is True:
+                    return
+                if valid is False:
+                    self.progress(f"  ! dropping invalid index {name}")
+                    conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+                start = time.monotonic()
+                conn.execute(text(
+                    f"CREATE {unique_sql}INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                    f"ON {table}{using_sql} ({cols}){where_sql}"
+                ))
+                self.progress(f"  + index {name} ({time.monotonic() - start:.1f}s)")
+        else:
+            self.execute(f"CREATE {unique_sql}INDEX IF NOT EXISTS {name} ON {table} ({cols}){where_sql}")
+            self.progress(f"  + index {name}")
+
+    def delete_orphans(self, table: str, column: str, parent: str, parent_key: str = "id"):
+        """Delete rows whose foreign key points to a parent row that no longer exists"""
+        with self.engine.begin() as conn:
+            deleted = conn.execute(text(
+                f"DELETE FROM {table} WHERE {column} IS NOT NULL AND NOT EXISTS "
+                f"(SELECT 1 FROM {parent} p WHERE p.{parent_key} = {table}.{column})"
+            )).rowcount
+        if deleted:
+            self.progress(f"  - {deleted} orphaned rows in {table}")
+
+    def ensure_fk_ondelete(self, table: str, column: str, ondelete: str = "CASCADE"):
+        """
+        Make the foreign key on table.column use ON DELETE `ondelete`.
+
+        PostgreSQL: the constraint is re-added NOT VALID and then validated,
+        which only takes a short lock on the table.
+        SQLite can't alter constraints, so the table is rebuilt from the model
+        definition (create new, copy rows, drop old, rename), with foreign
+        key enforcement off for the rebuild.
+        """
+        with self.engine.connect() as conn:
+            fks = [fk for fk in inspect(conn).get_foreign_keys(table) if fk["constrained_columns"] == [column]]
+        if not fks:
+            raise RuntimeError(f"No foreign key on {table}.{column}")
+        fk = fks[0]
+        if (fk.get("options") or {}).get("ondelete", "").upper() == ondelete.upper():
+            return
+
+        if self.is_postgres:
+            name = fk["name"]
+            ref = f'{fk["referred_table"]} ({", ".join(fk["referred_columns"])})'
+            with self.engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT {name}"))
+                conn.execute(text(
+                    f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({column}) "
+                    f"REFERENCES {ref} ON DELETE {ondelete} NOT VALID"
+                ))
+            self.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}")
+        elif self.is_sqlite:
+            self.rebuild_sqlite_table(table)
+        else:
+            raise RuntimeError(f"ensure_fk_ondelete is not supported on {self.dialect}")
+        self.progress(f"  ~ {table}.{column} ON DELETE {ondelete}")
+
+    def rebuild_sqlite_table(self, table: str):
+        """
+        Recreate a SQLite table from its current model definition, keeping
+        the rows of every column the old and new tables have in common.
+        Follows https://www.sqlite.org/lang_altertable.html#otheralter
+        """
+        from sqlalchemy import MetaData
+        from sqlalchemy.schema import CreateTable
+        from ..database import Base
+        from .. import models  # noqa: F401  (registers tables on Base)
+
+        model_table = Base.metadata.tables[table]
+        tmp_name = f"{table}__rebuild"
+        # The copy needs the referenced tables alongside it to compile its foreign keys
+        tmp_metadata = MetaData()
+        for other in Base.metadata.tables.values():
+            if other.name != table:
+                other.to_metadata(tmp_metadata)
+        tmp_table = model_table.to_metadata(tmp_metadata, name=tmp_name)
+
+        with self.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            old_columns = {c["name"] for c in inspect(conn).get_columns(table)}
+            columns = ", ".join(f'"{c.name}"' for c in model_table.columns if c.name in old_columns)
+
+            conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+            try:
+                conn.exec_driver_sql("BEGIN")
+                try:
+                    conn.exec_driver_sql(f"DROP TABLE IF EXISTS {tmp_name}")
+                    conn.execute(CreateTable(tmp_table))
+                    conn.exec_driver_sql(f"INSERT INTO {tmp_name} ({columns}) SELECT {columns} FROM {table}")
+                    conn.exec_driver_sql(f"DROP TABLE {table}")
+                    conn.exec_driver_sql(f"ALTER TABLE {tmp_name} RENAME TO {table}")
+                    for index in model_table.indexes:
+                        index.create(conn, checkfirst=True)
+                    violations = conn.exec_driver_sql(f"PRAGMA foreign_key_check({table})").fetchall()
+                    if violations:
+                        raise RuntimeError(
+                            f"{len(violations)} rows in {table} reference missing parents; "
+                            "delete the orphans and re-run the migration"
+                        )
+                    conn.exec_driver_sql("COMMIT")
+                except Exception:
+                    conn.exec_driver_sql("ROLLBACK")
+                    raise
+            finally:
+                conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+
+    def backfill(
+        self,
+        step: str,
+        table: str,
+        chunk: Union[str, Callable[[Connection, int, int], None]],
+        chunk_size: int = 1000,
+        key: str = "id",
+    ):
+        """
+        Apply `chunk` to `table` in primary-key ranges [lo, hi), committing
+        each range separately and reporting progress.
+
+        `chunk` is either SQL using :lo and :hi bind parameters, or a callable
+        (conn, lo, hi). The last finished range is recorded in
+        schema_migration_progress, so an interrupted backfill resumes where it
+        stopped instead of starting over.
+        """
+        with self.engine.begin() as conn:
+            conn.execute(text(
+                "CREATE TABLE IF NOT EXISTS schema_migration_progress ("
+                "version INTEGER NOT NULL, step VARCHAR(100) NOT NULL, next_key BIGINT NOT NULL, "
+                "PRIMARY KEY (version, step))"
+            ))
+            resume = conn.execute(
+                text("SELECT next_key FROM schema_migration_progress WHERE version = :v AND step = :s"),
+                {"v": self.version, "s": step},
+            ).scalar()
+            bounds = conn.execute(text(f"SELECT MIN({key}), MAX({key}) FROM {table}")).one()
+
+        low, high = bounds
+        if low is None:
+            self.progress(f"  {step}: {table} is empty")
+            return
+
+        lo = resume if resume is not None else low
+        total = high - low + 1
+        start = time.monotonic()
+        if resume is not None:
+            self.progress(f"  {step}: resuming at {table}.{key} >= {lo}")
+
+        while lo <= high:
+            hi = lo + chunk_size
+            with self.engine.begin() as conn:
+                if callable(chunk):
+                    chunk(conn, lo, hi)
+                else:
+                    conn.execute(text(chunk), {"lo": lo, "hi": hi})
+                conn.execute(
+                    text("DELETE FROM schema_migration_progress WHERE version = :v AND step = :s"),
+                    {"v": self.version, "s": step},
+                )
+                conn.execute(
+                    text("INSERT INTO schema_migration_progress (version, step, next_key) VALUES (:v, :s, :k)"),
+                    {"v": self.version, "s": step, "k": hi},
+                )
+            lo = hi
+
+            done = min(lo, high + 1) - low
+            elapsed = time.monotonic() - start
+            rate = done / elapsed if elapsed > 0 else 0
+            self.progress(f"  {step}: {done}/{total} keys ({100 * done / total:.0f}%, {rate:.0f} keys/s)")
+
+        self.execute(
+            "DELETE FROM schema_migration_progress WHERE version = :v AND step = :s",
+            {"v": self.version, "s": step},
+        )
+
+
+@contextmanager
+def _migration_lock(engine: Engine):
+    """
+    Serialize concurrent starters (several workers / containers) so only one
+    process migrates and the others wait, then find the schema current.
+
+    PostgreSQL uses a session advisory lock. SQLite can only be shared by
+    processes on one host, so an flock on <database>.migrate.lock next to
+    the database file does the same. A lock connection holding BEGIN
+    IMMEDIATE would block the migration's own writes.
+    """
+    if engine.dialect.name == "postgresql":
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": PG_LOCK_ID})
+            try:
+                yield
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": PG_LOCK_ID})
+        return
+
+    database = engine.url.database if engine.dialect.name == "sqlite" else None
+    if not database or database == ":memory:" or database.startswith("file:"):
+        yield
+        return
+    with open(f"{database}.migrate.lock", "w") as lock_file:
+        try:
+            import fcntl
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        except ImportError:
+            pass
+        yield
+
+
+def upgrade(
+    engine: Engine,
+    target: Optional[int] = None,
+    progress: Optional[Callable[[str], None]] = None,
+) -> int:
+    """
+    Apply pending migrations up to `target` (default: head).
+    Returns the version the database ends at.
+    """
+    report = progress or (lambda message: logger.info(message))
+    migrations = load_migrations()
+    target = target if target is not None else (migrations[-1].version if migrations else 0)
+
+    with _migration_lock(engine):
+        # Read after taking the lock: another process may have just migrated
+        version = current_version(engine)
+        for migration in migrations:
+            if migration.version <= version or migration.version > target:
+                continue
+            report(f"Applying {migration.version:04d}: {migration.description}")
+            migration.upgrade(MigrationContext(engine, migration.version, report))
+            with engine.begin() as conn:
+                _set_version(conn, migration.version)
+            version = migration.version
+        return version
@@ -0,0 +1,31 @@
+"""Baseline: tables as of the VOA content release, plus the search index"""
+
+VERSION = 1
+DESCRIPTION = "baseline tables, VOA article columns, full-text search index"
+
+# Columns added to articles for VOA content (formerly migrate_db.py)
+VOA_COLUMNS = {
+    'difficulty': 'VARCHAR(50)',
+    'category': 'VARCHAR(100)',
+    'source_url': 'VARCHAR(1000)',
+    'vocabulary': 'JSON',
+    'questions': 'JSON',
+    'published_date': 'TIMESTAMP',
+}
+
+# Tables added by later migrations (article_changes, quota_usage) are theirs to create
+BASELINE_TABLES = [
+    "articles", "sentences", "user_progress",
+    "vocabulary_words", "article_vocabulary", "sentence_vocabulary",
+]
+
+
+def upgrade(ctx):
+    from ...services.search_service import SearchService
+
+    if ctx.has_table("articles"):
+        for column, ddl_type in VOA_COLUMNS.items():
+            ctx.add_column("articles", column, ddl_type)
+
+    ctx.create_all(BASELINE_TABLES)
+    SearchService.ensure_index(ctx.engine)
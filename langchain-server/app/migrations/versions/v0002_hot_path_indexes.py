@@ -0,0 +1,10 @@
+"""Indexes for next-sentence lookup and progress by sentence"""
+
+VERSION = 2
+DESCRIPTION = "indexes on sentences(article_id, order) and user_progress(sentence_id)"
+
+
+def upgrade(ctx):
+    # ArticleService.get_next_sentence and sentence ordering
+    ctx.create_index("ix_sentences_article_order", "sentences", ["article_id", "order"])
+    ctx.create_index("ix_user_progress_sentence_id", "user_progress", ["sentence_id"])
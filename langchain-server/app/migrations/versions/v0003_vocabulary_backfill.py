@@ -0,0 +1,30 @@
+"""Fill the normalized vocabulary tables for articles created before them"""
+
+VERSION = 3
+DESCRIPTION = "backfill vocabulary_words / article_vocabulary / sentence_vocabulary"
+
+
+def _index_chunk(conn, lo, hi):
+    from sqlalchemy.orm import Session, load_only, selectinload
+    from ...models import Article, Sentence
+    from ...services.vocabulary_service import VocabularyService
+
+    db = Session(bind=conn)
+    # Load only the columns this migration needs: later migrations add
+    # columns to these tables that don't exist yet at this version
+    articles = (
+        db.query(Article)
+        .options(
+            load_only(Article.id, Article.vocabulary),
+            selectinload(Article.sentences).load_only(Sentence.id, Sentence.article_id, Sentence.text),
+        )
+        .filter(Article.id >= lo, Article.id < hi, Article.vocabulary.isnot(None))
+        .all()
+    )
+    if articles:
+        VocabularyService.index_unlinked(db, articles)
+        db.flush()
+
+
+def upgrade(ctx):
+    ctx.backfill("vocabulary", "articles", _index_chunk, chunk_size=200)
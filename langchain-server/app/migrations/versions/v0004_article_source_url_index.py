@@ -0,0 +1,8 @@
+"""Index used to skip VOA entries that are already in the library"""
+
+VERSION = 4
+DESCRIPTION = "index on articles(source_url)"
+
+
+def upgrade(ctx):
+    ctx.create_index("ix_articles_source_url", "articles", ["source_url"])
@@ -0,0 +1,22 @@
+"""Learner identity and SM-2 schedule on user_progress"""
+
+VERSION = 6
+DESCRIPTION = "learner_id and spaced repetition schedule on user_progress"
+
+COLUMNS = {
+    'learner_id': 'VARCHAR(64)',
+    'ease_factor': 'FLOAT NOT NULL DEFAULT 2.5',
+    'interval_days': 'FLOAT NOT NULL DEFAULT 0',
+    'repetitions': 'INTEGER NOT NULL DEFAULT 0',
+    'last_result': 'VARCHAR(20)',
+    'last_reviewed_at': 'TIMESTAMP',
+    'due_at': 'TIMESTAMP',
+}
+
+
+def upgrade(ctx):
+    for column, ddl_type in COLUMNS.items():
+        ctx.add_column("user_progress", column, ddl_type)
+
+    ctx.create_index("uq_user_progress_learner_sentence", "user_progress", ["learner_id", "sentence_id"], unique=True)
+    ctx.create_index("ix_user_progress_learner_due", "user_progress", ["learner_id", "due_at"])
@@ -0,0 +1,23 @@
+"""Database-level ON DELETE CASCADE and soft-archived articles"""
+
+VERSION = 7
+DESCRIPTION = "ON DELETE CASCADE foreign keys, articles.archived_at with partial index"
+
+# (table, column, parent table), parents first so orphans are removed top-down
+CASCADES = [
+    ("sentences", "article_id", "articles"),
+    ("article_vocabulary", "article_id", "articles"),
+    ("user_progress", "sentence_id", "sentences"),
+    ("sentence_vocabulary", "sentence_id", "sentences"),
+]
+
+
+def upgrade(ctx):
+    # Deletes used to rely on the ORM, which left user_progress rows behind
+    for table, column, parent in CASCADES:
+        ctx.delete_orphans(table, column, parent)
+    for table, column, _ in CASCADES:
+        ctx.ensure_fk_ondelete(table, column, "CASCADE")
+
+    ctx.add_column("articles", "archived_at", "TIMESTAMP")
+    ctx.create_index("ix_articles_active_created", "articles", ["created_at"], where="archived_at IS NULL")
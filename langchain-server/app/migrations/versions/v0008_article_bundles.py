@@ -0,0 +1,8 @@
+"""Path of each article's static bundle (written by BundleService / export_bundles.py)"""
+
+VERSION = 8
+DESCRIPTION = "articles.bundle_path for static content-hashed bundles"
+
+
+def upgrade(ctx):
+    ctx.add_column("articles", "bundle_path", "VARCHAR(255)")
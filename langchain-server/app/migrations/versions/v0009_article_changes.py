@@ -0,0 +1,21 @@
+"""Change log for delta sync, seeded with the current library"""
+from sqlalchemy import text
+
+VERSION = 9
+DESCRIPTION = "article_changes log for delta sync"
+
+
+def upgrade(ctx):
+    if not ctx.has_table("article_changes"):
+        ctx.create_all(["article_changes"])
+        ctx.progress("  + table article_changes")
+
+    with ctx.engine.connect() as conn:
+        seeded = conn.execute(text("SELECT 1 FROM article_changes LIMIT 1")).first()
+    if not seeded:
+        # In id order, so that syncing from version 0 returns every active article
+        ctx.execute(
+            "INSERT INTO article_changes (article_id, change, created_at) "
+            "SELECT id, 'created', COALESCE(created_at, CURRENT_TIMESTAMP) FROM articles "
+            "WHERE archived_at IS NULL ORDER BY id"
+        )
@@ -0,0 +1,10 @@
+"""Persisted per-identity LLM quota usage"""
+
+VERSION = 10
+DESCRIPTION = "quota_usage table for per-learner / per-IP LLM quotas"
+
+
+def upgrade(ctx):
+    if not ctx.has_table("quota_usage"):
+        ctx.create_all(["quota_usage"])
+        ctx.progress("  + table quota_usage")
@@ -0,0 +1,45 @@
+"""Re-key the vocabulary index after the lemmatizer revision"""
+
+VERSION = 11
+DESCRIPTION = "rebuild vocabulary links with the revised lemmatizer"
+
+
+def _relink_chunk(conn, lo, hi):
+    from sqlalchemy import select
+    from sqlalchemy.orm import Session, load_only, selectinload
+    from ...models import Article, Sentence, ArticleVocabulary, SentenceVocabulary
+    from ...services.vocabulary_service import VocabularyService
+
+    db = Session(bind=conn)
+    # Load only the columns this migration needs (see v0003)
+    articles = (
+        db.query(Article)
+        .options(
+            load_only(Article.id, Article.vocabulary),
+            selectinload(Article.sentences).load_only(Sentence.id, Sentence.article_id, Sentence.text),
+        )
+        .filter(Article.id >= lo, Article.id < hi, Article.vocabulary.isnot(None))
+        .all()
+    )
+    if not articles:
+        return
+
+    # Links of a chunk are replaced in the chunk's transaction, so a re-run is safe
+    ids = [a.id for a in articles]
+    db.query(SentenceVocabulary).filter(
+        SentenceVocabulary.sentence_id.in_(select(Sentence.id).where(Sentence.article_id.in_(ids)))
+    ).delete(synchronize_session=False)
+    db.query(ArticleVocabulary).filter(ArticleVocabulary.article_id.in_(ids)).delete(synchronize_session=False)
+    for article in articles:
+        VocabularyService.link_article(db, article, article.sentences)
+    db.flush()
+
+
+def upgrade(ctx):
+    ctx.backfill("relink", "articles", _relink_chunk, chunk_size=200)
+    # Words only the old lemmas used ("studi", "mak", ...)
+    ctx.execute(
+        "DELETE FROM vocabulary_words WHERE "
+        "NOT EXISTS (SELECT 1 FROM article_vocabulary av WHERE av.word_id = vocabulary_words.id) AND "
+        "NOT EXISTS (SELECT 1 FROM sentence_vocabulary sv WHERE sv.word_id = vocabulary_words.id)"
+    )
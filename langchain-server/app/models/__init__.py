@@ -1,4 +1,16 @@
 from .article import Article, Sentence
+from .article_change import ArticleChange
 from .user_progress import UserProgress
+from .quota_usage import QuotaUsage
+from .vocabulary import VocabularyWord, ArticleVocabulary, SentenceVocabulary
 
-__all__ = ["Article", "Sentence", "UserProgress"]
+__all__ = [
+    "Article",
+    "Sentence",
+    "ArticleChange",
+    "UserProgress",
+    "QuotaUsage",
+    "VocabularyWord",
+    "ArticleVocabulary",
+    "SentenceVocabulary",
+]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, JSON, Index, Float, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
@@ -12,30 +12,61 @@ class Article(Base):
     NOT the original VOA text, to avoid copyright issues.
     """
     __tablename__ = "articles"
+    __table_args__ = (
+        # Listing queries only see active articles, so only those are indexed
+        Index(
+            "ix_articles_active_created",
+            "created_at",
+            sqlite_where=text("archived_at IS NULL"),
+            postgresql_where=text("archived_at IS NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     content = Column(Text, nullable=False)  # AI-generated reading passage
     created_at = Column(DateTime, default=datetime.utcnow)
+    archived_at = Column(DateTime, nullable=True)  # Soft-archived: hidden from listings
+    bundle_path = Column(String(255), nullable=True)  # Static bundle relative to BUNDLE_DIR (see BundleService)
 
     # New fields for VOA-sourced content
     difficulty = Column(String(50), nullable=True)  # 'beginner' or 'intermediate'
     category = Column(String(100), nullable=True)   # 'science', 'health', 'as_it_is', etc.
-    source_url = Column(String(1000), nullable=True)  # Link to original article (reference only)
+    source_url = Column(String(1000), nullable=True, index=True)  # Link to original article (reference only)
     vocabulary = Column(JSON, nullable=True)  # List of {word, definition}
     questions = Column(JSON, nullable=True)   # List of comprehension questions
     published_date = Column(DateTime, nullable=True)  # Original article publish date
 
-    sentences = relationship("Sentence", back_populates="article", cascade="all, delete-orphan")
+    # Readability features, computed at creation (see ReadabilityService)
+    word_count = Column(Integer, nullable=True)
+    mean_word_rank = Column(Float, nullable=True)  # Mean word frequency rank, lower is more common
+    reading_ease = Column(Float, nullable=True)    # Flesch reading ease, higher is easier
+    reading_grade = Column(Float, nullable=True, index=True)  # Flesch-Kincaid grade level
+
+    # Children are deleted by ON DELETE CASCADE in the database; passive_deletes
+    # keeps the ORM from loading them just to delete them row by row
+    sentences = relationship("Sentence", back_populates="article", cascade="all, delete-orphan", passive_deletes=True)
+    vocabulary_links = relationship("ArticleVocabulary", back_populates="article", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class Sentence(Base):
     __tablename__ = "sentences"
+    __table_args__ = (
+        Index("ix_sentences_article_order", "article_id", "order"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    article_id = Column(Integer, ForeignKey("articles.id"), nullable=False)
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), nullable=False)
     text = Column(Text, nullable=False)
     order = Column(Integer, nullable=False)
 
+    # Readability features, computed at creation (see ReadabilityService)
+    token_count = Column(Integer, nullable=True)
+    syllable_count = Column(Integer, nullable=True)
+    mean_word_rank = Column(Float, nullable=True)
+    reading_ease = Column(Float, nullable=True)
+    reading_grade = Column(Float, nullable=True, index=True)
+
     article = relationship("Article", back_populates="sentences")
-    progress = relationship("UserProgress", back_populates="sentence")
+    progress = relationship("UserProgress", back_populates="sentence", cascade="all, delete-orphan", passive_deletes=True)
+    vocabulary_links = relationship("SentenceVocabulary", back_populates="sentence", cascade="all, delete-orphan", passive_deletes=True)
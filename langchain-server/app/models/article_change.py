@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from ..database import Base
+
+
+class ArticleChange(Base):
+    """
+    Append-only log of library changes for delta sync (GET /api/sync).
+    The autoincrement id is the sync version: clients send the highest id
+    they have seen and get the changes after it.
+    """
+    __tablename__ = "article_changes"
+
+    id = Column(Integer, primary_key=True)
+    article_id = Column(Integer, nullable=False, index=True)  # No FK: outlives deleted articles
+    change = Column(String(16), nullable=False)  # 'created' or 'deleted' (deleted or archived)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from ..database import Base
+
+
+class QuotaUsage(Base):
+    """
+    Persisted LLM quota usage per identity and fixed window (see app/quota.py).
+    Workers add their in-memory deltas here periodically, so the row holds
+    the total across workers and survives restarts.
+    """
+    __tablename__ = "quota_usage"
+
+    identity = Column(String(128), primary_key=True)  # 'learner:<id>' or 'ip:<hash>'
+    kind = Column(String(32), primary_key=True)  # 'grading' or 'generation'
+    window_start = Column(Integer, primary_key=True)  # Unix time of the window start
+    requests = Column(Integer, nullable=False, default=0)
+    tokens = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
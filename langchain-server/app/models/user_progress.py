@@ -1,18 +1,37 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
 
 
 class UserProgress(Base):
+    """
+    A learner's progress on one sentence, including its spaced-repetition
+    schedule (see SRSScheduler).
+    """
     __tablename__ = "user_progress"
+    __table_args__ = (
+        # One row per learner and sentence
+        Index("uq_user_progress_learner_sentence", "learner_id", "sentence_id", unique=True),
+        # Review queue: WHERE learner_id = ? AND due_at <= now ORDER BY due_at
+        Index("ix_user_progress_learner_due", "learner_id", "due_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    sentence_id = Column(Integer, ForeignKey("sentences.id"), nullable=False)
+    learner_id = Column(String(64), nullable=True)  # Client-supplied learner identity
+    sentence_id = Column(Integer, ForeignKey("sentences.id", ondelete="CASCADE"), nullable=False, index=True)
     user_translation = Column(String(500))
     is_correct = Column(Boolean, default=False)
     attempts = Column(Integer, default=0)
     completed_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # Spaced repetition state (SM-2)
+    ease_factor = Column(Float, nullable=False, default=2.5)
+    interval_days = Column(Float, nullable=False, default=0.0)
+    repetitions = Column(Integer, nullable=False, default=0)
+    last_result = Column(String(20), nullable=True)  # 'perfect', 'good', or 'incorrect'
+    last_reviewed_at = Column(DateTime, nullable=True)
+    due_at = Column(DateTime, nullable=True)
+
     sentence = relationship("Sentence", back_populates="progress")
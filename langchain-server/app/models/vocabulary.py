@@ -0,0 +1,50 @@
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from ..database import Base
+
+
+class VocabularyWord(Base):
+    """
+    A normalized vocabulary entry, one row per lemma across all articles.
+    """
+    __tablename__ = "vocabulary_words"
+
+    id = Column(Integer, primary_key=True, index=True)
+    lemma = Column(String(100), nullable=False, unique=True, index=True)
+
+    articles = relationship("ArticleVocabulary", back_populates="word")
+    sentences = relationship("SentenceVocabulary", back_populates="word")
+
+
+class ArticleVocabulary(Base):
+    """Link between an article and a vocabulary word it teaches."""
+    __tablename__ = "article_vocabulary"
+    __table_args__ = (
+        UniqueConstraint("article_id", "word_id", name="uq_article_vocabulary_article_word"),
+        Index("ix_article_vocabulary_word_article", "word_id", "article_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), nullable=False)
+    word_id = Column(Integer, ForeignKey("vocabulary_words.id"), nullable=False)
+    surface = Column(String(100), nullable=False)  # Word as written in the article
+    definition = Column(Text, nullable=True)
+
+    article = relationship("Article", back_populates="vocabulary_links")
+    word = relationship("VocabularyWord", back_populates="articles")
+
+
+class SentenceVocabulary(Base):
+    """Link between a vocabulary word and a sentence where it occurs."""
+    __tablename__ = "sentence_vocabulary"
+    __table_args__ = (
+        UniqueConstraint("sentence_id", "word_id", name="uq_sentence_vocabulary_sentence_word"),
+        Index("ix_sentence_vocabulary_word_sentence", "word_id", "sentence_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    sentence_id = Column(Integer, ForeignKey("sentences.id", ondelete="CASCADE"), nullable=False)
+    word_id = Column(Integer, ForeignKey("vocabulary_words.id"), nullable=False)
+
+    sentence = relationship("Sentence", back_populates="vocabulary_links")
+    word = relationship("VocabularyWord", back_populates="sentences")
@@ -0,0 +1,448 @@
+"""
+Per-identity LLM quotas.
+
+Every grading and generation call is charged to the caller's identities:
+always its IP address (hashed) and, when known, its learner id (request body
+or X-Learner-Id header). Each identity has a request quota and a token quota
+per kind of call over a sliding window of QUOTA_WINDOW_SECONDS. The window
+is approximated from two fixed windows, the previous one weighted by how
+much of it still overlaps. IP identities get QUOTA_IP_FACTOR times the
+learner limits since several learners can share an address.
+
+Counting happens in memory. Every QUOTA_FLUSH_SECONDS a worker adds its
+deltas to the quota_usage table and replaces its counts for the identities
+it is tracking with the merged totals of all workers; an identity seen for
+the first time starts from its persisted totals. Quotas therefore survive
+restarts and are shared across workers, up to one flush interval of lag.
+Database reads and writes happen outside the manager's lock.
+
+Responses carry X-Quota-* headers. Exhausted quotas get 429 with Retry-After.
+"""
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException, Request, Response
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QuotaLimits:
+    requests: int
+    tokens: int
+
+
+DEFAULT_LIMITS = {
+    "grading": QuotaLimits(requests=300, tokens=300_000),
+    "generation": QuotaLimits(requests=10, tokens=100_000),
+}
+
+# Largest `limit` accepted by generate-from-voa
+GENERATION_MAX_BATCH = int(os.getenv("GENERATION_MAX_BATCH", "5"))
+
+
+class _Window:
+    """Usage of one identity and kind in the current and previous fixed window"""
+    __slots__ = ("start", "requests", "tokens", "prev_requests", "prev_tokens")
+
+    def __init__(self, start: int):
+        self.start = start
+        self.requests = self.tokens = 0
+        self.prev_requests = self.prev_tokens = 0
+
+
+class QuotaExceeded(Exception):
+    def __init__(self, identity: str, resource: str, retry_after: float):
+        self.identity = identity
+        self.resource = resource
+        self.retry_after = retry_after
+
+
+class QuotaManager:
+    def __init__(
+        self,
+        window: int = 3600,
+        limits: Optional[dict] = None,
+        ip_factor: float = 10.0,
+        flush_interval: float = 30.0,
+        session_factory=None,
+        clock=time.time,
+    ):
+        self.window = window
+        self.limits = limits or DEFAULT_LIMITS
+        self.ip_factor = ip_factor
+        self.flush_interval = flush_interval
+        self.session_factory = session_factory
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._windows = {}  # (identity, kind) -> _Window
+        self._pending = {}  # (identity, kind, window_start) -> [requests, tokens]
+        self._last_flush = time.monotonic()
+        self._flushing = False
+
+    @classmethod
+    def from_env(cls) -> "QuotaManager":
+        from .database import SessionLocal
+
+        limits = {
+            kind: QuotaLimits(
+                requests=int(os.getenv(f"QUOTA_{kind.upper()}_REQUESTS", default.requests)),
+                tokens=int(os.getenv(f"QUOTA_{kind.upper()}_TOKENS", default.tokens)),
+            )
+            for kind, default in DEFAULT_LIMITS.items()
+        }
+        return cls(
+            window=int(os.getenv("QUOTA_WINDOW_SECONDS", "3600")),
+            limits=limits,
+            ip_factor=float(os.getenv("QUOTA_IP_FACTOR", "10")),
+            flush_interval=float(os.getenv("QUOTA_FLUSH_SECONDS", "30")),
+            session_factory=SessionLocal,
+        )
+
+    def limits_for(self, identity: str, kind: str) -> QuotaLimits:
+        base = self.limits[kind]
+        if identity.startswith("ip:"):
+            return QuotaLimits(int(base.requests * self.ip_factor), int(base.tokens * self.ip_factor))
+        return base
+
+    def _load(self, identity: str, kind: str, start: int) -> _Window:
+        """Start from the persisted totals of the current and previous window"""
+        entry = _Window(start)
+        if self.session_factory is None:
+            return entry
+        from .models import QuotaUsage
+
+        db = self.session_factory()
+        try:
+            rows = db.query(QuotaUsage).filter(
+                QuotaUsage.identity == identity,
+                QuotaUsage.kind == kind,
+                QuotaUsage.window_start.in_([start, start - self.window]),
+            ).all()
+        except Exception as e:
+            logger.warning("Quota usage load failed: %s", e)
+            rows = []
+        finally:
+            db.close()
+        for row in rows:
+            if row.window_start == start:
+                entry.requests, entry.tokens = row.requests, row.tokens
+            else:
+                entry.prev_requests, entry.prev_tokens = row.requests, row.tokens
+        return entry
+
+    def _load_missing(self, identities: list[str], kind: str, now: float) -> dict:
+        """Persisted windows of identities not tracked yet, read without holding the lock"""
+        start = int(now // self.window) * self.window
+        with self._lock:
+            missing = [identity for identity in identities if (identity, kind) not in self._windows]
+        return {identity: self._load(identity, kind, start) for identity in missing}
+
+    def _window(self, identity: str, kind: str, now: float, loaded: dict) -> _Window:
+        """
+        Current window for an identity, rolled forward as time passes (caller
+        holds the lock). `loaded` comes from _load_missing; if another thread
+        started tracking the identity meanwhile, its window wins.
+        """
+        start = int(now // self.window) * self.window
+        entry = self._windows.get((identity, kind))
+        if entry is None:
+            entry = self._windows[(identity, kind)] = loaded.get(identity) or _Window(start)
+        if entry.start != start:
+            if entry.start == start - self.window:
+                entry.prev_requests, entry.prev_tokens = entry.requests, entry.tokens
+            else:
+                entry.prev_requests = entry.prev_tokens = 0
+            entry.start, entry.requests, entry.tokens = start, 0, 0
+        return entry
+
+    def _weight(self, entry: _Window, now: float) -> float:
+        return 1 - (now - entry.start) / self.window
+
+    def _used(self, entry: _Window, now: float) -> tuple[float, float]:
+        weight = self._weight(entry, now)
+        return entry.prev_requests * weight + entry.requests, entry.prev_tokens * weight + entry.tokens
+
+    def _retry_after(self, prev: int, current: int, allowed: float, entry: _Window, now: float) -> float:
+        """Seconds until prev * weight + current drops to `allowed`"""
+        if current <= allowed and prev > 0:
+            # The previous window decays enough before this one ends
+            return max(1.0, entry.start + self.window * (1 - (allowed - current) / prev) - now)
+        # Wait until this window becomes the previous one and decays
+        next_start = entry.start + self.window
+        return max(1.0, next_start + self.window * (1 - allowed / current) - now if current else next_start - now)
+
+    def acquire(self, identities: list[str], kind: str, amount: int = 1) -> dict:
+        """
+        Charge `amount` requests to every identity or raise QuotaExceeded.
+        Raises ValueError if `amount` exceeds a limit outright, since no
+        amount of waiting would admit it.
+        Returns the status of the tightest identity for the response headers.
+        """
+        for identity in identities:
+            limit = self.limits_for(identity, kind).requests
+            if amount > limit:
+                raise ValueError(f"{amount} {kind} requests exceed the quota of {limit} per window")
+
+        now = self.clock()
+        loaded = self._load_missing(identities, kind, now)
+        with self._lock:
+            entries = [(identity, self._window(identity, kind, now, loaded)) for identity in identities]
+            for identity, entry in entries:
+                limits = self.limits_for(identity, kind)
+                requests, tokens = self._used(entry, now)
+                if requests + amount > limits.requests:
+                    raise QuotaExceeded(identity, "requests", self._retry_after(
+                        entry.prev_requests, entry.requests, limits.requests - amount, entry, now))
+                if tokens >= limits.tokens:
+                    raise QuotaExceeded(identity, "tokens", self._retry_after(
+                        entry.prev_tokens, entry.tokens, limits.tokens - 1, entry, now))
+            for identity, entry in entries:
+                entry.requests += amount
+                self._add_pending(identity, kind, entry.start, amount, 0)
+            status = self._status(entries, kind, now)
+        self._maybe_flush()
+        return status
+
+    def charge_tokens(self, identities: list[str], kind: str, tokens: int) -> dict:
+        """Add tokens used by an admitted call; returns the updated status"""
+        now = self.clock()
+        loaded = self._load_missing(identities, kind, now)
+        with self._lock:
+            entries = [(identity, self._window(identity, kind, now, loaded)) for identity in identities]
+            for identity, entry in entries:
+                entry.tokens += tokens
+                self._add_pending(identity, kind, entry.start, 0, tokens)
+            return self._status(entries, kind, now)
+
+    def refund(self, identities: list[str], kind: str, amount: int, charged_at: float) -> Optional[dict]:
+        """
+        Give back requests taken by an acquire() at `charged_at` that went
+        unused. Returns the updated status, or None if nothing was tracked.
+        """
+        now = self.clock()
+        start = int(charged_at // self.window) * self.window
+        with self._lock:
+            entries = []
+            for identity in identities:
+                if (identity, kind) not in self._windows:
+                    continue  # forgotten after going idle: the window is too old to matter
+                entry = self._window(identity, kind, now, {})
+                if entry.start == start:
+                    entry.requests = max(0, entry.requests - amount)
+                elif entry.start == start + self.window:
+                    entry.prev_requests = max(0, entry.prev_requests - amount)
+                else:
+                    continue
+                self._add_pending(identity, kind, start, -amount, 0)
+                entries.append((identity, entry))
+            return self._status(entries, kind, now) if entries else None
+
+    def _add_pending(self, identity: str, kind: str, start: int, requests: int, tokens: int):
+        pending = self._pending.setdefault((identity, kind, start), [0, 0])
+        pending[0] += requests
+        pending[1] += tokens
+
+    def _status(self, entries: list, kind: str, now: float) -> dict:
+        status = None
+        for identity, entry in entries:
+            limits = self.limits_for(identity, kind)
+            requests, tokens = self._used(entry, now)
+            candidate = {
+                "requests_limit": limits.requests,
+                "requests_remaining": max(0, math.floor(limits.requests - requests)),
+                "tokens_limit": limits.tokens,
+                "tokens_remaining": max(0, math.floor(limits.tokens - tokens)),
+                "reset": max(0, math.ceil(entry.start + self.window - now)),
+            }
+            tightest = min(candidate["requests_remaining"] / max(1, limits.requests),
+                           candidate["tokens_remaining"] / max(1, limits.tokens))
+            if status is None or tightest < status[0]:
+                status = (tightest, candidate)
+        return status[1]
+
+    REFRESH_CHUNK_SIZE = 500
+
+    def _refresh(self, rows: list):
+        """Replace tracked counts with persisted totals plus deltas not flushed yet"""
+        with self._lock:
+            for identity, kind, start, requests, tokens in rows:
+                entry = self._windows.get((identity, kind))
+                if entry is None:
+                    continue
+                unflushed = self._pending.get((identity, kind, start), (0, 0))
+                if start == entry.start:
+                    entry.requests, entry.tokens = requests + unflushed[0], tokens + unflushed[1]
+                elif start == entry.start - self.window:
+                    entry.prev_requests, entry.prev_tokens = requests + unflushed[0], tokens + unflushed[1]
+
+    def _maybe_flush(self):
+        with self._lock:
+            if self._flushing or time.monotonic() - self._last_flush < self.flush_interval:
+                return
+            self._flushing = True
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                self._flushing = False
+
+    def flush(self):
+        """
+        Add pending deltas to quota_usage, forget identities gone idle and
+        refresh the tracked ones with the totals merged from all workers
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+            oldest = int(self.clock() // self.window) * self.window - self.window
+            for key in [k for k, entry in self._windows.items() if entry.start < oldest]:
+                del self._windows[key]
+            tracked = sorted({identity for identity, _ in self._windows})
+        if self.session_factory is None or not (pending or tracked):
+            return
+
+        from .models import QuotaUsage
+
+        db = self.session_factory()
+        try:
+            dialect = db.get_bind().dialect.name
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+            for (identity, kind, start), (requests, tokens) in pending.items():
+                statement = insert(QuotaUsage).values(
+                    identity=identity, kind=kind, window_start=start, requests=requests, tokens=tokens
+                )
+                db.execute(statement.on_conflict_do_update(
+                    index_elements=["identity", "kind", "window_start"],
+                    set_={
+                        "requests": QuotaUsage.requests + statement.excluded.requests,
+                        "tokens": QuotaUsage.tokens + statement.excluded.tokens,
+                    },
+                ))
+            db.query(QuotaUsage).filter(QuotaUsage.window_start < oldest).delete(synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            db.close()
+            logger.warning("Quota usage flush failed, will retry: %s", e)
+            with self._lock:
+                for (identity, kind, start), (requests, tokens) in pending.items():
+                    self._add_pending(identity, kind, start, requests, tokens)
+            return
+
+        # The deltas are committed now, so a failed refresh must not restore them
+        try:
+            rows = []
+            for i in range(0, len(tracked), self.REFRESH_CHUNK_SIZE):
+                rows += db.query(
+                    QuotaUsage.identity, QuotaUsage.kind, QuotaUsage.window_start, QuotaUsage.requests, QuotaUsage.tokens
+                ).filter(
+                    QuotaUsage.identity.in_(tracked[i:i + self.REFRESH_CHUNK_SIZE]),
+                    QuotaUsage.window_start >= oldest,
+                ).all()
+            self._refresh(rows)
+        except Exception as e:
+            logger.warning("Quota usage refresh failed: %s", e)
+        finally:
+            db.close()
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_quota_manager() -> QuotaManager:
+    """Get or create the process-wide quota manager"""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = QuotaManager.from_env()
+    return _manager
+
+
+def flush_quota_usage():
+    """Persist pending usage, e.g. on shutdown"""
+    if _manager is not None:
+        _manager.flush()
+
+
+def request_identities(request: Request, learner_id: Optional[str] = None) -> list[str]:
+    """Identities a call is charged to: the (hashed) client address and the learner, if known"""
+    address = request.client.host if request.client else "unknown"
+    if os.getenv("QUOTA_TRUST_FORWARDED", "0") == "1" and request.headers.get("x-forwarded-for"):
+        address = request.headers["x-forwarded-for"].split(",")[0].strip()
+    identities = ["ip:" + hashlib.sha256(address.encode()).hexdigest()[:16]]
+    learner = learner_id or request.headers.get("x-learner-id")
+    if learner:
+        identities.append("learner:" + learner[:64])
+    return identities
+
+
+class QuotaTicket:
+    """
+    An admitted call; report its token usage with charge_tokens() and hand
+    back requests it reserved but did not use with refund()
+    """
+
+    def __init__(self, manager: QuotaManager, identities: list[str], kind: str, response: Response, charged_at: float):
+        self.manager = manager
+        self.identities = identities
+        self.kind = kind
+        self.response = response
+        self.charged_at = charged_at
+
+    def charge_tokens(self, tokens: int):
+        if tokens > 0:
+            set_quota_headers(self.response, self.manager.charge_tokens(self.identities, self.kind, tokens))
+
+    def refund(self, requests: int):
+        if requests > 0:
+            status = self.manager.refund(self.identities, self.kind, requests, self.charged_at)
+            if status is not None:
+                set_quota_headers(self.response, status)
+
+
+def set_quota_headers(response: Response, status: dict):
+    response.headers["X-Quota-Requests-Limit"] = str(status["requests_limit"])
+    response.headers["X-Quota-Requests-Remaining"] = str(status["requests_remaining"])
+    response.headers["X-Quota-Tokens-Limit"] = str(status["tokens_limit"])
+    response.headers["X-Quota-Tokens-Remaining"] = str(status["tokens_remaining"])
+    response.headers["X-Quota-Reset"] = str(status["reset"])
+
+
+def enforce_quota(
+    request: Request,
+    response: Response,
+    kind: str,
+    amount: int = 1,
+    learner_id: Optional[str] = None,
+) -> QuotaTicket:
+    """Charge a call to the caller's quotas, or raise 429 with Retry-After"""
+    manager = get_quota_manager()
+    identities = request_identities(request, learner_id)
+    charged_at = manager.clock()
+    try:
+        status = manager.acquire(identities, kind, amount)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except QuotaExceeded as e:
+        metrics.inc("quota_rejections_total", kind=kind, resource=e.resource)
+        raise HTTPException(
+            status_code=429,
+            detail=f"{kind.capitalize()} {e.resource} quota exceeded, please retry later",
+            headers={"Retry-After": str(math.ceil(e.retry_after))},
+        )
+    set_quota_headers(response, status)
+    return QuotaTicket(manager, identities, kind, response, charged_at)
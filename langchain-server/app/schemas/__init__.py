@@ -1,10 +1,34 @@
-from .article import ArticleCreate, ArticleResponse, SentenceResponse
+from .article import (
+    ArticleCreate,
+    ArticleResponse,
+    SentenceResponse,
+    SearchResult,
+    ArticleBulkRequest,
+    ArticleBulkResponse,
+    BundlePage,
+    BundleIndexResponse,
+)
 from .translation import TranslationCheckRequest, TranslationCheckResponse
+from .review import ReviewItem
+from .vocabulary import WordArticleResponse, WordSentenceResponse, WordListEntry
+from .sync import ArticleSummary, SyncResponse, SessionBundle
 
 __all__ = [
     "ArticleCreate",
     "ArticleResponse",
     "SentenceResponse",
+    "SearchResult",
+    "ArticleBulkRequest",
+    "ArticleBulkResponse",
+    "BundlePage",
+    "BundleIndexResponse",
     "TranslationCheckRequest",
     "TranslationCheckResponse",
+    "ReviewItem",
+    "WordArticleResponse",
+    "WordSentenceResponse",
+    "WordListEntry",
+    "ArticleSummary",
+    "SyncResponse",
+    "SessionBundle",
 ]
@@ -1,11 +1,16 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, computed_field
 from datetime import datetime
+from typing import Literal, Optional
+
+from ..bundle_urls import bundle_url
 
 
 class SentenceResponse(BaseModel):
     id: int
     text: str
     order: int
+    token_count: Optional[int] = None
+    reading_grade: Optional[float] = None
 
     class Config:
         from_attributes = True
@@ -21,7 +26,53 @@ class ArticleResponse(BaseModel):
     title: str
     content: str
     created_at: datetime
+    difficulty: Optional[str] = None
+    word_count: Optional[int] = None
+    mean_word_rank: Optional[float] = None
+    reading_ease: Optional[float] = None
+    reading_grade: Optional[float] = None
     sentences: list[SentenceResponse] = []
+    bundle_path: Optional[str] = Field(None, exclude=True)
+
+    @computed_field
+    @property
+    def bundle_url(self) -> Optional[str]:
+        """Static copy of this article, when bundles are enabled"""
+        return bundle_url(self.bundle_path)
 
     class Config:
         from_attributes = True
+
+
+class SearchResult(BaseModel):
+    id: int
+    title: str
+    rank: float
+    snippet: str
+
+
+class ArticleBulkRequest(BaseModel):
+    action: Literal["archive", "delete"]
+    category: Optional[str] = None
+    difficulty: Optional[str] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+
+
+class ArticleBulkResponse(BaseModel):
+    action: str
+    count: int
+    article_ids: list[int]
+
+
+class BundlePage(BaseModel):
+    page: int
+    url: str
+    count: int
+
+
+class BundleIndexResponse(BaseModel):
+    manifest_url: str
+    page_size: int
+    total: int
+    pages: list[BundlePage]
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional
+
+
+class ReviewItem(BaseModel):
+    sentence_id: int
+    article_id: int
+    text: str
+    due_at: datetime
+    interval_days: float
+    repetitions: int
+    last_result: Optional[str] = None
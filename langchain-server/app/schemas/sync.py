@@ -0,0 +1,78 @@
+from pydantic import BaseModel, Field, computed_field
+from datetime import datetime
+from typing import Optional
+
+from ..bundle_urls import bundle_url
+
+
+class ArticleSummary(BaseModel):
+    id: int
+    title: str
+    created_at: datetime
+    difficulty: Optional[str] = None
+    category: Optional[str] = None
+    word_count: Optional[int] = None
+    reading_grade: Optional[float] = None
+    bundle_path: Optional[str] = Field(None, exclude=True)
+
+    @computed_field
+    @property
+    def bundle_url(self) -> Optional[str]:
+        return bundle_url(self.bundle_path)
+
+    class Config:
+        from_attributes = True
+
+
+class SyncResponse(BaseModel):
+    version: int  # Send back as `since` on the next sync
+    reset: bool  # The client's version is unknown: replace the local list
+    has_more: bool  # More changes after `version`; sync again
+    created: list[ArticleSummary]
+    deleted: list[int]
+
+
+class SessionWord(BaseModel):
+    word: str
+    definition: Optional[str] = None
+
+
+class SessionSentence(BaseModel):
+    id: int
+    text: str
+    order: int
+    next_id: Optional[int] = None
+    words: list[SessionWord] = []
+
+
+class SessionProgress(BaseModel):
+    sentence_id: int
+    is_correct: Optional[bool] = None
+    attempts: Optional[int] = None
+    last_result: Optional[str] = None
+    due_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class SessionArticle(BaseModel):
+    id: int
+    title: str
+    content: str
+    difficulty: Optional[str] = None
+    category: Optional[str] = None
+    vocabulary: Optional[list] = None
+    questions: Optional[list] = None
+    word_count: Optional[int] = None
+    reading_grade: Optional[float] = None
+
+    class Config:
+        from_attributes = True
+
+
+class SessionBundle(BaseModel):
+    article: SessionArticle
+    sentences: list[SessionSentence]
+    first_sentence_id: Optional[int] = None
+    progress: list[SessionProgress] = []  # Only when learner_id was sent
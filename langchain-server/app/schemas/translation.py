@@ -1,10 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
+from datetime import datetime
 
 
 class TranslationCheckRequest(BaseModel):
     sentence_id: int
     user_translation: str
+    learner_id: Optional[str] = Field(None, max_length=64)  # Enables progress tracking and review scheduling
 
 
 class TranslationCheckResponse(BaseModel):
@@ -13,3 +15,4 @@ class TranslationCheckResponse(BaseModel):
     feedback: Optional[str] = None
     next_sentence_id: Optional[int] = None
     original_sentence: str
+    next_review_at: Optional[datetime] = None  # Set when learner_id was sent
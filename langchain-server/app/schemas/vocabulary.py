@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class WordArticleResponse(BaseModel):
+    article_id: int
+    title: str
+    difficulty: Optional[str] = None
+    word: str
+    definition: Optional[str] = None
+
+
+class WordSentenceResponse(BaseModel):
+    sentence_id: int
+    article_id: int
+    text: str
+    order: int
+
+
+class WordListEntry(BaseModel):
+    word: str
+    definition: Optional[str] = None
+    article_ids: list[int]
@@ -1,6 +1,13 @@
 import re
+from datetime import datetime
+from typing import Optional
 from sqlalchemy.orm import Session
 from ..models import Article, Sentence
+from .search_service import SearchService
+from .vocabulary_service import VocabularyService
+from .readability import ReadabilityService
+from .bundle_service import BundleService
+from .sync_service import SyncService
 
 
 class ArticleService:
@@ -24,41 +31,200 @@ class ArticleService:
         return sentences
 
     @staticmethod
-    def create_article(db: Session, title: str, content: str) -> Article:
+    def create_article(
+        db: Session,
+        title: str,
+        content: str,
+        difficulty: Optional[str] = None,
+        category: Optional[str] = None,
+        source_url: Optional[str] = None,
+        vocabulary: Optional[list] = None,
+        questions: Optional[list] = None,
+        published_date: Optional[datetime] = None,
+    ) -> Article:
         """
         Create article and split content into sentences.
+        VOA-specific fields are optional and stored as given.
         """
-        # Create article
-        article = Article(title=title, content=content)
-        db.add(article)
-        db.flush()  # Get article.id
-
-        # Split into sentences
-        sentences_text = ArticleService.split_into_sentences(content)
-
-        # Create sentence records
-        for order, sentence_text in enumerate(sentences_text, start=1):
-            sentence = Sentence(
-                article_id=article.id,
-                text=sentence_text,
-                order=order
-            )
-            db.add(sentence)
-
-        db.commit()
+        article = ArticleService.create_articles_bulk(db, [dict(
+            title=title,
+            content=content,
+            difficulty=difficulty,
+            category=category,
+            source_url=source_url,
+            vocabulary=vocabulary,
+            questions=questions,
+            published_date=published_date,
+        )])[0]
         db.refresh(article)
 
         return article
 
+    @staticmethod
+    def create_articles_bulk(db: Session, items: list[dict]) -> list[Article]:
+        """
+        Create many articles in one transaction.
+        Each item holds Article column values (title, content and optional
+        VOA fields). Articles and sentences are inserted with one flush each
+        instead of one round trip per row.
+        """
+        articles = [Article(**item) for item in items]
+        db.add_all(articles)
+        db.flush()  # Get article ids
+
+        # Split into sentences and create sentence records
+        article_sentences = []
+        for article in articles:
+            sentences = [
+                Sentence(article_id=article.id, text=sentence_text, order=order)
+                for order, sentence_text in enumerate(
+                    ArticleService.split_into_sentences(article.content), start=1
+                )
+            ]
+            db.add_all(sentences)
+            article_sentences.append(sentences)
+        db.flush()  # Get sentence ids
+
+        for article, sentences in zip(articles, article_sentences):
+            ReadabilityService.apply(article, sentences)
+            if article.vocabulary:
+                VocabularyService.link_article(db, article, sentences)
+            SearchService.index_article(db, article)
+
+        SyncService.record(db, [a.id for a in articles], SyncService.CREATED)
+        db.commit()
+        BundleService.safely(BundleService.publish, db, articles)
+        return articles
+
     @staticmethod
     def get_article(db: Session, article_id: int) -> Article:
-        """Get article by ID with sentences."""
-        return db.query(Article).filter(Article.id == article_id).first()
+        """Get an active (not archived) article by ID with sentences."""
+        return db.query(Article).filter(Article.id == article_id, Article.archived_at.is_(None)).first()
+
+    SORT_ORDERS = {
+        "newest": (Article.created_at.desc(), Article.id.desc()),
+        "oldest": (Article.created_at.asc(), Article.id.asc()),
+        # Unscored articles go last on every backend (SQLite sorts NULL first by default)
+        "easiest": (Article.reading_grade.asc().nulls_last(), Article.id.asc()),
+        "hardest": (Article.reading_grade.desc().nulls_last(), Article.id.desc()),
+    }
+
+    @staticmethod
+    def get_all_articles(
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        sort: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        min_grade: Optional[float] = None,
+        max_grade: Optional[float] = None,
+    ) -> list[Article]:
+        """
+        Get all articles, optionally filtered by difficulty / reading grade
+        and sorted by one of SORT_ORDERS.
+        """
+        query = db.query(Article).filter(Article.archived_at.is_(None))
+        if difficulty:
+            query = query.filter(Article.difficulty == difficulty)
+        if min_grade is not None:
+            query = query.filter(Article.reading_grade >= min_grade)
+        if max_grade is not None:
+            query = query.filter(Article.reading_grade <= max_grade)
+        if sort:
+            query = query.order_by(*ArticleService.SORT_ORDERS[sort])
+        return query.offset(skip).limit(limit).all()
 
     @staticmethod
-    def get_all_articles(db: Session, skip: int = 0, limit: int = 100) -> list[Article]:
-        """Get all articles."""
-        return db.query(Article).offset(skip).limit(limit).all()
+    def delete_article(db: Session, article_id: int) -> bool:
+        """
+        Delete an article and drop it from the search index and static bundles.
+        Sentences, progress and vocabulary links are removed by ON DELETE CASCADE.
+        """
+        article = db.query(Article).filter(Article.id == article_id).first()
+        if not article:
+            return False
+
+        bundle_path = article.bundle_path
+        SearchService.remove_article(db, article_id)
+        db.delete(article)
+        SyncService.record(db, [article_id], SyncService.DELETED)
+        db.commit()
+        BundleService.safely(BundleService.remove_deleted, db, {article_id: bundle_path})
+        return True
+
+    BULK_CHUNK_SIZE = 500
+
+    @staticmethod
+    def _filtered_ids(
+        db: Session,
+        category: Optional[str],
+        difficulty: Optional[str],
+        created_after: Optional[datetime],
+        created_before: Optional[datetime],
+        include_archived: bool,
+    ) -> list[int]:
+        query = db.query(Article.id)
+        if not include_archived:
+            query = query.filter(Article.archived_at.is_(None))
+        if category:
+            query = query.filter(Article.category == category)
+        if difficulty:
+            query = query.filter(Article.difficulty == difficulty)
+        if created_after:
+            query = query.filter(Article.created_at >= created_after)
+        if created_before:
+            query = query.filter(Article.created_at < created_before)
+        return [row.id for row in query.order_by(Article.id)]
+
+    @staticmethod
+    def bulk_delete(
+        db: Session,
+        category: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+    ) -> list[int]:
+        """
+        Delete every article matching the filters (archived ones included)
+        with set-based DELETEs in chunks; the database cascades to children.
+        Returns the deleted ids.
+        """
+        ids = ArticleService._filtered_ids(db, category, difficulty, created_after, created_before, True)
+        for i in range(0, len(ids), ArticleService.BULK_CHUNK_SIZE):
+            chunk = ids[i:i + ArticleService.BULK_CHUNK_SIZE]
+            bundle_paths = dict(db.query(Article.id, Article.bundle_path).filter(Article.id.in_(chunk)).all())
+            SearchService.remove_articles(db, chunk)
+            db.query(Article).filter(Article.id.in_(chunk)).delete(synchronize_session=False)
+            SyncService.record(db, chunk, SyncService.DELETED)
+            db.commit()
+            BundleService.safely(BundleService.remove_deleted, db, bundle_paths)
+        return ids
+
+    @staticmethod
+    def bulk_archive(
+        db: Session,
+        category: Optional[str] = None,
+        difficulty: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+    ) -> list[int]:
+        """
+        Soft-archive active articles matching the filters: they disappear
+        from listings and search but keep their sentences and progress.
+        Returns the archived ids.
+        """
+        ids = ArticleService._filtered_ids(db, category, difficulty, created_after, created_before, False)
+        now = datetime.utcnow()
+        for i in range(0, len(ids), ArticleService.BULK_CHUNK_SIZE):
+            chunk = ids[i:i + ArticleService.BULK_CHUNK_SIZE]
+            SearchService.remove_articles(db, chunk)
+            db.query(Article).filter(Article.id.in_(chunk)).update(
+                {Article.archived_at: now}, synchronize_session=False
+            )
+            SyncService.record(db, chunk, SyncService.DELETED)
+            db.commit()
+            BundleService.safely(BundleService.unpublish, db, chunk)
+        return ids
 
     @staticmethod
     def get_next_sentence(db: Session, current_sentence_id: int) -> Sentence:
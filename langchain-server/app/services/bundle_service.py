@@ -0,0 +1,336 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.orm import Session, load_only, selectinload
+
+from ..bundle_urls import bundle_url
+from ..models import Article
+
+logger = logging.getLogger(__name__)
+
+
+class BundleService:
+    """
+    Static, content-hashed JSON bundles of the article library, written to
+    BUNDLE_DIR so a CDN or static host can serve reads without the API.
+
+    Layout (paths are relative to BUNDLE_DIR and to BUNDLE_BASE_URL):
+    - articles/<id>.<hash>.json      one article with sentences, vocabulary and questions
+    - index/page-<n>.<hash>.json     summaries of active articles with ids in
+                                     [n * BUNDLE_PAGE_SIZE, (n + 1) * BUNDLE_PAGE_SIZE), newest first
+    - manifest.json                  the current index pages, newest first
+
+    Hashed files never change and can be cached forever; only manifest.json
+    needs a short cache. Pages are keyed by id range rather than position, so
+    creating or deleting an article rewrites one article file, one page and
+    the manifest. Each JSON file, manifest.json included, gets a gzip twin
+    (.json.gz) unless BUNDLE_GZIP=0. Superseded pages are kept for
+    BUNDLE_RETAIN_SECONDS so clients holding an older manifest can still
+    fetch them.
+
+    The manifest is rewritten whole on every update. It holds one ~70 byte
+    entry per page plus one per page retired within BUNDLE_RETAIN_SECONDS,
+    so it grows with articles / BUNDLE_PAGE_SIZE (about 140 KB, 32 KB
+    gzipped, for 100k articles at the default 50) and with the write rate.
+    Raise BUNDLE_PAGE_SIZE or lower BUNDLE_RETAIN_SECONDS if that gets large.
+
+    Disabled unless BUNDLE_DIR is set; export_bundles.py rebuilds everything.
+    """
+
+    MANIFEST = "manifest.json"
+
+    @staticmethod
+    def root() -> Optional[str]:
+        return os.getenv("BUNDLE_DIR") or None
+
+    @staticmethod
+    def enabled() -> bool:
+        return BundleService.root() is not None
+
+    @staticmethod
+    def page_size() -> int:
+        return int(os.getenv("BUNDLE_PAGE_SIZE", "50"))
+
+    @staticmethod
+    def url(path: Optional[str]) -> Optional[str]:
+        """Public URL of a bundle path"""
+        return bundle_url(path)
+
+    @staticmethod
+    def render_article(article: Article) -> dict:
+        return {
+            "id": article.id,
+            "title": article.title,
+            "content": article.content,
+            "created_at": article.created_at,
+            "difficulty": article.difficulty,
+            "category": article.category,
+            "source_url": article.source_url,
+            "published_date": article.published_date,
+            "vocabulary": article.vocabulary or [],
+            "questions": article.questions or [],
+            "word_count": article.word_count,
+            "mean_word_rank": article.mean_word_rank,
+            "reading_ease": article.reading_ease,
+            "reading_grade": article.reading_grade,
+            "sentences": [
+                {"id": s.id, "text": s.text, "order": s.order,
+                 "token_count": s.token_count, "reading_grade": s.reading_grade}
+                for s in sorted(article.sentences, key=lambda s: s.order)
+            ],
+        }
+
+    @staticmethod
+    def render_summary(article: Article) -> dict:
+        return {
+            "id": article.id,
+            "title": article.title,
+            "created_at": article.created_at,
+            "difficulty": article.difficulty,
+            "category": article.category,
+            "reading_grade": article.reading_grade,
+            "path": article.bundle_path,
+        }
+
+    @staticmethod
+    def _encode(payload: dict) -> bytes:
+        def default(value):
+            if isinstance(value, datetime):
+                return value.isoformat()
+            raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+        return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=default).encode()
+
+    @staticmethod
+    def _write_file(path: str, data: bytes):
+        """Write atomically so readers never see a partial file"""
+        full = os.path.join(BundleService.root(), path)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        tmp = f"{full}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, full)
+
+    @staticmethod
+    def _gzip_enabled() -> bool:
+        return os.getenv("BUNDLE_GZIP", "1") != "0"
+
+    @staticmethod
+    def _write_hashed(folder: str, stem: str, payload: dict) -> str:
+        """Write payload as <folder>/<stem>.<hash>.json (plus .gz); returns the path"""
+        data = BundleService._encode(payload)
+        path = f"{folder}/{stem}.{hashlib.sha256(data).hexdigest()[:16]}.json"
+        if not os.path.exists(os.path.join(BundleService.root(), path)):
+            BundleService._write_file(path, data)
+            if BundleService._gzip_enabled():
+                # mtime=0 keeps the compressed bytes deterministic
+                BundleService._write_file(path + ".gz", gzip.compress(data, mtime=0))
+        return path
+
+    @staticmethod
+    def _write_manifest(manifest: dict):
+        data = BundleService._encode(manifest)
+        BundleService._write_file(BundleService.MANIFEST, data)
+        if BundleService._gzip_enabled():
+            BundleService._write_file(BundleService.MANIFEST + ".gz", gzip.compress(data, mtime=0))
+
+    @staticmethod
+    def _remove(path: Optional[str]):
+        if not path:
+            return
+        for suffix in ("", ".gz"):
+            try:
+                os.remove(os.path.join(BundleService.root(), path + suffix))
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    @contextmanager
+    def _locked():
+        """Serialize manifest updates across workers on this host"""
+        root = BundleService.root()
+        os.makedirs(root, exist_ok=True)
+        with open(os.path.join(root, ".lock"), "w") as lock_file:
+            try:
+                import fcntl
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            except ImportError:
+                pass
+            yield
+
+    @staticmethod
+    def load_manifest() -> dict:
+        try:
+            with open(os.path.join(BundleService.root(), BundleService.MANIFEST), "rb") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {"page_size": BundleService.page_size(), "pages": [], "retired": []}
+
+    @staticmethod
+    def _publish_files(articles: list[Article]):
+        """Write article bundles and set bundle_path (no commit)"""
+        for article in articles:
+            path = BundleService._write_hashed("articles", str(article.id), BundleService.render_article(article))
+            if article.bundle_path and article.bundle_path != path:
+                BundleService._remove(article.bundle_path)
+            article.bundle_path = path
+
+    @staticmethod
+    def _render_page(db: Session, page: int) -> Optional[dict]:
+        size = BundleService.page_size()
+        articles = db.query(Article).options(load_only(
+            Article.id, Article.title, Article.created_at, Article.difficulty,
+            Article.category, Article.reading_grade, Article.bundle_path,
+        )).filter(
+            Article.id >= page * size,
+            Article.id < (page + 1) * size,
+            Article.archived_at.is_(None),
+            Article.bundle_path.isnot(None),
+        ).order_by(Article.id.desc()).all()
+        if not articles:
+            return None
+        return {"page": page, "articles": [BundleService.render_summary(a) for a in articles]}
+
+    @staticmethod
+    def _update_pages(db: Session, pages: set[int], manifest: dict) -> dict:
+        """Re-render the given index pages into the manifest (caller holds the lock)"""
+        now = time.time()
+        retain = float(os.getenv("BUNDLE_RETAIN_SECONDS", "3600"))
+        current = {p["page"]: p for p in manifest["pages"]}
+        retired = []
+        for entry in manifest.get("retired", []):
+            if now - entry["retired_at"] > retain:
+                BundleService._remove(entry["path"])
+            else:
+                retired.append(entry)
+
+        for page in pages:
+            payload = BundleService._render_page(db, page)
+            path = BundleService._write_hashed("index", f"page-{page}", payload) if payload else None
+            old = current.pop(page, None)
+            if old and old["path"] != path:
+                retired.append({"path": old["path"], "retired_at": now})
+            if payload:
+                current[page] = {"page": page, "path": path, "count": len(payload["articles"])}
+
+        manifest = {
+            "page_size": BundleService.page_size(),
+            "updated_at": datetime.utcnow(),
+            "total": sum(p["count"] for p in current.values()),
+            "pages": [current[p] for p in sorted(current, reverse=True)],
+            "retired": retired,
+        }
+        BundleService._write_manifest(manifest)
+        return manifest
+
+    @staticmethod
+    def publish(db: Session, articles: list[Article]):
+        """Write bundles for new articles and refresh their index pages (commits)"""
+        if not BundleService.enabled() or not articles:
+            return
+        BundleService._publish_files(articles)
+        db.commit()
+        size = BundleService.page_size()
+        with BundleService._locked():
+            BundleService._update_pages(db, {a.id // size for a in articles}, BundleService.load_manifest())
+
+    @staticmethod
+    def unpublish(db: Session, article_ids: list[int]):
+        """Remove bundles of deleted or archived articles and refresh their pages (commits)"""
+        if not BundleService.enabled() or not article_ids:
+            return
+        size = BundleService.page_size()
+        rows = db.query(Article.id, Article.bundle_path).filter(
+            Article.id.in_(article_ids), Article.bundle_path.isnot(None)
+        ).all()
+        for row in rows:
+            BundleService._remove(row.bundle_path)
+        if rows:
+            db.query(Article).filter(Article.id.in_([r.id for r in rows])).update(
+                {Article.bundle_path: None}, synchronize_session=False
+            )
+            db.commit()
+        with BundleService._locked():
+            BundleService._update_pages(db, {i // size for i in article_ids}, BundleService.load_manifest())
+
+    @staticmethod
+    def remove_deleted(db: Session, bundle_paths: dict[int, Optional[str]]):
+        """Remove bundles of articles already deleted from the database"""
+        if not BundleService.enabled() or not bundle_paths:
+            return
+        for path in bundle_paths.values():
+            BundleService._remove(path)
+        size = BundleService.page_size()
+        with BundleService._locked():
+            BundleService._update_pages(db, {i // size for i in bundle_paths}, BundleService.load_manifest())
+
+    @staticmethod
+    def safely(action, *args):
+        """Run a publish step without failing the request; export_bundles.py repairs misses"""
+        try:
+            action(*args)
+        except Exception as e:
+            logger.warning("Bundle update failed: %s", e)
+
+    @staticmethod
+    def export_all(db: Session, batch_size: int = 200, progress=print) -> dict:
+        """
+        Rebuild every bundle from the database, then delete files that are no
+        longer referenced. Unchanged articles keep their hash (and file).
+        """
+        root = BundleService.root()
+        if root is None:
+            raise RuntimeError("Set BUNDLE_DIR to export bundles")
+
+        last_id, exported = 0, 0
+        while True:
+            articles = db.query(Article).options(selectinload(Article.sentences)).filter(
+                Article.id > last_id, Article.archived_at.is_(None)
+            ).order_by(Article.id).limit(batch_size).all()
+            if not articles:
+                break
+            BundleService._publish_files(articles)
+            db.commit()
+            last_id = articles[-1].id
+            exported += len(articles)
+            progress(f"  {exported} articles exported")
+
+        # Archived articles may still carry a path from before they were archived
+        db.query(Article).filter(Article.archived_at.isnot(None), Article.bundle_path.isnot(None)).update(
+            {Article.bundle_path: None}, synchronize_session=False
+        )
+        db.commit()
+
+        size = BundleService.page_size()
+        pages = {row.id // size for row in db.query(Article.id).filter(
+            Article.archived_at.is_(None), Article.bundle_path.isnot(None)
+        )}
+        with BundleService._locked():
+            # Re-render every page, including ones that are now empty
+            previous = BundleService.load_manifest()
+            pages |= {p["page"] for p in previous["pages"]}
+            manifest = BundleService._update_pages(db, pages, previous)
+
+            keep = {BundleService.MANIFEST, ".lock"}
+            keep.update(p["path"] for p in manifest["pages"])
+            keep.update(r["path"] for r in manifest["retired"])
+            keep.update(path for (path,) in db.query(Article.bundle_path).filter(Article.bundle_path.isnot(None)))
+            removed = 0
+            for folder in ("articles", "index"):
+                directory = os.path.join(root, folder)
+                if not os.path.isdir(directory):
+                    continue
+                for name in os.listdir(directory):
+                    path = f"{folder}/{name}"
+                    if path.removesuffix(".gz") not in keep:
+                        os.remove(os.path.join(directory, name))
+                        removed += 1
+
+        return {"articles": exported, "pages": len(manifest["pages"]), "removed_files": removed}
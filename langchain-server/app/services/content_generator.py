@@ -1,9 +1,13 @@
 import os
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser
+import logging
+import time
 from pydantic import BaseModel, Field
 from typing import List, Optional
+from ..admission import latency_budget
+from ..metrics import metrics
+from ..shared import RateLimitExceeded, get_openai_rate_limiter, get_bulk_rate_limiter
+
+logger = logging.getLogger(__name__)
 
 
 class VocabularyItem(BaseModel):
@@ -26,25 +30,84 @@ class GeneratedContent(BaseModel):
     questions: List[ComprehensionQuestion] = Field(description="3 comprehension questions")
 
 
+class VocabularyList(BaseModel):
+    """Vocabulary-only regeneration result"""
+    vocabulary: List[VocabularyItem] = Field(description="5 vocabulary words with definitions")
+
+
+class QuestionList(BaseModel):
+    """Questions-only regeneration result"""
+    questions: List[ComprehensionQuestion] = Field(description="3 comprehension questions")
+
+
+class InvalidContentError(Exception):
+    """Generated content still failed validation after the allowed repairs"""
+
+    def __init__(self, title: str, issues: dict[str, list[str]]):
+        super().__init__(f"Generated content for '{title}' failed validation: {issues}")
+        self.title = title
+        self.issues = issues
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English text (~4 characters per token)"""
+    return max(1, len(text) // 4)
+
+
 class ContentGeneratorService:
     """Service for generating original reading content from VOA articles using AI"""
 
+    MODEL = "gpt-4o-mini"
+    TEMPERATURE = 0.7  # Some creativity for rewriting
+
     def __init__(self):
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY not found in environment variables")
 
+        # LangChain is imported here, on first use, to keep cold starts fast
+        from langchain_openai import ChatOpenAI
+        from langchain_core.output_parsers import PydanticOutputParser
+
         # Use GPT-4o-mini for cost efficiency
         self.llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.7,  # Some creativity for rewriting
+            model=self.MODEL,
+            temperature=self.TEMPERATURE,
             api_key=api_key
         )
 
         self.parser = PydanticOutputParser(pydantic_object=GeneratedContent)
 
-        # Prompt template for copyright-safe content generation
-        self.prompt = ChatPromptTemplate.from_messages([
+        # Shares the OpenAI budget with grading across all workers, but is
+        # capped by the bulk bucket so part of it stays reserved for grading
+        self.rate_limiter = get_openai_rate_limiter()
+        self.bulk_limiter = get_bulk_rate_limiter()
+        # Generation runs inside the bulk admission lane, so a request never
+        # waits longer for rate limit tokens than the lane lets it queue
+        self.slot_timeout = latency_budget("bulk")
+
+        self.prompt = self.build_prompt()
+
+    def _acquire_llm_slot(self):
+        """
+        Take a bulk token and a shared OpenAI token within slot_timeout, or
+        raise RateLimitExceeded. The bulk token is refunded if the shared
+        bucket times out, so a failed call never spends bulk budget.
+        """
+        deadline = time.monotonic() + self.slot_timeout
+        self.bulk_limiter.acquire_or_raise(timeout=self.slot_timeout)
+        try:
+            self.rate_limiter.acquire_or_raise(timeout=max(0.0, deadline - time.monotonic()))
+        except RateLimitExceeded:
+            self.bulk_limiter.refund()
+            raise
+
+    @staticmethod
+    def build_prompt():
+        """Prompt template for copyright-safe content generation"""
+        from langchain_core.prompts import ChatPromptTemplate
+
+        return ChatPromptTemplate.from_messages([
             ("system", """You are an English learning content creator.
 
 Using the following article ONLY as a reference for ideas and facts,
@@ -85,6 +148,68 @@ Summary: {summary}
 Create a completely new reading passage based on these ideas:""")
         ])
 
+    @staticmethod
+    def build_partial_prompt(part: str):
+        """
+        Small prompt that regenerates only the vocabulary or only the questions
+        for an already accepted passage.
+        """
+        from langchain_core.prompts import ChatPromptTemplate
+
+        tasks = {
+            "vocabulary": """Select 5 key vocabulary words for {difficulty} level learners.
+- Every word MUST appear in the passage exactly as written there
+- Give a simple definition (one sentence each)""",
+            "questions": """Write 3 reading comprehension questions for {difficulty} level learners.
+- Based ONLY on the passage
+- Multiple choice with exactly 4 different options each
+- correct_answer is the index (0-3) of the correct option""",
+        }
+        return ChatPromptTemplate.from_messages([
+            ("system", "You are an English learning content creator.\n\n" + tasks[part] + "\n\n{format_instructions}"),
+            ("user", "Passage:\n{passage}")
+        ])
+
+    @staticmethod
+    def render_partial_messages(part: str, passage: str, difficulty: str) -> list[dict]:
+        """Render the partial regeneration prompt as chat messages, to estimate its size"""
+        from langchain_core.output_parsers import PydanticOutputParser
+
+        parser = PydanticOutputParser(pydantic_object=VocabularyList if part == "vocabulary" else QuestionList)
+        messages = ContentGeneratorService.build_partial_prompt(part).format_messages(
+            passage=passage,
+            difficulty=difficulty,
+            format_instructions=parser.get_format_instructions()
+        )
+        roles = {"system": "system", "human": "user", "ai": "assistant"}
+        return [{"role": roles[m.type], "content": m.content} for m in messages]
+
+    @staticmethod
+    def render_messages(title: str, summary: str, difficulty: str, category: str) -> list[dict]:
+        """
+        Render the generation prompt as OpenAI chat messages, e.g. for batch
+        API requests. Needs no API key.
+        """
+        from langchain_core.output_parsers import PydanticOutputParser
+
+        parser = PydanticOutputParser(pydantic_object=GeneratedContent)
+        messages = ContentGeneratorService.build_prompt().format_messages(
+            title=title,
+            summary=summary,
+            difficulty=difficulty,
+            category=category,
+            format_instructions=parser.get_format_instructions()
+        )
+        roles = {"system": "system", "human": "user", "ai": "assistant"}
+        return [{"role": roles[m.type], "content": m.content} for m in messages]
+
+    @staticmethod
+    def parse_output(text: str) -> GeneratedContent:
+        """Parse raw model output (JSON, optionally fenced) into GeneratedContent"""
+        from langchain_core.output_parsers import PydanticOutputParser
+
+        return PydanticOutputParser(pydantic_object=GeneratedContent).parse(text)
+
     def generate_content(
         self,
         title: str,
@@ -107,6 +232,8 @@ Create a completely new reading passage based on these ideas:""")
         Returns:
             GeneratedContent with reading passage, vocabulary, and questions
         """
+        self._acquire_llm_slot()
+
         chain = self.prompt | self.llm | self.parser
 
         result = chain.invoke({
@@ -118,3 +245,75 @@ Create a completely new reading passage based on these ideas:""")
         })
 
         return result
+
+    def _regenerate_part(self, part: str, passage: str, difficulty: str):
+        """Request only `part` ('vocabulary' or 'questions') for a passage"""
+        from langchain_core.output_parsers import PydanticOutputParser
+
+        parser = PydanticOutputParser(pydantic_object=VocabularyList if part == "vocabulary" else QuestionList)
+
+        self._acquire_llm_slot()
+
+        chain = self.build_partial_prompt(part) | self.llm | parser
+        result = chain.invoke({
+            "passage": passage,
+            "difficulty": difficulty,
+            "format_instructions": parser.get_format_instructions()
+        })
+        return getattr(result, part)
+
+    def generate_validated(
+        self,
+        title: str,
+        summary: str,
+        difficulty: str,
+        category: str,
+        max_repairs: int = 2
+    ) -> GeneratedContent:
+        """
+        Generate content and check it locally with ContentValidator.
+
+        A bad passage means a full regeneration; bad vocabulary or questions
+        are re-requested on their own with a much smaller prompt. Content
+        that is still invalid after `max_repairs` rounds raises
+        InvalidContentError rather than being stored.
+        Failures, regenerations and estimated tokens saved go to app.metrics.
+        """
+        from .content_validator import ContentValidator
+
+        content = self.generate_content(title, summary, difficulty, category)
+        full_request_tokens = estimate_tokens(
+            "".join(m["content"] for m in self.render_messages(title, summary, difficulty, category))
+        ) + estimate_tokens(content.model_dump_json())
+
+        for _ in range(max_repairs):
+            report = ContentValidator.validate(content)
+            metrics.inc("content_validation_total", result="valid" if report.valid else "invalid")
+            if report.valid:
+                return content
+
+            for part, issues in report.issues.items():
+                metrics.inc("content_validation_failures", part=part)
+                logger.info("Generated %s for '%s' failed validation: %s", part, title, "; ".join(issues))
+
+            if "passage" in report.invalid_parts:
+                metrics.inc("content_regenerations", scope="full")
+                content = self.generate_content(title, summary, difficulty, category)
+                continue
+
+            for part in sorted(report.invalid_parts):
+                metrics.inc("content_regenerations", scope=part)
+                items = self._regenerate_part(part, content.reading_passage, difficulty)
+                # The repair prompt's instructions and format spec count too
+                partial_tokens = estimate_tokens("".join(
+                    m["content"] for m in self.render_partial_messages(part, content.reading_passage, difficulty)
+                )) + estimate_tokens("".join(i.model_dump_json() for i in items))
+                metrics.inc("content_tokens_saved_estimate", max(0, full_request_tokens - partial_tokens))
+                content = content.model_copy(update={part: items})
+
+        report = ContentValidator.validate(content)
+        metrics.inc("content_validation_total", result="valid" if report.valid else "unresolved")
+        if not report.valid:
+            logger.warning("Dropping content for '%s' with unresolved issues: %s", title, report.issues)
+            raise InvalidContentError(title, report.issues)
+        return content
@@ -0,0 +1,99 @@
+from dataclasses import dataclass, field
+
+from .article_service import ArticleService
+from .vocabulary_service import VocabularyService
+from .content_generator import GeneratedContent
+
+
+@dataclass
+class ValidationReport:
+    """Problems found in generated content, grouped by the part to regenerate"""
+    issues: dict[str, list[str]] = field(default_factory=dict)
+
+    def add(self, part: str, message: str):
+        self.issues.setdefault(part, []).append(message)
+
+    @property
+    def valid(self) -> bool:
+        return not self.issues
+
+    @property
+    def invalid_parts(self) -> set[str]:
+        return set(self.issues)
+
+
+class ContentValidator:
+    """
+    Cheap local checks on GeneratedContent, run before anything is stored.
+
+    Parts are reported separately ('passage', 'vocabulary', 'questions') so
+    only the broken part needs to be requested again.
+    """
+
+    MIN_WORDS = 150
+    MAX_WORDS = 250
+    VOCABULARY_COUNT = 5
+    QUESTION_COUNT = 3
+    OPTION_COUNT = 4
+    MIN_SENTENCES = 5
+    MAX_SENTENCE_WORDS = 45
+
+    @staticmethod
+    def validate(content: GeneratedContent) -> ValidationReport:
+        report = ValidationReport()
+        ContentValidator._check_passage(content.reading_passage, report)
+        ContentValidator._check_vocabulary(content, report)
+        ContentValidator._check_questions(content, report)
+        return report
+
+    @staticmethod
+    def _check_passage(passage: str, report: ValidationReport):
+        words = len(passage.split())
+        if not ContentValidator.MIN_WORDS <= words <= ContentValidator.MAX_WORDS:
+            report.add("passage", f"passage has {words} words, expected "
+                                  f"{ContentValidator.MIN_WORDS}-{ContentValidator.MAX_WORDS}")
+
+        # The learner translates sentence by sentence, so the split must be sane
+        sentences = ArticleService.split_into_sentences(passage)
+        if len(sentences) < ContentValidator.MIN_SENTENCES:
+            report.add("passage", f"passage splits into only {len(sentences)} sentences")
+        long = [s for s in sentences if len(s.split()) > ContentValidator.MAX_SENTENCE_WORDS]
+        if long:
+            report.add("passage", f"{len(long)} sentences are longer than "
+                                  f"{ContentValidator.MAX_SENTENCE_WORDS} words")
+
+    @staticmethod
+    def _check_vocabulary(content: GeneratedContent, report: ValidationReport):
+        vocabulary = content.vocabulary
+        if len(vocabulary) != ContentValidator.VOCABULARY_COUNT:
+            report.add("vocabulary", f"{len(vocabulary)} vocabulary words, expected {ContentValidator.VOCABULARY_COUNT}")
+
+        tokens = [VocabularyService.lemmatize(t) for t in VocabularyService.WORD_PATTERN.findall(content.reading_passage)]
+        passage_lemmas = f" {' '.join(tokens)} "
+        seen = set()
+        for item in vocabulary:
+            lemma = VocabularyService.lemmatize_phrase(item.word)
+            if not lemma or not item.definition.strip():
+                report.add("vocabulary", f"vocabulary entry '{item.word}' is empty or has no definition")
+            elif f" {lemma} " not in passage_lemmas:
+                report.add("vocabulary", f"vocabulary word '{item.word}' does not appear in the passage")
+            if lemma in seen:
+                report.add("vocabulary", f"vocabulary word '{item.word}' is repeated")
+            seen.add(lemma)
+
+    @staticmethod
+    def _check_questions(content: GeneratedContent, report: ValidationReport):
+        questions = content.questions
+        if len(questions) != ContentValidator.QUESTION_COUNT:
+            report.add("questions", f"{len(questions)} questions, expected {ContentValidator.QUESTION_COUNT}")
+
+        for number, q in enumerate(questions, start=1):
+            options = [o.strip() for o in q.options]
+            if not q.question.strip():
+                report.add("questions", f"question {number} is empty")
+            if len(options) != ContentValidator.OPTION_COUNT:
+                report.add("questions", f"question {number} has {len(options)} options, expected {ContentValidator.OPTION_COUNT}")
+            if any(not o for o in options) or len(set(options)) != len(options):
+                report.add("questions", f"question {number} has empty or duplicate options")
+            if not 0 <= q.correct_answer < len(options):
+                report.add("questions", f"question {number} correct_answer {q.correct_answer} is out of range")
@@ -0,0 +1,104 @@
+import gzip
+import json
+import logging
+import os
+import random
+import re
+import threading
+from datetime import datetime
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Personal details learners sometimes type into answers
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+URL_PATTERN = re.compile(r"https?://\S+")
+# 7+ digits with spaces, dots, dashes or parentheses between them:
+# 010-1234-5678, +82 10 1234 5678, (02) 123-4567, 900101-1234567
+PHONE_PATTERN = re.compile(r"\+?\(?\d(?:[ ().-]{0,2}\d){6,}")
+DIGITS_PATTERN = re.compile(r"\d{4,}")
+
+
+def anonymize(text: str) -> str:
+    """
+    Best-effort masking of e-mail addresses, URLs, phone and id numbers
+    (7+ digits, separators included) and other runs of 4+ digits.
+    Names, addresses and other free-text details are NOT detected, so a
+    recording must still be handled as personal data.
+    """
+    text = EMAIL_PATTERN.sub("<email>", text)
+    text = URL_PATTERN.sub("<url>", text)
+    text = PHONE_PATTERN.sub("<phone>", text)
+    return DIGITS_PATTERN.sub("<number>", text)
+
+
+class GradingRecorder:
+    """
+    Opt-in, append-only log of grading calls for offline replay
+    (see replay_grading.py). Enabled by GRADING_RECORD_PATH.
+
+    One JSON object per line with short keys:
+    h (hour of the call), m (model), p (prompt version), s (sentence),
+    t (translation, anonymized), r (verdict), ok (is_correct), ms (latency),
+    ti / to (input / output tokens), c (1 when served from the cache).
+
+    No learner, request or sentence identifiers are stored. A path ending in
+    .gz is written as concatenated gzip members, one per record. Each record
+    is a single O_APPEND write, so several workers can share one file.
+    GRADING_RECORD_SAMPLE (0-1) records only a fraction of calls.
+    """
+
+    def __init__(self, path: str, sample_rate: float = 1.0):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.compress = path.endswith(".gz")
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["GradingRecorder"]:
+        path = os.getenv("GRADING_RECORD_PATH")
+        if not path:
+            return None
+        return cls(path, float(os.getenv("GRADING_RECORD_SAMPLE", "1")))
+
+    def record(self, sentence: str, translation: str, result, stats, model: str, prompt_version: str):
+        """Append one grading call; never raises"""
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return
+        entry = {
+            "h": datetime.utcnow().strftime("%Y-%m-%dT%H"),
+            "m": model,
+            "p": prompt_version,
+            "s": sentence,
+            "t": anonymize(translation),
+            "r": result.result,
+            "ok": int(result.is_correct),
+            "ms": round(stats.latency_ms),
+            "ti": stats.input_tokens,
+            "to": stats.output_tokens,
+            "c": int(stats.cached),
+        }
+        line = (json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode()
+        if self.compress:
+            line = gzip.compress(line, mtime=0)
+        try:
+            with self._lock:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+                try:
+                    os.write(fd, line)
+                finally:
+                    os.close(fd)
+        except OSError as e:
+            logger.warning("Grading record write failed: %s", e)
+
+    @staticmethod
+    def read(path: str) -> Iterator[dict]:
+        """Iterate over the records of a recording (plain or .gz)"""
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
@@ -0,0 +1,140 @@
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+# Fry's list of the 300 most frequent English words, in frequency order.
+# A word's position is its frequency rank; anything not listed is RARE_RANK.
+COMMON_WORDS = """
+the of and a to in is you that it he was for on are as with his they i at be this have
+from or one had by words but not what all were we when your can said there use an each
+which she do how their if will up other about out many then them these so some her would
+make like him into time has look two more write go see number no way could people my than
+first water been call who oil its now find long down day did get come made may part over
+new sound take only little work know place year live me back give most very after thing
+our just name good sentence man think say great where help through much before line right
+too mean old any same tell boy follow came want show also around form three small set put
+end does another well large must big even such because turn here why ask went men read
+need land different home us move try kind hand picture again change off play spell air
+away animal house point page letter mother answer found study still learn should america
+world high every near add food between own below country plant last school father keep
+tree never start city earth eye light thought head under story saw left don't few while
+along might close something seem next hard open example begin life always those both paper
+together got group often run important until children side feet car mile night walk white
+sea began grow took river four carry state once book hear stop without second later miss
+idea enough eat face watch far indian really almost let above girl sometimes mountain cut
+young talk soon list song being leave family it's
+""".split()
+
+WORD_RANKS = {word: rank for rank, word in enumerate(COMMON_WORDS, start=1)}
+RARE_RANK = 1000
+
+TOKEN_PATTERN = re.compile(r"[A-Za-z]+(?:'[A-Za-z]+)?")
+VOWEL_GROUPS = re.compile(r"[aeiouy]+")
+
+
+@lru_cache(maxsize=50_000)
+def count_syllables(word: str) -> int:
+    """Estimate syllables from vowel groups, adjusting for silent final e"""
+    word = word.lower()
+    count = len(VOWEL_GROUPS.findall(word))
+    if word.endswith("e") and not word.endswith(("le", "ee")) and count > 1:
+        count -= 1
+    return max(1, count)
+
+
+@lru_cache(maxsize=50_000)
+def word_rank(word: str) -> int:
+    """Frequency rank of a word (1 = most common), RARE_RANK when unlisted"""
+    word = word.lower()
+    rank = WORD_RANKS.get(word)
+    if rank is None and word.endswith("s"):
+        rank = WORD_RANKS.get(word[:-1])
+    return rank or RARE_RANK
+
+
+def flesch_reading_ease(words: int, sentences: int, syllables: int) -> float:
+    """Higher is easier; 60-70 is plain English"""
+    return round(206.835 - 1.015 * (words / sentences) - 84.6 * (syllables / words), 2)
+
+
+def flesch_kincaid_grade(words: int, sentences: int, syllables: int) -> float:
+    """Approximate US school grade needed to read the text"""
+    return round(0.39 * (words / sentences) + 11.8 * (syllables / words) - 15.59, 2)
+
+
+@dataclass
+class SentenceFeatures:
+    token_count: int
+    syllable_count: int
+    mean_word_rank: float
+    reading_ease: float
+    reading_grade: float
+
+
+@dataclass
+class ArticleFeatures:
+    word_count: int
+    mean_word_rank: float
+    reading_ease: float
+    reading_grade: float
+
+
+class ReadabilityService:
+    """
+    Readability and difficulty features computed once at article creation.
+
+    Features for all sentences of an article are computed in one batch: each
+    sentence is tokenized once, per-word syllable counts and ranks are
+    memoized across calls, and article scores are aggregated from the
+    per-sentence sums rather than re-scanning the text.
+    """
+
+    @staticmethod
+    def analyze_sentences(texts: list[str]) -> list[SentenceFeatures]:
+        features = []
+        for text in texts:
+            tokens = TOKEN_PATTERN.findall(text)
+            words = max(1, len(tokens))
+            syllables = sum(count_syllables(t) for t in tokens) or 1
+            rank_sum = sum(word_rank(t) for t in tokens)
+            features.append(SentenceFeatures(
+                token_count=len(tokens),
+                syllable_count=syllables,
+                mean_word_rank=round(rank_sum / words, 2),
+                reading_ease=flesch_reading_ease(words, 1, syllables),
+                reading_grade=flesch_kincaid_grade(words, 1, syllables),
+            ))
+        return features
+
+    @staticmethod
+    def aggregate(features: list[SentenceFeatures]) -> ArticleFeatures:
+        """Article-level scores from per-sentence features"""
+        sentences = max(1, len(features))
+        words = sum(f.token_count for f in features)
+        syllables = sum(f.syllable_count for f in features)
+        if not words:
+            return ArticleFeatures(0, 0.0, 0.0, 0.0)
+        rank_sum = sum(f.mean_word_rank * f.token_count for f in features)
+        return ArticleFeatures(
+            word_count=words,
+            mean_word_rank=round(rank_sum / words, 2),
+            reading_ease=flesch_reading_ease(words, sentences, syllables),
+            reading_grade=flesch_kincaid_grade(words, sentences, syllables),
+        )
+
+    @staticmethod
+    def apply(article, sentences: list):
+        """Compute and set feature columns on an Article and its Sentence rows (no commit)"""
+        features = ReadabilityService.analyze_sentences([s.text for s in sentences])
+        for sentence, f in zip(sentences, features):
+            sentence.token_count = f.token_count
+            sentence.syllable_count = f.syllable_count
+            sentence.mean_word_rank = f.mean_word_rank
+            sentence.reading_ease = f.reading_ease
+            sentence.reading_grade = f.reading_grade
+
+        summary = ReadabilityService.aggregate(features)
+        article.word_count = summary.word_count
+        article.mean_word_rank = summary.mean_word_rank
+        article.reading_ease = summary.reading_ease
+        article.reading_grade = summary.reading_grade
@@ -0,0 +1,175 @@
+from sqlalchemy import text, bindparam
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from ..models import Article
+
+
+class SearchService:
+    """
+    Full-text search over articles backed by an index inside the database.
+
+    - SQLite: an FTS5 virtual table (articles_fts) keyed by article id,
+      ranked with bm25() and highlighted with snippet().
+    - PostgreSQL: a weighted tsvector column on articles with a GIN index,
+      ranked with ts_rank() and highlighted with ts_headline().
+
+    The index covers the title, the reading passage and the vocabulary words.
+    It is maintained explicitly by the article create/delete/archive paths.
+    """
+
+    SNIPPET_START = "<b>"
+    SNIPPET_END = "</b>"
+
+    @staticmethod
+    def ensure_index(engine: Engine):
+        """Create the search index if missing and backfill existing articles."""
+        with engine.begin() as conn:
+            if engine.dialect.name == "sqlite":
+                exists = conn.execute(text(
+                    "SELECT 1 FROM sqlite_master WHERE type='table' AND name='articles_fts'"
+                )).first()
+                if exists:
+                    return
+                conn.execute(text(
+                    "CREATE VIRTUAL TABLE articles_fts USING fts5("
+                    "title, content, vocabulary, tokenize='porter unicode61')"
+                ))
+                conn.execute(text(
+                    "INSERT INTO articles_fts(rowid, title, content, vocabulary) "
+                    "SELECT a.id, a.title, a.content, "
+                    "COALESCE((SELECT group_concat(json_extract(v.value, '$.word'), ' ') "
+                    "FROM json_each(a.vocabulary) v), '') "
+                    "FROM articles a"
+                ))
+            elif engine.dialect.name == "postgresql":
+                conn.execute(text(
+                    "ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector"
+                ))
+                conn.execute(text(
+                    "CREATE INDEX IF NOT EXISTS ix_articles_search_vector "
+                    "ON articles USING GIN (search_vector)"
+                ))
+                conn.execute(text(
+                    "UPDATE articles SET search_vector = "
+                    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+                    "setweight(to_tsvector('english', coalesce((SELECT string_agg(v->>'word', ' ') "
+                    "FROM json_array_elements(articles.vocabulary) v), '')), 'A') || "
+                    "setweight(to_tsvector('english', coalesce(content, '')), 'B') "
+                    "WHERE search_vector IS NULL"
+                ))
+
+    @staticmethod
+    def vocabulary_words(vocabulary) -> str:
+        """Flatten a vocabulary JSON list into space separated words."""
+        if not vocabulary:
+            return ""
+        return " ".join(v.get("word", "") for v in vocabulary if isinstance(v, dict))
+
+    @staticmethod
+    def index_article(db: Session, article: Article):
+        """Insert or refresh the index entry for an article (no commit)."""
+        dialect = db.get_bind().dialect.name
+        words = SearchService.vocabulary_words(article.vocabulary)
+
+        if dialect == "sqlite":
+            db.execute(text("DELETE FROM articles_fts WHERE rowid = :id"), {"id": article.id})
+            db.execute(
+                text(
+                    "INSERT INTO articles_fts(rowid, title, content, vocabulary) "
+                    "VALUES (:id, :title, :content, :vocabulary)"
+                ),
+                {"id": article.id, "title": article.title, "content": article.content, "vocabulary": words},
+            )
+        elif dialect == "postgresql":
+            db.execute(
+                text(
+                    "UPDATE articles SET search_vector = "
+                    "setweight(to_tsvector('english', :title), 'A') || "
+                    "setweight(to_tsvector('english', :vocabulary), 'A') || "
+                    "setweight(to_tsvector('english', :content), 'B') "
+                    "WHERE id = :id"
+                ),
+                {"id": article.id, "title": article.title, "content": article.content, "vocabulary": words},
+            )
+
+    @staticmethod
+    def remove_article(db: Session, article_id: int):
+        """Drop an article from the index (no commit)."""
+        # On PostgreSQL the tsvector lives on the row and goes away with it
+        if db.get_bind().dialect.name == "sqlite":
+            db.execute(text("DELETE FROM articles_fts WHERE rowid = :id"), {"id": article_id})
+
+    @staticmethod
+    def remove_articles(db: Session, article_ids: list[int]):
+        """Drop many articles from the index, e.g. when they are archived (no commit)"""
+        if not article_ids:
+            return
+        ids = {"ids": article_ids}
+        dialect = db.get_bind().dialect.name
+        if dialect == "sqlite":
+            db.execute(
+                text("DELETE FROM articles_fts WHERE rowid IN :ids").bindparams(bindparam("ids", expanding=True)), ids
+            )
+        elif dialect == "postgresql":
+            db.execute(
+                text("UPDATE articles SET search_vector = NULL WHERE id IN :ids").bindparams(bindparam("ids", expanding=True)), ids
+            )
+
+    @staticmethod
+    def _fts5_query(query: str) -> str:
+        """Quote each term so user input can't inject FTS5 query syntax."""
+        terms = [t.replace('"', '""') for t in query.split()]
+        return " ".join(f'"{t}"' for t in terms if t)
+
+    @staticmethod
+    def search(db: Session, query: str, limit: int = 20) -> list[dict]:
+        """
+        Search articles and return ranked hits with a highlighted snippet.
+        Each hit is {id, title, rank, snippet}, ordered best first
+        (higher rank is better on every backend).
+        """
+        dialect = db.get_bind().dialect.name
+
+        if dialect == "sqlite":
+            match = SearchService._fts5_query(query)
+            if not match:
+                return []
+            rows = db.execute(
+                text(
+                    "SELECT rowid AS id, title, bm25(articles_fts, 10.0, 1.0, 5.0) AS rank, "
+                    "snippet(articles_fts, 1, :start, :end, '…', 16) AS snippet "
+                    "FROM articles_fts WHERE articles_fts MATCH :match "
+                    "ORDER BY rank LIMIT :limit"
+                ),
+                {"match": match, "start": SearchService.SNIPPET_START,
+                 "end": SearchService.SNIPPET_END, "limit": limit},
+            ).mappings().all()
+            # bm25() is negative, smaller is better; flip it so higher is better
+            return [{**row, "rank": -row["rank"]} for row in rows]
+
+        if dialect == "postgresql":
+            rows = db.execute(
+                text(
+                    "SELECT hits.id, hits.title, hits.rank, "
+                    "ts_headline('english', hits.content, hits.q, "
+                    "'StartSel=' || :start || ', StopSel=' || :end || ', MaxWords=30, MinWords=10') AS snippet "
+                    "FROM (SELECT id, title, content, q, ts_rank(search_vector, q) AS rank "
+                    "      FROM articles, websearch_to_tsquery('english', :query) q "
+                    "      WHERE search_vector @@ q ORDER BY rank DESC LIMIT :limit) hits "
+                    "ORDER BY hits.rank DESC"
+                ),
+                {"query": query, "start": SearchService.SNIPPET_START,
+                 "end": SearchService.SNIPPET_END, "limit": limit},
+            ).mappings().all()
+            return [dict(row) for row in rows]
+
+        # Unknown backends fall back to a plain LIKE scan
+        pattern = f"%{query}%"
+        articles = db.query(Article).filter(
+            Article.archived_at.is_(None),
+            Article.title.ilike(pattern) | Article.content.ilike(pattern)
+        ).limit(limit).all()
+        return [
+            {"id": a.id, "title": a.title, "rank": 0.0, "snippet": a.content[:200]}
+            for a in articles
+        ]
@@ -0,0 +1,144 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models import Sentence, UserProgress
+
+
+@dataclass
+class ReviewSchedule:
+    ease_factor: float
+    interval_days: float
+    repetitions: int
+    due_at: datetime
+
+
+class SRSScheduler:
+    """
+    SM-2 spaced repetition, driven by translation check results.
+
+    The grading result maps to an SM-2 quality score; a failed review resets
+    the repetition count and brings the sentence back after RELEARN_DELAY.
+    """
+
+    QUALITY = {"perfect": 5, "good": 3, "incorrect": 1}
+    MIN_EASE = 1.3
+    RELEARN_DELAY = timedelta(minutes=10)
+
+    @staticmethod
+    def schedule(
+        result: str,
+        ease_factor: float = 2.5,
+        interval_days: float = 0.0,
+        repetitions: int = 0,
+        now: Optional[datetime] = None,
+    ) -> ReviewSchedule:
+        now = now or datetime.utcnow()
+        quality = SRSScheduler.QUALITY.get(result, 1)
+
+        ease_factor = round(max(
+            SRSScheduler.MIN_EASE,
+            ease_factor + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+        ), 3)
+
+        if quality < 3:
+            return ReviewSchedule(ease_factor, 0.0, 0, now + SRSScheduler.RELEARN_DELAY)
+
+        if repetitions == 0:
+            interval_days = 1.0
+        elif repetitions == 1:
+            interval_days = 6.0
+        else:
+            interval_days = round(interval_days * ease_factor, 2)
+
+        return ReviewSchedule(ease_factor, interval_days, repetitions + 1, now + timedelta(days=interval_days))
+
+    @staticmethod
+    def record_review(
+        db: Session,
+        learner_id: str,
+        sentence_id: int,
+        user_translation: str,
+        result: str,
+        is_correct: bool,
+    ) -> UserProgress:
+        """
+        Create or update the learner's progress row and reschedule it.
+        Two first reviews of the same sentence can race to insert the row;
+        the loser hits uq_user_progress_learner_sentence, rolls back and
+        applies its review to the row the winner created.
+        """
+        now = datetime.utcnow()
+        for attempt in range(2):
+            progress = db.query(UserProgress).filter(
+                UserProgress.learner_id == learner_id,
+                UserProgress.sentence_id == sentence_id
+            ).first()
+            if progress is None:
+                progress = UserProgress(
+                    learner_id=learner_id,
+                    sentence_id=sentence_id,
+                    attempts=0,
+                    ease_factor=2.5,
+                    interval_days=0.0,
+                    repetitions=0,
+                )
+                db.add(progress)
+
+            SRSScheduler._apply_review(progress, user_translation, result, is_correct, now)
+            try:
+                db.commit()
+                return progress
+            except IntegrityError:
+                db.rollback()
+                if attempt:
+                    raise
+
+    @staticmethod
+    def _apply_review(progress: UserProgress, user_translation: str, result: str, is_correct: bool, now: datetime):
+        schedule = SRSScheduler.schedule(
+            result, progress.ease_factor, progress.interval_days, progress.repetitions, now
+        )
+        progress.user_translation = user_translation[:500]
+        progress.is_correct = is_correct
+        progress.attempts = (progress.attempts or 0) + 1
+        progress.last_result = result
+        progress.last_reviewed_at = now
+        if is_correct and progress.completed_at is None:
+            progress.completed_at = now
+        progress.ease_factor = schedule.ease_factor
+        progress.interval_days = schedule.interval_days
+        progress.repetitions = schedule.repetitions
+        progress.due_at = schedule.due_at
+
+    @staticmethod
+    def next_due(db: Session, learner_id: str, limit: int = 20, now: Optional[datetime] = None) -> list[dict]:
+        """
+        Sentences due for review, most overdue first.
+        One range scan on ix_user_progress_learner_due, then primary-key
+        lookups for the sentence text.
+        """
+        now = now or datetime.utcnow()
+        rows = (
+            db.query(UserProgress, Sentence.article_id, Sentence.text)
+            .join(Sentence, Sentence.id == UserProgress.sentence_id)
+            .filter(UserProgress.learner_id == learner_id, UserProgress.due_at <= now)
+            .order_by(UserProgress.due_at)
+            .limit(limit)
+            .all()
+        )
+        return [
+            {
+                "sentence_id": progress.sentence_id,
+                "article_id": article_id,
+                "text": text,
+                "due_at": progress.due_at,
+                "interval_days": progress.interval_days,
+                "repetitions": progress.repetitions,
+                "last_result": progress.last_result,
+            }
+            for progress, article_id, text in rows
+        ]
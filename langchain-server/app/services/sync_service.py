@@ -0,0 +1,133 @@
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session, load_only, selectinload
+
+from ..models import Article, ArticleChange, ArticleVocabulary, Sentence, SentenceVocabulary, UserProgress
+
+
+class SyncService:
+    """
+    Delta sync and session bundles for the mobile client.
+
+    Every article create, delete and archive appends to article_changes in the
+    same transaction, so the log's autoincrement id is a monotonic version.
+    A client keeps the last version it saw and asks only for later changes.
+
+    On PostgreSQL ids are handed out before commit, so a slow transaction can
+    commit a lower id after a higher one became visible. Changes younger than
+    SYNC_SETTLE_SECONDS are therefore held back there; SQLite serializes writers
+    and needs no delay.
+    """
+
+    CREATED = "created"
+    DELETED = "deleted"
+
+    @staticmethod
+    def record(db: Session, article_ids: list[int], change: str):
+        """Append changes to the log (no commit, call inside the writing transaction)"""
+        now = datetime.utcnow()
+        db.add_all([ArticleChange(article_id=i, change=change, created_at=now) for i in article_ids])
+
+    @staticmethod
+    def changes_since(db: Session, since: int = 0, limit: int = 500) -> dict:
+        """
+        Net changes after version `since`: active articles created since then
+        and ids deleted or archived since then. When `since` is ahead of the
+        log (e.g. the database was restored) the full library is returned
+        with reset=True so the client can drop what it has.
+        """
+        latest_id = db.query(func.max(ArticleChange.id)).scalar() or 0
+        reset = since > latest_id
+        if reset:
+            since = 0
+
+        query = db.query(ArticleChange).filter(ArticleChange.id > since)
+        if db.get_bind().dialect.name != "sqlite":
+            settle = float(os.getenv("SYNC_SETTLE_SECONDS", "5"))
+            query = query.filter(ArticleChange.created_at <= datetime.utcnow() - timedelta(seconds=settle))
+        rows = query.order_by(ArticleChange.id).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        # Later entries win: created-then-deleted in this window is a delete
+        latest = {}
+        for row in rows:
+            latest[row.article_id] = row.change
+        created_ids = [i for i, change in latest.items() if change == SyncService.CREATED]
+
+        articles = []
+        if created_ids:
+            articles = db.query(Article).options(load_only(
+                Article.id, Article.title, Article.created_at, Article.difficulty, Article.category,
+                Article.word_count, Article.reading_grade, Article.bundle_path,
+            )).filter(Article.id.in_(created_ids), Article.archived_at.is_(None)).order_by(Article.id).all()
+
+        # Created here but gone by now (deleted after the window): report as deleted
+        found = {a.id for a in articles}
+        deleted = {i for i, change in latest.items() if change == SyncService.DELETED}
+        deleted.update(i for i in created_ids if i not in found)
+
+        return {
+            "version": rows[-1].id if rows else since,
+            "reset": reset,
+            "has_more": has_more,
+            "created": articles,
+            "deleted": sorted(deleted),
+        }
+
+    @staticmethod
+    def session_bundle(db: Session, article_id: int, learner_id: Optional[str] = None) -> Optional[dict]:
+        """
+        Everything a study session needs in one payload: the article, its
+        sentences in order with next pointers resolved, the vocabulary words
+        occurring in each sentence and, for a learner, their progress.
+        """
+        article = db.query(Article).options(
+            selectinload(Article.sentences).load_only(Sentence.id, Sentence.text, Sentence.order, Sentence.article_id)
+        ).filter(Article.id == article_id, Article.archived_at.is_(None)).first()
+        if article is None:
+            return None
+
+        sentences = sorted(article.sentences, key=lambda s: s.order)
+        sentence_ids = [s.id for s in sentences]
+
+        words = {}
+        if sentence_ids:
+            rows = (
+                db.query(SentenceVocabulary.sentence_id, ArticleVocabulary.surface, ArticleVocabulary.definition)
+                .join(ArticleVocabulary, and_(
+                    ArticleVocabulary.word_id == SentenceVocabulary.word_id,
+                    ArticleVocabulary.article_id == article_id,
+                ))
+                .filter(SentenceVocabulary.sentence_id.in_(sentence_ids))
+                .order_by(SentenceVocabulary.sentence_id, ArticleVocabulary.surface)
+                .all()
+            )
+            for r in rows:
+                words.setdefault(r.sentence_id, []).append({"word": r.surface, "definition": r.definition})
+
+        progress = []
+        if learner_id and sentence_ids:
+            progress = db.query(UserProgress).filter(
+                UserProgress.learner_id == learner_id,
+                UserProgress.sentence_id.in_(sentence_ids),
+            ).order_by(UserProgress.sentence_id).all()
+
+        return {
+            "article": article,
+            "sentences": [
+                {
+                    "id": s.id,
+                    "text": s.text,
+                    "order": s.order,
+                    "next_id": sentences[i + 1].id if i + 1 < len(sentences) else None,
+                    "words": words.get(s.id, []),
+                }
+                for i, s in enumerate(sentences)
+            ],
+            "first_sentence_id": sentence_ids[0] if sentence_ids else None,
+            "progress": progress,
+        }
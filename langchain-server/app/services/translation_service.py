@@ -1,9 +1,16 @@
 import os
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass
 from pydantic import BaseModel, Field
 from typing import Optional
+from ..admission import latency_budget
+from ..shared import get_shared_backend, get_openai_rate_limiter
+from .grading_recorder import GradingRecorder
+
+logger = logging.getLogger(__name__)
 
 
 class TranslationFeedback(BaseModel):
@@ -15,24 +22,19 @@ class TranslationFeedback(BaseModel):
     is_correct: bool = Field(description="Whether the translation is acceptable (perfect or good)")
 
 
-class TranslationService:
-    def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY not found in environment variables")
-
-        # Use gpt-4o-mini for cost efficiency
-        self.llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0.3,  # Low temperature for consistent feedback
-            api_key=api_key
-        )
+@dataclass
+class GradingStats:
+    """How one grading call was served"""
+    latency_ms: float
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached: bool = False
 
-        self.parser = PydanticOutputParser(pydantic_object=TranslationFeedback)
 
-        # Create prompt template
-        self.prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an English teacher evaluating Korean translations of English sentences.
+# Prompt templates by version; the version is part of the grading cache key
+PROMPTS = {
+    "v1": (
+        """You are an English teacher evaluating Korean translations of English sentences.
 
 Evaluate the translation into one of three levels:
 1. **perfect**: Translation conveys the correct meaning with proper vocabulary and grammar
@@ -74,24 +76,131 @@ Feedback should:
 - For 'good': Only point to actual vocabulary/grammar issues, NOT spacing/typos
 - Be encouraging and educational
 
-{format_instructions}"""),
-            ("user", """Original English: {original_sentence}
+{format_instructions}""",
+        """Original English: {original_sentence}
 Student's Korean translation: {user_translation}
 
-Evaluate the translation:""")
-        ])
+Evaluate the translation:""",
+    ),
+}
 
-    def check_translation(self, original_sentence: str, user_translation: str) -> TranslationFeedback:
+
+class TranslationService:
+    MODEL = "gpt-4o-mini"
+    PROMPT_VERSION = "v1"
+    CACHE_TTL = 7 * 24 * 3600  # Grading a given (sentence, translation) pair is stable
+
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        prompt_version: Optional[str] = None,
+        llm=None,
+        cache=None,
+        use_cache: bool = True,
+        rate_limiter=None,
+        recorder: Optional[GradingRecorder] = None,
+        rate_limit_timeout: Optional[float] = None,
+    ):
         """
-        Check user's translation against original sentence using LLM.
-        Returns feedback with is_correct flag and optional hint.
+        Defaults serve production: GRADING_MODEL (or MODEL), PROMPT_VERSION,
+        the shared cache and rate limit, and the recorder from
+        GRADING_RECORD_PATH. replay_grading.py overrides them to try another
+        configuration, including a fake `llm` that needs no API key.
+        Grading runs in the interactive admission lane, so by default it waits
+        for a rate limit token no longer than that lane's latency budget.
         """
-        chain = self.prompt | self.llm | self.parser
+        # LangChain is imported here, on first use, to keep cold starts fast
+        from langchain_core.prompts import ChatPromptTemplate
+        from langchain_core.output_parsers import PydanticOutputParser
+
+        self.model = model or os.getenv("GRADING_MODEL", self.MODEL)
+        self.prompt_version = prompt_version or self.PROMPT_VERSION
+        if self.prompt_version not in PROMPTS:
+            raise ValueError(f"Unknown prompt version: {self.prompt_version}")
+
+        if llm is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise ValueError("OPENAI_API_KEY not found in environment variables")
+
+            from langchain_openai import ChatOpenAI
+
+            # gpt-4o-mini by default for cost efficiency
+            llm = ChatOpenAI(
+                model=self.model,
+                temperature=0.3,  # Low temperature for consistent feedback
+                api_key=api_key
+            )
+        self.llm = llm
+
+        self.parser = PydanticOutputParser(pydantic_object=TranslationFeedback)
 
-        result = chain.invoke({
+        # Shared across workers, see app/shared for the consistency model
+        self.cache = (cache or get_shared_backend()) if use_cache else None
+        self.rate_limiter = rate_limiter or get_openai_rate_limiter()
+        self.rate_limit_timeout = (
+            rate_limit_timeout if rate_limit_timeout is not None else latency_budget("interactive")
+        )
+        self.recorder = recorder if recorder is not None else GradingRecorder.from_env()
+
+        system, user = PROMPTS[self.prompt_version]
+        self.prompt = ChatPromptTemplate.from_messages([("system", system), ("user", user)])
+
+    def _cache_key(self, original_sentence: str, user_translation: str) -> str:
+        """Cache key over model, prompt version and whitespace-normalized inputs"""
+        normalized = " ".join(user_translation.split())
+        payload = "\x1f".join([self.model, self.prompt_version, original_sentence, normalized])
+        return "grade:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def grade(self, original_sentence: str, user_translation: str) -> tuple[TranslationFeedback, GradingStats]:
+        """Grade a translation and report latency, token usage and cache use"""
+        start = time.perf_counter()
+        key = self._cache_key(original_sentence, user_translation)
+        if self.cache is not None:
+            try:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    elapsed = (time.perf_counter() - start) * 1000
+                    return TranslationFeedback(**json.loads(cached)), GradingStats(elapsed, cached=True)
+            except Exception as e:
+                logger.warning("Grading cache read failed: %s", e)
+
+        self.rate_limiter.acquire_or_raise(timeout=self.rate_limit_timeout)
+
+        message = (self.prompt | self.llm).invoke({
             "original_sentence": original_sentence,
             "user_translation": user_translation,
             "format_instructions": self.parser.get_format_instructions()
         })
+        result = self.parser.invoke(message)
+        usage = getattr(message, "usage_metadata", None) or {}
+        stats = GradingStats(
+            latency_ms=(time.perf_counter() - start) * 1000,
+            input_tokens=usage.get("input_tokens", 0),
+            output_tokens=usage.get("output_tokens", 0),
+        )
+
+        if self.cache is not None:
+            try:
+                self.cache.set(key, result.model_dump_json(), ttl=self.CACHE_TTL)
+            except Exception as e:
+                logger.warning("Grading cache write failed: %s", e)
+
+        return result, stats
 
-        return result
+    def check_translation(self, original_sentence: str, user_translation: str) -> TranslationFeedback:
+        """
+        Check user's translation against original sentence using LLM.
+        Returns feedback with is_correct flag and optional hint.
+        Identical submissions are served from the shared grading cache.
+        """
+        return self.check_translation_with_stats(original_sentence, user_translation)[0]
+
+    def check_translation_with_stats(
+        self, original_sentence: str, user_translation: str
+    ) -> tuple[TranslationFeedback, GradingStats]:
+        """check_translation plus latency and token usage (e.g. for quota accounting)"""
+        result, stats = self.grade(original_sentence, user_translation)
+        if self.recorder is not None:
+            self.recorder.record(original_sentence, user_translation, result, stats, self.model, self.prompt_version)
+        return result, stats
@@ -1,11 +1,20 @@
-import feedparser
+import json
+import logging
 from typing import List, Dict, Optional
 from datetime import datetime
+from ..shared import get_shared_backend
+
+logger = logging.getLogger(__name__)
 
 
 class VOAService:
     """Service for fetching articles from VOA Learning English RSS feeds"""
 
+    FEED_CACHE_TTL = 15 * 60  # RSS feeds update a few times a day
+
+    def __init__(self):
+        self.cache = get_shared_backend()
+
     # VOA Learning English RSS feed URLs by difficulty and category
     RSS_FEEDS = {
         'intermediate': {
@@ -50,17 +59,42 @@ class VOAService:
             feeds_to_fetch = self.RSS_FEEDS[difficulty]
 
         for cat_name, feed_url in feeds_to_fetch.items():
-            feed = feedparser.parse(feed_url)
-
-            for entry in feed.entries[:limit]:
-                article = self._extract_article_metadata(entry, difficulty, cat_name)
-                articles.append(article)
+            entries = self._fetch_feed(feed_url, difficulty, cat_name)
+            articles.extend(entries[:limit])
 
         return articles[:limit]
 
+    def _fetch_feed(self, feed_url: str, difficulty: str, category: str) -> List[Dict]:
+        """Fetch and extract one feed, served from the shared cache when fresh"""
+        key = f"voa_feed:{feed_url}"
+        try:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return json.loads(cached)
+        except Exception as e:
+            logger.warning("VOA feed cache read failed: %s", e)
+
+        # Imported on first use to keep cold starts fast
+        import feedparser
+
+        feed = feedparser.parse(feed_url)
+        entries = [
+            self._extract_article_metadata(entry, difficulty, category)
+            for entry in feed.entries
+        ]
+
+        # Don't cache failed/empty fetches so the next request retries
+        if entries:
+            try:
+                self.cache.set(key, json.dumps(entries), ttl=self.FEED_CACHE_TTL)
+            except Exception as e:
+                logger.warning("VOA feed cache write failed: %s", e)
+
+        return entries
+
     def _extract_article_metadata(
         self,
-        entry: feedparser.FeedParserDict,
+        entry: Dict,
         difficulty: str,
         category: str
     ) -> Dict:
@@ -0,0 +1,317 @@
+import re
+from typing import Optional
+from sqlalchemy.orm import Session
+from ..models import Article, Sentence, VocabularyWord, ArticleVocabulary, SentenceVocabulary
+
+
+# Irregular forms and words the suffix rules would mangle or conflate
+LEMMA_EXCEPTIONS = {
+    # Not plurals
+    "news": "news", "series": "series", "species": "species", "means": "means", "always": "always",
+    "perhaps": "perhaps", "this": "this", "lens": "lens", "physics": "physics", "economics": "economics",
+    "politics": "politics", "mathematics": "mathematics", "shoes": "shoe", "does": "do", "goes": "go",
+    # Not -ing / -ed forms
+    "morning": "morning", "evening": "evening", "during": "during", "ceiling": "ceiling",
+    "nothing": "nothing", "something": "something", "anything": "anything", "everything": "everything",
+    "need": "need", "feed": "feed", "seed": "seed", "speed": "speed", "bleed": "bleed", "breed": "breed",
+    "greed": "greed", "weed": "weed", "indeed": "indeed", "proceed": "proceed", "succeed": "succeed",
+    "exceed": "exceed", "hundred": "hundred", "sacred": "sacred", "naked": "naked",
+    # Regular forms the stem rules get wrong
+    "added": "add", "adding": "add", "created": "create", "creating": "create", "focused": "focus",
+    "focusing": "focus", "installed": "install", "installing": "install", "died": "die", "dying": "die",
+    "lied": "lie", "lying": "lie", "tied": "tie", "tying": "tie", "being": "be", "used": "use",
+    "using": "use", "buses": "bus", "ignored": "ignore", "ignoring": "ignore", "explored": "explore",
+    "exploring": "explore", "excited": "excite", "exciting": "excite", "invited": "invite",
+    "inviting": "invite", "united": "unite", "uniting": "unite", "completed": "complete",
+    "completing": "complete", "deleted": "delete", "deleting": "delete", "competed": "compete",
+    "competing": "compete", "becoming": "become", "welcomed": "welcome", "welcoming": "welcome",
+    "escaped": "escape", "escaping": "escape", "tasted": "taste", "tasting": "taste",
+    "wasted": "waste", "wasting": "waste",
+    # Irregular plurals
+    "children": "child", "men": "man", "women": "woman", "feet": "foot", "teeth": "tooth",
+    "mice": "mouse", "geese": "goose",
+    # Irregular verbs
+    "made": "make", "went": "go", "gone": "go", "took": "take", "taken": "take", "gave": "give",
+    "given": "give", "came": "come", "saw": "see", "seen": "see", "ate": "eat", "eaten": "eat",
+    "wrote": "write", "written": "write", "spoke": "speak", "spoken": "speak", "ran": "run",
+    "began": "begin", "begun": "begin", "brought": "bring", "bought": "buy", "thought": "think",
+    "taught": "teach", "caught": "catch", "found": "find", "told": "tell", "sold": "sell",
+    "felt": "feel", "kept": "keep", "built": "build", "sent": "send", "spent": "spend",
+    "held": "hold", "stood": "stand", "understood": "understand", "chose": "choose",
+    "chosen": "choose", "knew": "know", "known": "know", "grew": "grow", "grown": "grow",
+    "drew": "draw", "drawn": "draw", "flew": "fly", "flown": "fly", "threw": "throw",
+    "thrown": "throw", "wore": "wear", "worn": "wear", "broke": "break", "broken": "break",
+    "fell": "fall", "fallen": "fall", "forgot": "forget", "forgotten": "forget", "got": "get",
+    "gotten": "get", "won": "win", "met": "meet", "paid": "pay", "said": "say", "laid": "lay",
+    "lost": "lose", "led": "lead", "fed": "feed", "meant": "mean", "heard": "hear",
+    "slept": "sleep", "sat": "sit", "drove": "drive", "driven": "drive", "rode": "ride",
+    "ridden": "ride", "rose": "rise", "risen": "rise", "hid": "hide", "hidden": "hide",
+    "shook": "shake", "shaken": "shake", "stole": "steal", "stolen": "steal", "swam": "swim",
+    "sang": "sing", "sung": "sing", "rang": "ring", "drank": "drink", "drunk": "drink",
+    "has": "have", "had": "have",
+}
+
+_VOWEL = re.compile(r"[aeiouy]")
+_VOWEL_GROUPS = re.compile(r"[aeiouy]+")
+# Stem endings that only occur with a silent e: v, c, s, z, u, g (not ng),
+# bl (trouble), ang / eng (change, challenge), and after a consonant at, ur,
+# ar, ir, id, ud, ib, in, um, od (relate, measure, prepare, admire, decide,
+# include, describe, imagine, assume, explode)
+_SILENT_E_ENDING = re.compile(
+    r"(?:[vcu]|[^s]s|[^z]z|[^n]g|bl|..ang|eng|quir|[^aeiou](?:at|ur|ar|ir|id|ud|ib|in|um|od))$"
+)
+# One vowel group closed by a single consonant other than w/x/y: hop(e), mak(e), writ(e)
+_SHORT_CVC = re.compile(r"^(?:qu|[^aeiouy])*[aeiouy]+[^aeiouwxy]$")
+
+
+def _needs_silent_e(stem: str) -> bool:
+    """Whether a stem left by -ing/-ed lost a silent e (hoping -> hop + e)"""
+    if stem.endswith("ss"):
+        return False
+    if _SILENT_E_ENDING.search(stem):
+        return True
+    # Short vowels double the consonant (hopping -> hop), so an undoubled
+    # one-syllable stem had a long vowel spelled with a final e
+    return bool(_SHORT_CVC.match(stem)) and not re.search(r"[aeiou]{2}", stem.replace("qu", "q"))
+
+
+class VocabularyService:
+    """
+    Normalized vocabulary index.
+
+    Article.vocabulary stays as the JSON the generator produced; this service
+    mirrors it into vocabulary_words / article_vocabulary / sentence_vocabulary
+    so word lookups are indexed queries instead of JSON scans.
+    """
+
+    WORD_PATTERN = re.compile(r"[A-Za-z]+(?:['-][A-Za-z]+)*")
+
+    @staticmethod
+    def lemmatize(word: str) -> str:
+        """
+        Reduce a word to a lookup key, applied identically to vocabulary words
+        and sentence tokens: "studies"/"studied"/"study" -> "study",
+        "making"/"made" -> "make", "running" -> "run".
+
+        Irregular and look-alike forms come from LEMMA_EXCEPTIONS. Otherwise
+        the plural / -ing / -ed suffix is stripped only when a plausible stem
+        (three or more letters with a vowel) remains, so "string", "news" and
+        "speed" stay whole, and a silent e dropped by the suffix is restored.
+        """
+        w = word.lower().strip("'-")
+        if w.endswith("'s"):
+            w = w[:-2]
+        if w in LEMMA_EXCEPTIONS:
+            return LEMMA_EXCEPTIONS[w]
+
+        if len(w) > 4 and w.endswith("ies"):
+            return w[:-3] + "y"                      # studies -> study
+        if len(w) > 4 and w.endswith(("sses", "shes", "ches", "xes", "oes")):
+            return w[:-2]                            # watches -> watch, potatoes -> potato
+        if len(w) > 3 and w.endswith("s") and not w.endswith(("ss", "us", "is")):
+            return w[:-1]
+
+        if len(w) > 4 and w.endswith("eed"):
+            return w[:-1]                            # agreed -> agree
+        for suffix in ("ing", "ed"):
+            if not w.endswith(suffix):
+                continue
+            stem = w[:-len(suffix)]
+            if len(stem) < 3 or not _VOWEL.search(stem):
+                return w                             # string, thing, bed
+            if suffix == "ed" and stem.endswith("i"):
+                return stem[:-1] + "y"               # studied -> study
+            if stem[-1] == stem[-2] and stem[-1] not in "aeiouslz":
+                return stem[:-1]                     # running -> run, stopped -> stop
+            if stem.endswith(("ell", "oll")) and len(_VOWEL_GROUPS.findall(stem)) > 1:
+                return stem[:-1]                     # travelled -> travel, controlled -> control
+            if _needs_silent_e(stem):
+                return stem + "e"                    # making -> make, hoped -> hope
+            return stem
+        return w
+
+    @staticmethod
+    def lemmatize_phrase(phrase: str) -> str:
+        """Lemmatize every token of a (possibly multi-word) vocabulary entry."""
+        tokens = VocabularyService.WORD_PATTERN.findall(phrase)
+        return " ".join(VocabularyService.lemmatize(t) for t in tokens)
+
+    @staticmethod
+    def _get_or_create_words(db: Session, lemmas: set[str]) -> dict[str, VocabularyWord]:
+        """
+        Resolve lemmas to VocabularyWord rows, creating the missing ones.
+        Missing lemmas are inserted with ON CONFLICT DO NOTHING and read back,
+        so a concurrent article creation adding the same new word doesn't fail
+        on the unique lemma.
+        """
+        if not lemmas:
+            return {}
+        words = {
+            w.lemma: w
+            for w in db.query(VocabularyWord).filter(VocabularyWord.lemma.in_(lemmas)).all()
+        }
+        missing = sorted(lemmas - words.keys())
+        if missing:
+            if db.get_bind().dialect.name == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+            db.execute(
+                insert(VocabularyWord)
+                .values([{"lemma": lemma} for lemma in missing])
+                .on_conflict_do_nothing(index_elements=["lemma"])
+            )
+            words.update(
+                (w.lemma, w)
+                for w in db.query(VocabularyWord).filter(VocabularyWord.lemma.in_(missing)).all()
+            )
+        return words
+
+    @staticmethod
+    def link_article(
+        db: Session,
+        article: Article,
+        sentences: list[Sentence],
+        vocabulary: Optional[list] = None
+    ):
+        """
+        Index an article's vocabulary and the sentences each word occurs in (no commit).
+        `vocabulary` defaults to article.vocabulary.
+        """
+        vocabulary = vocabulary if vocabulary is not None else (article.vocabulary or [])
+        entries = {}
+        for item in vocabulary:
+            if not isinstance(item, dict) or not item.get("word"):
+                continue
+            lemma = VocabularyService.lemmatize_phrase(item["word"])
+            if lemma and lemma not in entries:
+                entries[lemma] = item
+
+        if not entries:
+            return
+
+        words = VocabularyService._get_or_create_words(db, set(entries))
+
+        for lemma, item in entries.items():
+            db.add(ArticleVocabulary(
+                article_id=article.id,
+                word_id=words[lemma].id,
+                surface=item["word"][:100],
+                definition=item.get("definition")
+            ))
+
+        for sentence in sentences:
+            tokens = [VocabularyService.lemmatize(t) for t in VocabularyService.WORD_PATTERN.findall(sentence.text)]
+            joined = f" {' '.join(tokens)} "
+            for lemma in entries:
+                if f" {lemma} " in joined:
+                    db.add(SentenceVocabulary(sentence_id=sentence.id, word_id=words[lemma].id))
+
+    @staticmethod
+    def index_unlinked(db: Session, articles: list[Article]) -> int:
+        """
+        Index vocabulary for those of `articles` that have JSON vocabulary but
+        no article_vocabulary rows yet (no commit). Returns how many were indexed.
+        """
+        linked = {
+            row.article_id
+            for row in db.query(ArticleVocabulary.article_id)
+            .filter(ArticleVocabulary.article_id.in_([a.id for a in articles]))
+            .distinct()
+        }
+        indexed = 0
+        for article in articles:
+            if article.id in linked or not article.vocabulary:
+                continue
+            # Clear partial sentence links left by an interrupted run
+            db.query(SentenceVocabulary).filter(
+                SentenceVocabulary.sentence_id.in_([s.id for s in article.sentences])
+            ).delete(synchronize_session=False)
+            VocabularyService.link_article(db, article, article.sentences)
+            indexed += 1
+        return indexed
+
+    @staticmethod
+    def backfill(db: Session, batch_size: int = 500) -> int:
+        """
+        Index vocabulary for articles that have JSON vocabulary but no links yet.
+        Commits after every batch so it can be interrupted and re-run.
+        Returns the number of articles indexed.
+        """
+        indexed = 0
+        last_id = 0
+        while True:
+            articles = (
+                db.query(Article)
+                .filter(Article.id > last_id, Article.vocabulary.isnot(None))
+                .order_by(Article.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not articles:
+                break
+
+            indexed += VocabularyService.index_unlinked(db, articles)
+            db.commit()
+            last_id = articles[-1].id
+
+        return indexed
+
+    @staticmethod
+    def find_articles(db: Session, word: str, skip: int = 0, limit: int = 50) -> list[dict]:
+        """Articles that teach a word, newest first."""
+        lemma = VocabularyService.lemmatize_phrase(word)
+        rows = (
+            db.query(Article.id, Article.title, Article.difficulty, ArticleVocabulary.surface, ArticleVocabulary.definition)
+            .join(ArticleVocabulary, ArticleVocabulary.article_id == Article.id)
+            .join(VocabularyWord, VocabularyWord.id == ArticleVocabulary.word_id)
+            .filter(VocabularyWord.lemma == lemma, Article.archived_at.is_(None))
+            .order_by(Article.id.desc())
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        return [
+            {"article_id": r.id, "title": r.title, "difficulty": r.difficulty, "word": r.surface, "definition": r.definition}
+            for r in rows
+        ]
+
+    @staticmethod
+    def find_sentences(db: Session, word: str, skip: int = 0, limit: int = 50) -> list[dict]:
+        """Sentences of active articles in which a vocabulary word occurs."""
+        lemma = VocabularyService.lemmatize_phrase(word)
+        rows = (
+            db.query(Sentence.id, Sentence.article_id, Sentence.text, Sentence.order)
+            .join(SentenceVocabulary, SentenceVocabulary.sentence_id == Sentence.id)
+            .join(VocabularyWord, VocabularyWord.id == SentenceVocabulary.word_id)
+            .join(Article, Article.id == Sentence.article_id)
+            .filter(VocabularyWord.lemma == lemma, Article.archived_at.is_(None))
+            .order_by(SentenceVocabulary.sentence_id)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        return [
+            {"sentence_id": r.id, "article_id": r.article_id, "text": r.text, "order": r.order}
+            for r in rows
+        ]
+
+    @staticmethod
+    def article_word_list(db: Session, article_ids: list[int]) -> list[dict]:
+        """
+        Deduplicated word list for a set of articles (e.g. a learner's
+        reading history). Archived articles are left out.
+        """
+        rows = (
+            db.query(VocabularyWord.lemma, ArticleVocabulary.surface, ArticleVocabulary.definition, ArticleVocabulary.article_id)
+            .join(ArticleVocabulary, ArticleVocabulary.word_id == VocabularyWord.id)
+            .join(Article, Article.id == ArticleVocabulary.article_id)
+            .filter(ArticleVocabulary.article_id.in_(article_ids), Article.archived_at.is_(None))
+            .order_by(VocabularyWord.lemma, ArticleVocabulary.article_id)
+            .all()
+        )
+        words = {}
+        for r in rows:
+            entry = words.setdefault(r.lemma, {"word": r.surface, "definition": r.definition, "article_ids": []})
+            entry["article_ids"].append(r.article_id)
+        return list(words.values())
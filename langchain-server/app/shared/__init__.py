@@ -0,0 +1,85 @@
+"""
+Shared state for multi-worker deployments.
+
+Every uvicorn worker / container gets its own copy of the service singletons,
+so anything that must be shared (response caches, the OpenAI rate limit) goes
+through a SharedBackend selected by SHARED_BACKEND_URL:
+
+- memory://                    per-process only (default, single worker)
+- sqlite:///./data/shared.db   one file shared by all workers on a host
+- redis://host:6379/0          shared across hosts (requires `pip install redis`)
+
+Consistency model
+-----------------
+Cache entries (get/set) are best-effort and last-writer-wins. Keys are either
+content hashes (grading results) or carry a TTL (VOA feeds), so a stale read
+is bounded by the TTL and two workers computing the same entry concurrently
+only waste one call. Backend failures are treated as misses by callers.
+
+Token buckets (try_acquire) are linearizable per bucket: the refill and the
+decrement happen in one atomic step (a Lua script on Redis, a BEGIN IMMEDIATE
+transaction on SQLite, a lock in memory), so the combined rate across all
+workers never exceeds the configured rate plus one burst.
+"""
+import os
+import threading
+
+from .base import SharedBackend, MemoryBackend
+from .rate_limit import RateLimitExceeded, TokenBucket
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def create_backend(url: str) -> SharedBackend:
+    """Build a backend from a URL (memory://, sqlite:///path, redis://...)."""
+    if url.startswith("memory://"):
+        return MemoryBackend()
+    if url.startswith("sqlite:///"):
+        from .sqlite_backend import SQLiteBackend
+        return SQLiteBackend(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        from .redis_backend import RedisBackend
+        return RedisBackend(url)
+    raise ValueError(f"Unsupported SHARED_BACKEND_URL: {url}")
+
+
+def get_shared_backend() -> SharedBackend:
+    """Get or create the process-wide shared backend"""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend(os.getenv("SHARED_BACKEND_URL", "memory://"))
+    return _backend
+
+
+def get_openai_rate_limiter() -> TokenBucket:
+    """Token bucket shared by every service that calls the OpenAI API"""
+    rpm = float(os.getenv("OPENAI_RATE_LIMIT_RPM", "500"))
+    burst = float(os.getenv("OPENAI_RATE_LIMIT_BURST", str(max(1, int(rpm // 10)))))
+    return TokenBucket(get_shared_backend(), "openai", rate=rpm / 60.0, capacity=burst)
+
+
+def get_bulk_rate_limiter() -> TokenBucket:
+    """
+    Extra bucket for background/bulk OpenAI calls, taken before the shared one.
+    It refills at (1 - OPENAI_INTERACTIVE_RESERVE) of the shared rate, so bulk
+    generation can never use the share reserved for interactive grading.
+    """
+    rpm = float(os.getenv("OPENAI_RATE_LIMIT_RPM", "500"))
+    reserve = min(max(float(os.getenv("OPENAI_INTERACTIVE_RESERVE", "0.3")), 0.0), 1.0)
+    bulk_rpm = max(rpm * (1 - reserve), 1.0)
+    return TokenBucket(get_shared_backend(), "openai:bulk", rate=bulk_rpm / 60.0, capacity=max(1, int(bulk_rpm // 10)))
+
+
+__all__ = [
+    "SharedBackend",
+    "MemoryBackend",
+    "TokenBucket",
+    "RateLimitExceeded",
+    "create_backend",
+    "get_shared_backend",
+    "get_openai_rate_limiter",
+    "get_bulk_rate_limiter",
+]
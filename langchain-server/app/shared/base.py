@@ -0,0 +1,73 @@
+import threading
+import time
+from typing import Optional
+
+
+class SharedBackend:
+    """
+    Interface for state shared between workers.
+    Values are JSON-serializable strings; callers do their own encoding.
+    """
+
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def try_acquire(self, bucket: str, amount: float, rate: float, capacity: float) -> float:
+        """
+        Atomically refill `bucket` at `rate` tokens/second (up to `capacity`)
+        and take `amount` tokens if available.
+        Returns 0 when the tokens were taken, otherwise the seconds to wait
+        before enough tokens will be available (nothing is taken).
+        A negative `amount` hands tokens back, still capped at `capacity`.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _refill(tokens: float, updated_at: float, now: float, amount: float, rate: float, capacity: float):
+        """Shared token bucket arithmetic; returns (tokens_after, wait_seconds)."""
+        tokens = min(capacity, tokens + max(0.0, now - updated_at) * rate)
+        if tokens >= amount:
+            return min(capacity, tokens - amount), 0.0
+        return tokens, (amount - tokens) / rate if rate > 0 else float("inf")
+
+
+class MemoryBackend(SharedBackend):
+    """In-process backend; only shared between threads of one worker."""
+
+    def __init__(self):
+        self._data = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        with self._lock:
+            self._data[key] = (value, time.time() + ttl if ttl else None)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def try_acquire(self, bucket: str, amount: float, rate: float, capacity: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated_at = self._buckets.get(bucket, (capacity, now))
+            tokens, wait = self._refill(tokens, updated_at, now, amount, rate, capacity)
+            self._buckets[bucket] = (tokens, now)
+        return wait
@@ -0,0 +1,55 @@
+import time
+
+from .base import SharedBackend
+
+
+class RateLimitExceeded(RuntimeError):
+    """Tokens were not available within the caller's wait budget"""
+
+    def __init__(self, retry_after: float):
+        super().__init__("OpenAI rate limit exceeded, please retry shortly")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Blocking token bucket on top of a SharedBackend."""
+
+    def __init__(self, backend: SharedBackend, name: str, rate: float, capacity: float):
+        self.backend = backend
+        self.name = name
+        self.rate = rate
+        self.capacity = capacity
+
+    def try_acquire(self, amount: float = 1) -> float:
+        """Take tokens without blocking; returns 0 or the seconds to wait."""
+        return self.backend.try_acquire(self.name, amount, self.rate, self.capacity)
+
+    def acquire(self, amount: float = 1, timeout: float = 60.0) -> bool:
+        """
+        Block until `amount` tokens are taken or `timeout` seconds pass.
+        Returns False on timeout.
+        """
+        return self._wait(amount, timeout) <= 0
+
+    def acquire_or_raise(self, amount: float = 1, timeout: float = 60.0):
+        """acquire(), raising RateLimitExceeded with the expected wait on timeout."""
+        wait = self._wait(amount, timeout)
+        if wait > 0:
+            raise RateLimitExceeded(wait)
+
+    def _wait(self, amount: float, timeout: float) -> float:
+        """Take tokens within `timeout`; returns 0, or the wait that didn't fit."""
+        # A request larger than the bucket could never be satisfied
+        amount = min(amount, self.capacity)
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire(amount)
+            if wait <= 0:
+                return 0.0
+            if time.monotonic() + wait > deadline:
+                return wait
+            time.sleep(wait)
+
+    def refund(self, amount: float = 1):
+        """Hand back tokens taken for work that did not happen."""
+        self.backend.try_acquire(self.name, -min(amount, self.capacity), self.rate, self.capacity)
@@ -0,0 +1,71 @@
+from typing import Optional
+
+from .base import SharedBackend
+
+# Refill and take in one atomic step, using the Redis server clock so that
+# workers with skewed clocks still agree on the bucket state.
+# KEYS[1] = bucket key, ARGV = amount, rate, capacity
+# Returns the wait in seconds as a string (0 when tokens were taken).
+TOKEN_BUCKET_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local amount = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local capacity = tonumber(ARGV[3])
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+-- Never rewind the bucket if the server clock steps back (e.g. after failover)
+now = math.max(now, updated_at)
+
+tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * rate)
+local wait = 0
+if tokens >= amount then
+    -- A negative amount is a refund, still capped at capacity
+    tokens = math.min(capacity, tokens - amount)
+else
+    wait = (amount - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return tostring(wait)
+"""
+
+
+class RedisBackend(SharedBackend):
+    """Backend for any Redis-protocol server (Redis, Valkey, KeyDB, ...)."""
+
+    KEY_PREFIX = "biteread:"
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError(
+                "SHARED_BACKEND_URL points to Redis but the 'redis' package is not installed. "
+                "Install it with: pip install redis"
+            ) from e
+
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self._token_bucket = self.client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def get(self, key: str) -> Optional[str]:
+        return self.client.get(self.KEY_PREFIX + key)
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        if ttl:
+            self.client.set(self.KEY_PREFIX + key, value, px=int(ttl * 1000))
+        else:
+            self.client.set(self.KEY_PREFIX + key, value)
+
+    def delete(self, key: str):
+        self.client.delete(self.KEY_PREFIX + key)
+
+    def try_acquire(self, bucket: str, amount: float, rate: float, capacity: float) -> float:
+        wait = self._token_bucket(
+            keys=[f"{self.KEY_PREFIX}bucket:{bucket}"],
+            args=[amount, rate, capacity],
+        )
+        return float(wait)
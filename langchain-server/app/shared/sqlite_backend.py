@@ -0,0 +1,94 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from .base import SharedBackend
+
+
+class SQLiteBackend(SharedBackend):
+    """
+    Backend stored in a local SQLite file.
+
+    All workers on one host open the same file, which makes it a drop-in
+    stand-in for Redis in local multi-worker runs and tests. Token bucket
+    updates run inside BEGIN IMMEDIATE so they are serialized across processes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS shared_kv ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS shared_buckets ("
+            "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # isolation_level=None: autocommit, transactions are explicit
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        row = self._conn().execute(
+            "SELECT value, expires_at FROM shared_kv WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            self.delete(key)
+            return None
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        self._conn().execute(
+            "INSERT OR REPLACE INTO shared_kv (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, time.time() + ttl if ttl else None),
+        )
+
+    def delete(self, key: str):
+        self._conn().execute("DELETE FROM shared_kv WHERE key = ?", (key,))
+
+    def purge_expired(self):
+        """Remove expired cache entries (reads already ignore them)."""
+        self._conn().execute(
+            "DELETE FROM shared_kv WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+        )
+
+    def try_acquire(self, bucket: str, amount: float, rate: float, capacity: float) -> float:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Read the clock only once the write lock is held: BEGIN IMMEDIATE can
+            # wait for other processes, and a timestamp taken before it could be
+            # older than the one they stored, refilling that interval twice.
+            # Clock steps backwards never rewind updated_at either.
+            now = time.time()
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM shared_buckets WHERE name = ?", (bucket,)
+            ).fetchone()
+            tokens, updated_at = row if row else (capacity, now)
+            now = max(now, updated_at)
+            tokens, wait = self._refill(tokens, updated_at, now, amount, rate, capacity)
+            conn.execute(
+                "INSERT OR REPLACE INTO shared_buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                (bucket, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
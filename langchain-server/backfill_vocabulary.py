@@ -0,0 +1,29 @@
+"""
+Backfill the normalized vocabulary tables from Article.vocabulary JSON.
+
+Creates the vocabulary tables if needed, then indexes every article that has
+JSON vocabulary but no article_vocabulary rows yet. Safe to re-run.
+
+Usage: python backfill_vocabulary.py [batch_size]
+"""
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.database import SessionLocal, init_db
+from app.services.vocabulary_service import VocabularyService
+
+
+def backfill_vocabulary(batch_size: int = 500):
+    init_db()
+    db = SessionLocal()
+    try:
+        indexed = VocabularyService.backfill(db, batch_size=batch_size)
+    finally:
+        db.close()
+    print(f'✓ Indexed vocabulary for {indexed} articles')
+
+
+if __name__ == '__main__':
+    backfill_vocabulary(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
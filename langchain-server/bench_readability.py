@@ -0,0 +1,40 @@
+"""
+Throughput benchmark for readability feature extraction
+
+Usage: python bench_readability.py [articles] [sentences_per_article]
+"""
+
+import random
+import sys
+import time
+
+from app.services.readability import ReadabilityService, COMMON_WORDS
+
+EXTRA_WORDS = ["scientists", "environment", "researchers", "technology", "community",
+               "discovered", "government", "important", "university", "temperature"]
+
+
+def make_sentences(count: int, rng: random.Random) -> list[str]:
+    vocabulary = COMMON_WORDS + EXTRA_WORDS
+    return [
+        " ".join(rng.choice(vocabulary) for _ in range(rng.randint(6, 24))).capitalize() + "."
+        for _ in range(count)
+    ]
+
+
+def run_benchmark(articles: int = 2000, per_article: int = 15):
+    rng = random.Random(42)
+    corpus = [make_sentences(per_article, rng) for _ in range(articles)]
+    total = articles * per_article
+
+    start = time.perf_counter()
+    for sentences in corpus:
+        ReadabilityService.aggregate(ReadabilityService.analyze_sentences(sentences))
+    elapsed = time.perf_counter() - start
+
+    print(f"{articles} articles / {total} sentences in {elapsed:.3f}s")
+    print(f"  {total / elapsed:,.0f} sentences/s, {articles / elapsed:,.0f} articles/s")
+
+
+if __name__ == '__main__':
+    run_benchmark(*(int(a) for a in sys.argv[1:3]))
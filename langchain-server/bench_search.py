@@ -0,0 +1,90 @@
+"""
+Latency benchmark for article search
+
+Fills a throwaway SQLite database with synthetic articles, then times
+SearchService.search (FTS5 + bm25 + snippet) against the LIKE scan it
+replaced, over the same queries.
+
+Usage: python bench_search.py [articles] [queries]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp.name, 'bench.db')}"
+os.environ["BUNDLE_DIR"] = ""
+
+from app.database import SessionLocal, init_db
+from app.models import Article
+from app.services import ArticleService
+from app.services.readability import COMMON_WORDS
+from app.services.search_service import SearchService
+
+TOPIC_WORDS = ["scientists", "environment", "researchers", "technology", "community", "ocean",
+               "government", "university", "temperature", "farmers", "election", "vaccine"]
+
+
+def make_article(rng: random.Random) -> dict:
+    vocabulary = COMMON_WORDS + TOPIC_WORDS
+    sentences = [
+        " ".join(rng.choice(vocabulary) for _ in range(rng.randint(8, 20))).capitalize() + "."
+        for _ in range(rng.randint(8, 15))
+    ]
+    topic = rng.choice(TOPIC_WORDS)
+    return {
+        "title": f"{topic.capitalize()} {rng.choice(COMMON_WORDS)}",
+        "content": " ".join(sentences),
+        "vocabulary": [{"word": topic, "definition": "-"}],
+    }
+
+
+def like_scan(db, query: str, limit: int = 20):
+    pattern = f"%{query}%"
+    return db.query(Article).filter(
+        Article.archived_at.is_(None),
+        Article.title.ilike(pattern) | Article.content.ilike(pattern)
+    ).limit(limit).all()
+
+
+def percentiles(samples: list[float]) -> str:
+    ordered = sorted(samples)
+
+    def pick(p):
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+    return f"p50 {pick(0.50):.2f}ms  p95 {pick(0.95):.2f}ms  max {ordered[-1] * 1000:.2f}ms"
+
+
+def run_benchmark(articles: int = 5000, queries: int = 200):
+    init_db()
+    rng = random.Random(42)
+    db = SessionLocal()
+
+    start = time.perf_counter()
+    for i in range(0, articles, 500):
+        ArticleService.create_articles_bulk(db, [make_article(rng) for _ in range(min(500, articles - i))])
+    print(f"Indexed {articles} articles in {time.perf_counter() - start:.1f}s")
+
+    # Mostly single words, some two-word queries; a few rare words miss entirely
+    terms = TOPIC_WORDS + ["water", "school", "zeppelin", "quasar"]
+    workload = [
+        " ".join(rng.sample(terms, rng.choice([1, 1, 1, 2])))
+        for _ in range(queries)
+    ]
+
+    for name, run in (("fts", SearchService.search), ("like", like_scan)):
+        samples = []
+        for query in workload:
+            started = time.perf_counter()
+            run(db, query)
+            samples.append(time.perf_counter() - started)
+        print(f"  {name:<5} {percentiles(samples)}")
+    db.close()
+
+
+if __name__ == '__main__':
+    run_benchmark(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,76 @@
+"""
+Shared pytest setup
+
+Points the app at a throwaway SQLite database and a per-process shared
+backend before anything under app/ is imported, so tests never touch
+biteread.db, a replica, a bundle directory or Redis from a local .env.
+
+Fixtures:
+- db:        a session on the app database, emptied before the test
+- client:    a TestClient for main.app on the same (emptied) database
+- sqlite_db: (engine, sessionmaker) for a private SQLite file at head schema
+"""
+
+import os
+import tempfile
+
+import pytest
+
+_TMP = tempfile.mkdtemp(prefix="biteread-tests-")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{os.path.join(_TMP, 'app.db')}",
+    SHARED_BACKEND_URL="memory://",
+    # Empty rather than unset so load_dotenv() in main can't fill them in
+    REPLICA_DATABASE_URL="",
+    BUNDLE_DIR="",
+    GRADING_RECORD_PATH="",
+)
+
+
+def reset_database():
+    """Migrate the app database to head and delete every row"""
+    from sqlalchemy import inspect, text
+    from app.database import Base, engine, init_db
+
+    init_db()
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+        if inspect(conn).has_table("articles_fts"):
+            conn.execute(text("DELETE FROM articles_fts"))
+
+
+@pytest.fixture
+def db():
+    from app.database import SessionLocal
+
+    reset_database()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+    import main
+
+    reset_database()
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    from sqlalchemy.orm import sessionmaker
+    from app.database import _create_engine
+    from app.migrations import upgrade
+
+    engine = _create_engine(f"sqlite:///{tmp_path / 'private.db'}")
+    upgrade(engine)
+    try:
+        yield engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    finally:
+        engine.dispose()
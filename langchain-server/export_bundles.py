@@ -0,0 +1,37 @@
+"""
+Export the article library as static, content-hashed JSON bundles.
+
+Renders every active article (sentences, vocabulary, questions) and the
+paginated index into BUNDLE_DIR, then deletes files that are no longer
+referenced. Unchanged articles keep their file names, so re-running only
+writes what changed. Upload BUNDLE_DIR to the CDN / static host serving
+BUNDLE_BASE_URL (see the headers for /bundles in vercel.json).
+
+Article create/delete/archive keep the bundles up to date incrementally;
+run this after enabling bundles, after restoring a backup, or to repair
+missed updates.
+
+Usage: BUNDLE_DIR=./data/bundles python export_bundles.py [batch_size]
+"""
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.database import SessionLocal, init_db
+from app.services.bundle_service import BundleService
+
+
+def export_bundles(batch_size: int = 200):
+    init_db()
+    db = SessionLocal()
+    try:
+        result = BundleService.export_all(db, batch_size=batch_size)
+    finally:
+        db.close()
+    print(f'✓ Exported {result["articles"]} articles in {result["pages"]} index pages '
+          f'to {BundleService.root()} ({result["removed_files"]} stale files removed)')
+
+
+if __name__ == '__main__':
+    export_bundles(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
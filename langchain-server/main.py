@@ -1,8 +1,13 @@
+import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from dotenv import load_dotenv
-from app.endpoints import articles_router, translation_router
+from app.endpoints import articles_router, translation_router, vocabulary_router, review_router, sync_router
 from app.database import init_db
+from app.metrics import metrics
+from app.admission import AdmissionMiddleware
+from app.quota import flush_quota_usage
 
 # Load environment variables
 load_dotenv()
@@ -13,6 +18,9 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Priority-aware admission control / load shedding (inside CORS so 503s carry CORS headers)
+app.add_middleware(AdmissionMiddleware)
+
 # CORS middleware for frontend communication
 app.add_middleware(
     CORSMiddleware,
@@ -22,14 +30,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON responses (session bundles, sync, article lists)
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # Initialize database on startup
 @app.on_event("startup")
 def startup_event():
     init_db()
 
+
+@app.on_event("shutdown")
+def shutdown_event():
+    flush_quota_usage()
+
 # Include routers
 app.include_router(articles_router)
 app.include_router(translation_router)
+app.include_router(vocabulary_router)
+app.include_router(review_router)
+app.include_router(sync_router)
+
+
+# Serve static article bundles locally when no CDN/static host is in front
+if os.getenv("BUNDLE_DIR") and os.getenv("BUNDLE_BASE_URL", "/bundles") == "/bundles":
+    from fastapi.staticfiles import StaticFiles
+    app.mount("/bundles", StaticFiles(directory=os.getenv("BUNDLE_DIR"), check_dir=False), name="bundles")
+
+
+@app.get("/metrics")
+def get_metrics():
+    """Per-worker counters, gauges and latency summaries"""
+    return metrics.snapshot()
 
 
 @app.get("/")
@@ -39,6 +70,9 @@ def root():
         "docs": "/docs",
         "endpoints": {
             "articles": "/api/articles",
+            "vocabulary": "/api/vocabulary",
+            "review": "/api/review/next",
+            "sync": "/api/sync",
             "translation_check": "/api/translation/check"
         }
     }
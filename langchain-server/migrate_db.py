@@ -1,43 +1,54 @@
 """
-Database migration script to add new columns to articles table
+Database migration script
 
-This script adds VOA-related fields to the existing articles table.
+Applies the versioned migrations in app/migrations/versions to the database
+in DATABASE_URL (SQLite or PostgreSQL).
+
+Usage:
+    python migrate_db.py                 # upgrade to the latest version
+    python migrate_db.py upgrade [N]     # upgrade to version N
+    python migrate_db.py status          # show current and latest versions
+
+On PostgreSQL indexes are built with CREATE INDEX CONCURRENTLY, and data
+backfills run in committed chunks that resume after an interruption, so this
+can run against a live database.
 """
 
-import sqlite3
-
-def migrate_database():
-    """Add new columns to articles table for VOA content"""
-    conn = sqlite3.connect('biteread.db')
-    cursor = conn.cursor()
-
-    # Check if columns already exist
-    cursor.execute("PRAGMA table_info(articles)")
-    columns = [row[1] for row in cursor.fetchall()]
-
-    # Add new columns if they don't exist
-    new_columns = {
-        'difficulty': 'VARCHAR(50)',
-        'category': 'VARCHAR(100)',
-        'source_url': 'VARCHAR(1000)',
-        'vocabulary': 'JSON',
-        'questions': 'JSON',
-        'published_date': 'DATETIME'
-    }
-
-    for column_name, column_type in new_columns.items():
-        if column_name not in columns:
-            try:
-                cursor.execute(f'ALTER TABLE articles ADD COLUMN {column_name} {column_type}')
-                print(f'✓ Added column: {column_name}')
-            except sqlite3.OperationalError as e:
-                print(f'✗ Error adding {column_name}: {e}')
-        else:
-            print(f'○ Column already exists: {column_name}')
-
-    conn.commit()
-    conn.close()
-    print('\n✓ Database migration completed!')
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.database import engine
+from app.migrations import current_version, head_version, load_migrations, upgrade
+
+
+def show_status():
+    current = current_version(engine)
+    print(f'Database: {engine.url.render_as_string(hide_password=True)}')
+    print(f'Current version: {current}')
+    print(f'Latest version:  {head_version()}\n')
+    for migration in load_migrations():
+        marker = '✓' if migration.version <= current else '○'
+        print(f'{marker} {migration.version:04d} {migration.description}')
+
+
+def migrate_database(target=None):
+    """Apply pending migrations up to target (default: latest)"""
+    before = current_version(engine)
+    after = upgrade(engine, target=target, progress=print)
+    if after == before:
+        print(f'○ Already at version {after}')
+    else:
+        print(f'\n✓ Database migrated from version {before} to {after}')
+
 
 if __name__ == '__main__':
-    migrate_database()
+    command = sys.argv[1] if len(sys.argv) > 1 else 'upgrade'
+    if command == 'status':
+        show_status()
+    elif command == 'upgrade':
+        migrate_database(int(sys.argv[2]) if len(sys.argv) > 2 else None)
+    else:
+        print(__doc__)
+        sys.exit(1)
@@ -0,0 +1,66 @@
+"""
+Nightly library refresh through the batch API
+
+Collects new VOA entries, generates content for all of them in one provider
+batch, and ingests the results into the library. Progress is checkpointed in
+the run directory: re-running the same command resumes an interrupted run.
+
+Usage:
+    python nightly_refresh.py                              # OpenAI batch API
+    python nightly_refresh.py --backend local              # offline stand-in
+    python nightly_refresh.py --run-dir data/batch_runs/2025-01-01 --limit 100
+"""
+
+import argparse
+import json
+import os
+from datetime import date
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.database import SessionLocal, init_db
+from app.batch import ContentBatchPipeline, LocalBatchBackend, OpenAIBatchBackend
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate new articles through a batch API")
+    parser.add_argument("--difficulty", action="append", choices=["beginner", "intermediate"],
+                        help="Difficulty to collect (repeatable, default: both)")
+    parser.add_argument("--category", default=None, help="VOA category, e.g. science")
+    parser.add_argument("--limit", type=int, default=50, help="Max entries per difficulty")
+    parser.add_argument("--backend", choices=["openai", "local"], default="openai")
+    parser.add_argument("--run-dir", default=os.path.join("data", "batch_runs", date.today().isoformat()))
+    parser.add_argument("--poll-interval", type=float, default=60.0, help="Seconds between status checks")
+    args = parser.parse_args()
+
+    init_db()
+
+    if args.backend == "local":
+        backend = LocalBatchBackend(os.path.join(args.run_dir, "local_backend"))
+    else:
+        backend = OpenAIBatchBackend()
+
+    db = SessionLocal()
+    try:
+        pipeline = ContentBatchPipeline(
+            db=db,
+            backend=backend,
+            run_dir=args.run_dir,
+            poll_interval=args.poll_interval,
+            progress=print,
+        )
+        summary = pipeline.run(
+            difficulties=args.difficulty or ["beginner", "intermediate"],
+            category=args.category,
+            limit=args.limit,
+        )
+    finally:
+        db.close()
+
+    print("\nRun summary:")
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+"""
+Replay recorded grading traffic against a grading configuration
+
+Re-grades every submission of a recording made with GRADING_RECORD_PATH
+using the chosen model / prompt version / cache settings and compares the
+verdicts with the recorded ones. Reports agreement rate, latency
+distribution, tokens per request and estimated cost, next to the same
+figures for the recording itself.
+
+--fake replaces the LLM with an offline stand-in that returns the recorded
+verdict (optionally flipping a deterministic fraction with --fake-flip),
+sleeps for the recorded latency and estimates tokens from the prompt. It
+needs no API key and is meant for checking the replay path, caching and
+concurrency before spending money.
+
+Usage:
+    python replay_grading.py data/grading.jsonl --fake --concurrency 16
+    python replay_grading.py data/grading.jsonl --model gpt-4.1-mini --prompt-version v1
+    python replay_grading.py data/grading.jsonl.gz --cache none --limit 500 --json report.json
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.services.content_generator import estimate_tokens
+from app.services.grading_recorder import GradingRecorder
+from app.services.translation_service import TranslationService
+from app.shared import MemoryBackend, TokenBucket, get_shared_backend
+
+# USD per million (input, output) tokens
+PRICES_PER_MILLION = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1": (2.00, 8.00),
+}
+
+USER_MESSAGE = re.compile(r"Original English: (.*)\nStudent's Korean translation: (.*)\n\nEvaluate", re.S)
+
+
+def make_fake_llm(records: list[dict], flip_rate: float, latency_scale: float):
+    """Offline LLM that answers with the recorded verdicts"""
+    from langchain_core.messages import AIMessage
+    from langchain_core.runnables import RunnableLambda
+
+    verdicts = {(r["s"], r["t"]): r for r in records}
+    uncached = [r["ms"] for r in records if not r.get("c")]
+    typical_ms = statistics.median(uncached) if uncached else 500
+
+    def respond(prompt_value):
+        messages = prompt_value.to_messages()
+        sentence, translation = USER_MESSAGE.search(messages[-1].content).groups()
+        record = verdicts[(sentence, translation)]
+        result = record["r"]
+        digest = hashlib.sha256(f"{sentence}\x1f{translation}".encode()).digest()
+        if digest[0] / 256 < flip_rate:
+            result = "incorrect" if result != "incorrect" else "good"
+        time.sleep((typical_ms if record.get("c") else record["ms"]) * latency_scale / 1000)
+
+        content = json.dumps({"result": result, "is_correct": result != "incorrect", "feedback": "fake"})
+        prompt_tokens = estimate_tokens("".join(m.content for m in messages))
+        return AIMessage(content=content, usage_metadata={
+            "input_tokens": prompt_tokens,
+            "output_tokens": estimate_tokens(content),
+            "total_tokens": prompt_tokens + estimate_tokens(content),
+        })
+
+    return RunnableLambda(respond)
+
+
+def percentiles(values: list[float]) -> dict:
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    ordered = sorted(values)
+
+    def pct(p):
+        return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 1)
+
+    return {"p50": pct(0.50), "p95": pct(0.95), "p99": pct(0.99), "max": round(ordered[-1], 1)}
+
+
+def cost(model: str, input_tokens: int, output_tokens: int, prices=None) -> float:
+    price_in, price_out = prices or PRICES_PER_MILLION.get(model, (0.0, 0.0))
+    return (input_tokens * price_in + output_tokens * price_out) / 1_000_000
+
+
+def summarize_recording(records: list[dict]) -> dict:
+    llm_calls = [r for r in records if not r.get("c")]
+    input_tokens = sum(r.get("ti", 0) for r in records)
+    output_tokens = sum(r.get("to", 0) for r in records)
+    models = Counter(r.get("m") for r in records)
+    return {
+        "requests": len(records),
+        "cache_hits": len(records) - len(llm_calls),
+        "verdicts": dict(Counter(r["r"] for r in records)),
+        "latency_ms": percentiles([r["ms"] for r in llm_calls]),
+        "tokens_per_request": round((input_tokens + output_tokens) / max(1, len(records)), 1),
+        "estimated_cost_usd": round(sum(
+            cost(r.get("m"), r.get("ti", 0), r.get("to", 0)) for r in records
+        ), 6),
+        "models": dict(models),
+    }
+
+
+def replay(records: list[dict], service: TranslationService, concurrency: int, prices=None) -> dict:
+    # grade() rather than check_translation(), so the replay itself is never recorded
+    def run(record):
+        start = time.perf_counter()
+        try:
+            result, stats = service.grade(record["s"], record["t"])
+        except Exception as e:
+            return record, None, None, (time.perf_counter() - start) * 1000, str(e)
+        return record, result, stats, (time.perf_counter() - start) * 1000, None
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(run, records))
+    elapsed = time.perf_counter() - started
+
+    graded = [o for o in outcomes if o[4] is None]
+    errors = Counter(o[4] for o in outcomes if o[4] is not None)
+    agree = sum(1 for record, result, *_ in graded if result.result == record["r"])
+    agree_correct = sum(1 for record, result, *_ in graded if int(result.is_correct) == record["ok"])
+    input_tokens = sum(stats.input_tokens for _, _, stats, _, _ in graded)
+    output_tokens = sum(stats.output_tokens for _, _, stats, _, _ in graded)
+    total_cost = cost(service.model, input_tokens, output_tokens, prices)
+
+    return {
+        "requests": len(records),
+        "errors": sum(errors.values()),
+        "error_kinds": dict(errors.most_common(5)),
+        "agreement_rate": round(agree / max(1, len(graded)), 4),
+        "is_correct_agreement_rate": round(agree_correct / max(1, len(graded)), 4),
+        "confusion": dict(Counter(f"{record['r']}->{result.result}" for record, result, *_ in graded)),
+        "cache_hits": sum(1 for _, _, stats, _, _ in graded if stats.cached),
+        "latency_ms": percentiles([o[3] for o in graded]),
+        "throughput_rps": round(len(records) / elapsed, 2) if elapsed else None,
+        "tokens_per_request": round((input_tokens + output_tokens) / max(1, len(graded)), 1),
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "estimated_cost_usd": round(total_cost, 6),
+        "estimated_cost_per_1k_requests_usd": round(total_cost * 1000 / max(1, len(graded)), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded grading traffic")
+    parser.add_argument("recording", help="File written via GRADING_RECORD_PATH (.jsonl or .jsonl.gz)")
+    parser.add_argument("--model", default=None, help="Model to grade with (default: GRADING_MODEL or the service default)")
+    parser.add_argument("--prompt-version", default=None, help="Prompt version from translation_service.PROMPTS")
+    parser.add_argument("--cache", choices=["memory", "shared", "none"], default="memory",
+                        help="Fresh in-process cache, the SHARED_BACKEND_URL cache, or no cache")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rpm", type=float, default=0, help="Rate limit for the replay (0 = unlimited)")
+    parser.add_argument("--limit", type=int, default=None, help="Replay only the first N records")
+    parser.add_argument("--fake", action="store_true", help="Offline fake LLM answering with recorded verdicts")
+    parser.add_argument("--fake-flip", type=float, default=0.0, help="Fraction of verdicts the fake LLM changes")
+    parser.add_argument("--fake-latency-scale", type=float, default=1.0, help="Multiplier for recorded latencies")
+    parser.add_argument("--price-in", type=float, default=None, help="USD per 1M input tokens (overrides the table)")
+    parser.add_argument("--price-out", type=float, default=None, help="USD per 1M output tokens")
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write the report here")
+    args = parser.parse_args()
+
+    records = list(GradingRecorder.read(args.recording))
+    if args.limit:
+        records = records[:args.limit]
+    if not records:
+        raise SystemExit("Recording is empty")
+
+    cache = {"memory": MemoryBackend(), "shared": get_shared_backend(), "none": None}[args.cache]
+    rate = args.rpm / 60.0 if args.rpm else 1e9
+    service = TranslationService(
+        model=args.model,
+        prompt_version=args.prompt_version,
+        llm=make_fake_llm(records, args.fake_flip, args.fake_latency_scale) if args.fake else None,
+        cache=cache,
+        use_cache=cache is not None,
+        rate_limiter=TokenBucket(MemoryBackend(), "replay", rate=rate, capacity=max(1.0, min(rate, 1e9))),
+        rate_limit_timeout=300,  # --rpm paces the replay; don't give up like a live request
+    )
+    prices = (args.price_in, args.price_out) if args.price_in is not None and args.price_out is not None else None
+
+    report = {
+        "config": {
+            "model": service.model,
+            "prompt_version": service.prompt_version,
+            "cache": args.cache,
+            "concurrency": args.concurrency,
+            "fake_llm": args.fake,
+        },
+        "recorded": summarize_recording(records),
+        "replayed": replay(records, service, args.concurrency, prices),
+    }
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,234 @@
+"""
+Admission control checks (app/admission.py)
+
+1. A lane admits up to its concurrency, queues FIFO and hands released slots on
+2. Requests are shed when the queue is full, when the estimated wait exceeds
+   the budget, and when a queued request's deadline passes
+3. The middleware answers a shed request with 503 + Retry-After
+4. Content generation waits for rate limit tokens no longer than the bulk
+   budget and refunds the bulk token when the shared bucket times out
+5. Grading waits no longer than the interactive budget, and an exhausted
+   rate limit is a 503 + Retry-After from grading and generation
+
+Usage: python -m pytest test_admission.py
+"""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.admission import AdmissionController, AdmissionLane, AdmissionMiddleware, PriorityClass, Shed, latency_budget
+from app.endpoints import articles, translation
+from app.services import ArticleService, TranslationService
+from app.services.content_generator import ContentGeneratorService
+from app.shared import MemoryBackend, RateLimitExceeded, TokenBucket
+
+
+def lane(max_concurrent=1, max_queue=2, latency_budget=1.0, expected_service_time=0.1):
+    return AdmissionLane(PriorityClass("test", max_concurrent, max_queue, latency_budget, expected_service_time))
+
+
+def test_queued_requests_get_released_slots_in_order():
+    async def scenario():
+        test_lane = lane(max_concurrent=1, max_queue=2)
+        await test_lane.acquire()
+        order = []
+
+        async def queued(name):
+            await test_lane.acquire()
+            order.append(name)
+
+        waiters = [asyncio.create_task(queued("first")), asyncio.create_task(queued("second"))]
+        await asyncio.sleep(0)
+        assert len(test_lane.waiters) == 2 and test_lane.active == 1
+
+        test_lane.release(0.1)
+        await asyncio.sleep(0)
+        test_lane.release(0.1)
+        await asyncio.gather(*waiters)
+        test_lane.release(0.1)
+        return order, test_lane
+
+    order, test_lane = asyncio.run(scenario())
+    assert order == ["first", "second"]
+    assert test_lane.active == 0 and not test_lane.waiters
+
+
+def test_full_queue_is_shed():
+    async def scenario():
+        test_lane = lane(max_concurrent=1, max_queue=1, latency_budget=10.0)
+        await test_lane.acquire()
+        waiter = asyncio.create_task(test_lane.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(Shed) as shed:
+            await test_lane.acquire()
+        waiter.cancel()
+        return shed.value
+
+    shed = asyncio.run(scenario())
+    assert shed.reason == "queue_full" and shed.retry_after > 0
+
+
+def test_wait_over_budget_is_shed_immediately():
+    async def scenario():
+        test_lane = lane(max_concurrent=1, max_queue=10, latency_budget=0.5, expected_service_time=2.0)
+        await test_lane.acquire()
+        start = time.monotonic()
+        with pytest.raises(Shed) as shed:
+            await test_lane.acquire()
+        return shed.value, time.monotonic() - start, test_lane
+
+    shed, elapsed, test_lane = asyncio.run(scenario())
+    assert shed.reason == "over_budget" and shed.retry_after == 2.0
+    assert elapsed < 0.1 and not test_lane.waiters
+
+
+def test_queued_request_is_shed_at_its_deadline():
+    async def scenario():
+        test_lane = lane(max_concurrent=1, max_queue=10, latency_budget=0.1, expected_service_time=0.05)
+        await test_lane.acquire()
+        with pytest.raises(Shed) as shed:
+            await test_lane.acquire()
+        return shed.value, test_lane
+
+    shed, test_lane = asyncio.run(scenario())
+    assert shed.reason == "deadline"
+    assert not test_lane.waiters and test_lane.active == 1
+
+
+def test_routes_map_to_classes():
+    controller = AdmissionController()
+    assert controller.classify("POST", "/api/articles/generate-from-voa").priority.name == "bulk"
+    assert controller.classify("POST", "/api/translation/check").priority.name == "interactive"
+    assert controller.classify("GET", "/api/articles/").priority.name == "standard"
+    assert controller.classify("GET", "/health") is None
+
+
+def make_app(controller):
+    app = FastAPI()
+
+    @app.get("/api/items")
+    def items():
+        return {"ok": True}
+
+    app.add_middleware(AdmissionMiddleware, controller=controller)
+    return app
+
+
+def test_middleware_rejects_with_503_and_retry_after():
+    controller = AdmissionController(
+        classes=[PriorityClass("standard", max_concurrent=1, max_queue=0, latency_budget=1.0, expected_service_time=2.5)],
+        routes=[(None, "/api/", "standard")],
+    )
+    client = TestClient(make_app(controller))
+    assert client.get("/api/items").json() == {"ok": True}
+
+    controller.lanes["standard"].active = 1  # a request is in flight
+    response = client.get("/api/items")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "3"
+    assert response.json() == {"detail": "Server busy, please retry", "reason": "queue_full"}
+
+
+def test_latency_budget_follows_env(monkeypatch):
+    assert latency_budget("bulk") == 30.0
+    monkeypatch.setenv("ADMISSION_BULK_BUDGET", "7")
+    assert latency_budget("bulk") == 7.0
+
+
+def generator(bulk, shared, slot_timeout):
+    service = ContentGeneratorService.__new__(ContentGeneratorService)
+    service.bulk_limiter, service.rate_limiter, service.slot_timeout = bulk, shared, slot_timeout
+    return service
+
+
+def test_generation_refunds_bulk_token_when_shared_bucket_times_out():
+    backend = MemoryBackend()
+    bulk = TokenBucket(backend, "bulk", rate=0.001, capacity=1)
+    shared = TokenBucket(backend, "shared", rate=0.001, capacity=1)
+    assert shared.try_acquire() == 0  # grading took the last shared token
+
+    start = time.monotonic()
+    with pytest.raises(RuntimeError, match="rate limit"):
+        generator(bulk, shared, slot_timeout=0.2)._acquire_llm_slot()
+    assert time.monotonic() - start < 1.0
+    assert bulk.try_acquire() == 0  # the bulk token came back
+
+
+def test_generation_takes_both_tokens():
+    backend = MemoryBackend()
+    bulk = TokenBucket(backend, "bulk", rate=0.001, capacity=1)
+    shared = TokenBucket(backend, "shared", rate=0.001, capacity=2)
+
+    generator(bulk, shared, slot_timeout=0.2)._acquire_llm_slot()
+    assert bulk.try_acquire() > 0
+    assert shared.try_acquire() == 0 and shared.try_acquire() > 0
+
+
+def test_rate_limit_exceeded_carries_the_wait():
+    bucket = TokenBucket(MemoryBackend(), "shared", rate=0.5, capacity=1)
+    bucket.acquire_or_raise(timeout=0)
+    with pytest.raises(RateLimitExceeded) as exceeded:
+        bucket.acquire_or_raise(timeout=0.1)
+    assert exceeded.value.retry_after == pytest.approx(2.0, abs=0.1)
+
+
+def empty_bucket():
+    bucket = TokenBucket(MemoryBackend(), "shared", rate=0.001, capacity=1)
+    assert bucket.try_acquire() == 0
+    return bucket
+
+
+def grader(**kwargs):
+    from langchain_core.runnables import RunnableLambda
+
+    def unreachable(prompt_value):
+        raise AssertionError("the LLM must not be called without a token")
+
+    return TranslationService(llm=RunnableLambda(unreachable), use_cache=False, **kwargs)
+
+
+def test_grading_waits_no_longer_than_the_interactive_budget(monkeypatch):
+    monkeypatch.setenv("ADMISSION_INTERACTIVE_BUDGET", "0.2")
+    service = grader(rate_limiter=empty_bucket())
+    assert service.rate_limit_timeout == 0.2
+
+    start = time.monotonic()
+    with pytest.raises(RateLimitExceeded):
+        service.grade("Hello.", "Hola.")
+    assert time.monotonic() - start < 1.0
+
+
+def test_rate_limited_grading_is_503(client, db, monkeypatch):
+    sentence_id = ArticleService.create_article(db=db, title="Hi", content="Hello there.").sentences[0].id
+    monkeypatch.setattr(translation, "_translation_service", grader(rate_limiter=empty_bucket(), rate_limit_timeout=0))
+
+    response = client.post("/api/translation/check", json={"sentence_id": sentence_id, "user_translation": "Hola."})
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+class RateLimitedGenerator:
+    def generate_validated(self, title, summary, difficulty, category):
+        raise RateLimitExceeded(4.2)
+
+    def render_messages(self, title, summary, difficulty, category):
+        return [{"content": f"{title} {summary}"}]
+
+
+class StubVOAService:
+    def fetch_articles(self, difficulty, category=None, limit=10):
+        return [{"title": "Story", "summary": "About a story.", "category": "science",
+                 "source_url": "https://voa.example/1", "published_date": None}]
+
+
+def test_rate_limited_generation_is_503(client, monkeypatch):
+    monkeypatch.setattr(articles, "_voa_service", StubVOAService())
+    monkeypatch.setattr(articles, "_content_generator", RateLimitedGenerator())
+
+    response = client.post("/api/articles/generate-from-voa", params={"difficulty": "beginner", "limit": 1})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "5"
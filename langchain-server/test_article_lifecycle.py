@@ -0,0 +1,101 @@
+"""
+Article delete and archive checks (ArticleService, /api/articles)
+
+1. Deleting an article cascades to sentences, progress and vocabulary links
+2. bulk_delete removes every matching article, archived ones included
+3. bulk_archive hides active matches from listings, search, vocabulary
+   lookups and GET by id while keeping their sentences and progress
+4. POST /api/articles/bulk needs a filter
+
+Usage: python -m pytest test_article_lifecycle.py
+"""
+
+from app.models import Article, ArticleVocabulary, Sentence, SentenceVocabulary, UserProgress
+from app.services import ArticleService
+from app.services.search_service import SearchService
+from app.services.srs_scheduler import SRSScheduler
+
+
+def make_article(db, title, category="science", difficulty="beginner"):
+    article = ArticleService.create_article(
+        db=db, title=title, category=category, difficulty=difficulty,
+        content=f"{title} is about the ocean. Scientists study it every year.",
+        vocabulary=[{"word": "ocean", "definition": "a large sea"}],
+    )
+    SRSScheduler.record_review(db, "amy", article.sentences[0].id, "x", "good", True)
+    return article.id
+
+
+def children(db, article_id):
+    sentence_ids = [s for (s,) in db.query(Sentence.id).filter(Sentence.article_id == article_id)]
+    return dict(
+        sentences=len(sentence_ids),
+        progress=db.query(UserProgress).filter(UserProgress.sentence_id.in_(sentence_ids)).count(),
+        article_words=db.query(ArticleVocabulary).filter(ArticleVocabulary.article_id == article_id).count(),
+        sentence_words=db.query(SentenceVocabulary).filter(SentenceVocabulary.sentence_id.in_(sentence_ids)).count(),
+    )
+
+
+def test_delete_cascades_to_children(db):
+    article_id = make_article(db, "Tides")
+    assert children(db, article_id) == dict(sentences=2, progress=1, article_words=1, sentence_words=1)
+
+    assert ArticleService.delete_article(db, article_id)
+    db.expire_all()
+
+    assert db.get(Article, article_id) is None
+    assert children(db, article_id) == dict(sentences=0, progress=0, article_words=0, sentence_words=0)
+    assert not ArticleService.delete_article(db, article_id)
+
+
+def test_bulk_delete_includes_archived(db):
+    science = [make_article(db, "Tides"), make_article(db, "Reefs")]
+    health = make_article(db, "Sleep", category="health")
+    ArticleService.bulk_archive(db, difficulty="beginner", category="science")
+
+    assert ArticleService.bulk_delete(db, category="science") == science
+    db.expire_all()
+
+    assert [a for (a,) in db.query(Article.id)] == [health]
+    assert db.query(Sentence).count() == 2 and db.query(UserProgress).count() == 1
+    assert [r["id"] for r in SearchService.search(db, "ocean")] == [health]
+
+
+def test_bulk_archive_hides_but_keeps_children(client, db):
+    beginner = make_article(db, "Tides")
+    advanced = make_article(db, "Reefs", difficulty="intermediate")
+
+    assert ArticleService.bulk_archive(db, difficulty="beginner") == [beginner]
+    # Already archived articles are not archived again
+    assert ArticleService.bulk_archive(db, difficulty="beginner") == []
+    db.expire_all()
+
+    assert db.get(Article, beginner).archived_at is not None
+    assert children(db, beginner) == dict(sentences=2, progress=1, article_words=1, sentence_words=1)
+    assert ArticleService.get_article(db, beginner) is None
+
+    assert [a["id"] for a in client.get("/api/articles/").json()] == [advanced]
+    assert [r["id"] for r in client.get("/api/articles/search", params={"q": "ocean"}).json()] == [advanced]
+    assert client.get(f"/api/articles/{beginner}").status_code == 404
+    assert client.get(f"/api/articles/{advanced}").status_code == 200
+
+    assert [a["article_id"] for a in client.get("/api/vocabulary/ocean/articles").json()] == [advanced]
+    assert {s["article_id"] for s in client.get("/api/vocabulary/ocean/sentences").json()} == {advanced}
+    words = client.get("/api/vocabulary/", params={"article_ids": [beginner, advanced]}).json()
+    assert [(w["word"], w["article_ids"]) for w in words] == [("ocean", [advanced])]
+
+
+def test_bulk_endpoint(client, db):
+    tides = make_article(db, "Tides")
+    make_article(db, "Sleep", category="health")
+
+    assert client.post("/api/articles/bulk", json={"action": "delete"}).status_code == 400
+
+    response = client.post("/api/articles/bulk", json={"action": "delete", "category": "science"})
+    assert response.status_code == 200
+    assert response.json() == {"action": "delete", "count": 1, "article_ids": [tides]}
+    assert client.get(f"/api/articles/{tides}").status_code == 404
+
+    response = client.post("/api/articles/bulk", json={"action": "archive", "category": "health"})
+    assert response.json()["count"] == 1
+    assert client.get("/api/articles/").json() == []
@@ -0,0 +1,135 @@
+"""
+Nightly batch pipeline checks (ContentBatchPipeline on LocalBatchBackend)
+
+1. A run collects, writes, submits, downloads and ingests offline
+2. A story listed in several feeds is generated once; stories already in the
+   library are skipped
+3. Failed requests and output that fails ContentValidator are reported and
+   the rest ingested
+4. An interrupted run resumes from its checkpoint without duplicating articles
+
+Usage: python -m pytest test_batch_pipeline.py
+"""
+
+import json
+
+from app.batch import ContentBatchPipeline, LocalBatchBackend
+from app.batch.backends import fake_completion
+from app.models import Article
+from app.services import ArticleService
+
+
+class StubVOAService:
+    """Fixed feed contents; the science story is also listed under beginner"""
+
+    FEEDS = {
+        "beginner": [
+            {"title": "Bees in winter", "source_url": "https://voa.example/bees", "category": "science"},
+            {"title": "New school year", "source_url": "https://voa.example/school", "category": "as_it_is"},
+        ],
+        "intermediate": [
+            {"title": "Bees in winter", "source_url": "https://voa.example/bees", "category": "science"},
+            {"title": "Ocean heat", "source_url": "https://voa.example/ocean", "category": "science"},
+            {"title": "Ocean heat", "source_url": "https://voa.example/ocean", "category": "health"},
+            {"title": "Old story", "source_url": "https://voa.example/old", "category": "health"},
+        ],
+    }
+
+    def fetch_articles(self, difficulty, category=None, limit=10):
+        return [
+            {**entry, "summary": f"About {entry['title']}.", "difficulty": difficulty, "published_date": None}
+            for entry in self.FEEDS[difficulty][:limit]
+        ]
+
+
+def make_pipeline(db, run_dir, complete=None):
+    return ContentBatchPipeline(
+        db=db,
+        backend=LocalBatchBackend(str(run_dir / "local_backend"), complete=complete),
+        run_dir=str(run_dir),
+        voa_service=StubVOAService(),
+        ingest_chunk_size=2,
+        poll_interval=0,
+        progress=lambda message: None,
+    )
+
+
+def library_urls(db):
+    return sorted(url for (url,) in db.query(Article.source_url))
+
+
+def test_run_deduplicates_and_ingests(db, tmp_path):
+    ArticleService.create_article(db=db, title="Old story", content="Already here.",
+                                  source_url="https://voa.example/old")
+    run_dir = tmp_path / "run"
+
+    summary = make_pipeline(db, run_dir).run(["beginner", "intermediate"])
+
+    with open(run_dir / "requests.jsonl") as f:
+        requested = [json.loads(line)["custom_id"] for line in f]
+    assert len(requested) == 3
+    assert summary["requested"] == 3 and summary["ingested"] == 3 and summary["failed"] == 0
+    assert summary["prompt_tokens"] > 0 and summary["completion_tokens"] > 0
+    assert library_urls(db) == [
+        "https://voa.example/bees", "https://voa.example/ocean",
+        "https://voa.example/old", "https://voa.example/school",
+    ]
+    # The first feed a story appears in decides its difficulty
+    bees = db.query(Article).filter(Article.source_url == "https://voa.example/bees").one()
+    assert bees.difficulty == "beginner" and len(bees.sentences) > 0 and bees.vocabulary
+
+    with open(tmp_path / "runs.jsonl") as f:
+        assert [json.loads(line)["ingested"] for line in f] == [3]
+
+    # Re-running a finished run changes nothing
+    assert make_pipeline(db, run_dir).run(["beginner", "intermediate"])["ingested"] == 3
+    assert len(library_urls(db)) == 4
+
+
+def test_failed_requests_are_reported(db, tmp_path):
+    def complete(body):
+        if "Ocean heat" in body["messages"][-1]["content"]:
+            raise RuntimeError("model overloaded")
+        return fake_completion(body)
+
+    summary = make_pipeline(db, tmp_path / "run", complete=complete).run(["intermediate"])
+
+    assert summary["requested"] == 3 and summary["ingested"] == 2 and summary["failed"] == 1
+    assert "https://voa.example/ocean" not in library_urls(db)
+
+
+def test_invalid_output_is_not_ingested(db, tmp_path):
+    def complete(body):
+        result = fake_completion(body)
+        if "Ocean heat" in body["messages"][-1]["content"]:
+            content = json.loads(result["choices"][0]["message"]["content"])
+            content["questions"][0]["correct_answer"] = 7
+            result["choices"][0]["message"]["content"] = json.dumps(content)
+        return result
+
+    run_dir = tmp_path / "run"
+    summary = make_pipeline(db, run_dir, complete=complete).run(["intermediate"])
+
+    assert summary["ingested"] == 2 and summary["failed"] == 1
+    assert "https://voa.example/ocean" not in library_urls(db)
+    with open(run_dir / "state.json") as f:
+        [reason] = json.load(f)["failed"].values()
+    assert reason.startswith("invalid content:") and "out of range" in reason
+
+
+def test_interrupted_run_resumes(db, tmp_path):
+    run_dir = tmp_path / "run"
+    first = make_pipeline(db, run_dir)
+    first.collect(["beginner", "intermediate"])
+    first.write_requests()
+    first.submit_and_wait()
+    batch_id = first.state["batch_id"]
+
+    # A new process picks the run up from state.json without resubmitting
+    resumed = make_pipeline(db, run_dir)
+    assert resumed.state["stage"] == "submitted"
+    summary = resumed.run(["beginner", "intermediate"])
+
+    assert summary["batch_id"] == batch_id
+    assert summary["ingested"] == 4
+    assert len(library_urls(db)) == 4
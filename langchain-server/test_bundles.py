@@ -0,0 +1,166 @@
+"""
+Static article bundle checks (BundleService, /api/articles/bundles)
+
+1. Creating an article writes its content-hashed file and gzip twin, an index
+   page and manifest.json (also gzipped)
+2. Pages are keyed by id range; adding to a page retires its old file
+3. Deleting or archiving an article removes its files and updates its page
+4. Retired pages are kept for BUNDLE_RETAIN_SECONDS, then removed
+5. export_all rebuilds the bundles and removes unreferenced files
+6. GET /api/articles/bundles lists the pages and /{id}/bundle redirects
+
+Usage: python -m pytest test_bundles.py
+"""
+
+import gzip
+import json
+import re
+import types
+
+import pytest
+
+from app.services import ArticleService
+from app.services import bundle_service
+from app.services.bundle_service import BundleService
+
+
+@pytest.fixture
+def bundle_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("BUNDLE_DIR", str(tmp_path))
+    monkeypatch.setenv("BUNDLE_PAGE_SIZE", "2")
+    return tmp_path
+
+
+def make_article(db, title, category="science"):
+    return ArticleService.create_article(
+        db=db, title=title, category=category, content=f"{title} is about the sea. It is short.",
+    )
+
+
+def read(root, path):
+    with open(root / path, "rb") as f:
+        data = f.read()
+    with open(root / f"{path}.gz", "rb") as f:
+        assert gzip.decompress(f.read()) == data
+    return json.loads(data)
+
+
+def manifest(root):
+    return read(root, BundleService.MANIFEST)
+
+
+def page_ids(root, page):
+    return [a["id"] for a in read(root, page["path"])["articles"]]
+
+
+def test_create_writes_article_page_and_manifest(db, bundle_dir):
+    article = make_article(db, "Tides")
+    assert re.fullmatch(rf"articles/{article.id}\.[0-9a-f]{{16}}\.json", article.bundle_path)
+
+    bundle = read(bundle_dir, article.bundle_path)
+    assert bundle["title"] == "Tides"
+    assert [s["text"] for s in bundle["sentences"]] == ["Tides is about the sea.", "It is short."]
+
+    current = manifest(bundle_dir)
+    assert current["total"] == 1 and current["page_size"] == 2
+    [page] = current["pages"]
+    assert page["page"] == article.id // 2 and page["count"] == 1
+    summary = read(bundle_dir, page["path"])["articles"][0]
+    assert (summary["id"], summary["path"]) == (article.id, article.bundle_path)
+
+
+def test_pages_follow_id_ranges(db, bundle_dir):
+    ids = [make_article(db, f"Article {i}").id for i in range(3)]
+    first = manifest(bundle_dir)
+    assert first["total"] == 3
+    assert [p["page"] for p in first["pages"]] == sorted({i // 2 for i in ids}, reverse=True)
+    for page in first["pages"]:
+        assert page_ids(bundle_dir, page) == sorted((i for i in ids if i // 2 == page["page"]), reverse=True)
+
+    if ids[-1] % 2:  # the last page is full: open a new one to add to
+        ids.append(make_article(db, "Article 3").id)
+        first = manifest(bundle_dir)
+    newest = make_article(db, "Newest").id
+    second = manifest(bundle_dir)
+    assert second["total"] == len(ids) + 1
+    changed = [p for p in first["pages"] if p not in second["pages"]]
+    assert [p["page"] for p in changed] == [newest // 2]
+    # Clients holding the old manifest can still read the old page
+    assert changed[0]["path"] in [r["path"] for r in second["retired"]]
+    assert (bundle_dir / changed[0]["path"]).exists()
+
+
+def test_delete_and_archive_remove_files(db, bundle_dir):
+    deleted, archived, kept = (make_article(db, t, category=c) for t, c in
+                               [("Gone", "science"), ("Old", "history"), ("Kept", "science")])
+    deleted_path, archived_path = deleted.bundle_path, archived.bundle_path
+
+    ArticleService.delete_article(db, deleted.id)
+    ArticleService.bulk_archive(db, category="history")
+
+    for path in (deleted_path, archived_path):
+        assert not (bundle_dir / path).exists() and not (bundle_dir / f"{path}.gz").exists()
+    current = manifest(bundle_dir)
+    assert current["total"] == 1
+    assert [i for page in current["pages"] for i in page_ids(bundle_dir, page)] == [kept.id]
+
+
+def test_retired_pages_are_purged_after_retention(db, bundle_dir, monkeypatch):
+    clock = types.SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(bundle_service, "time", types.SimpleNamespace(time=lambda: clock.now))
+    monkeypatch.setenv("BUNDLE_RETAIN_SECONDS", "60")
+
+    first = make_article(db, "First")
+    if first.id % 2:  # start a fresh page so the next article shares it
+        first = make_article(db, "First again")
+    old_page = manifest(bundle_dir)["pages"][0]["path"]
+
+    clock.now = 1010
+    make_article(db, "Second")
+    assert (bundle_dir / old_page).exists()
+
+    clock.now = 1050  # within the retention period
+    make_article(db, "Third")
+    assert (bundle_dir / old_page).exists()
+
+    clock.now = 1100
+    make_article(db, "Fourth")
+    assert not (bundle_dir / old_page).exists() and not (bundle_dir / f"{old_page}.gz").exists()
+    assert old_page not in [r["path"] for r in manifest(bundle_dir)["retired"]]
+
+
+def test_export_all_removes_stale_files(db, bundle_dir):
+    kept = make_article(db, "Kept")
+    make_article(db, "Old", category="history")
+    ArticleService.bulk_archive(db, category="history")
+    for stale in ("articles/999.0000000000000000.json", "articles/999.0000000000000000.json.gz",
+                  "index/page-999.0000000000000000.json"):
+        (bundle_dir / stale).write_text("{}")
+
+    result = BundleService.export_all(db, progress=lambda message: None)
+    assert result == {"articles": 1, "pages": 1, "removed_files": 3}
+    assert not (bundle_dir / "articles/999.0000000000000000.json").exists()
+    assert not (bundle_dir / "index/page-999.0000000000000000.json").exists()
+    assert read(bundle_dir, kept.bundle_path)["title"] == "Kept"
+    assert manifest(bundle_dir)["total"] == 1
+
+    # A second run has nothing to rewrite or remove
+    assert BundleService.export_all(db, progress=lambda message: None)["removed_files"] == 0
+
+
+def test_bundle_endpoints(client, db, bundle_dir, monkeypatch):
+    article = make_article(db, "Tides")
+
+    index = client.get("/api/articles/bundles").json()
+    assert index["manifest_url"] == "/bundles/manifest.json"
+    assert index["total"] == 1 and index["page_size"] == 2
+    page_path = manifest(bundle_dir)["pages"][0]["path"]
+    assert index["pages"] == [{"page": article.id // 2, "url": f"/bundles/{page_path}", "count": 1}]
+
+    response = client.get(f"/api/articles/{article.id}/bundle", follow_redirects=False)
+    assert response.status_code == 307
+    assert response.headers["location"] == f"/bundles/{article.bundle_path}"
+    assert client.get("/api/articles/999999/bundle", follow_redirects=False).status_code == 404
+
+    monkeypatch.setenv("BUNDLE_DIR", "")
+    assert client.get("/api/articles/bundles").status_code == 404
@@ -0,0 +1,55 @@
+"""
+Cold-start budget check
+
+Imports main.py in a fresh interpreter (as a serverless cold start does) and
+fails when startup regresses:
+1. Import time of main must stay under COLD_START_BUDGET seconds (default 1.5)
+2. LLM / RSS libraries must not be imported until first use
+
+Usage: python test_cold_start.py  (also collected by pytest)
+"""
+
+import os
+import subprocess
+import sys
+import json
+
+BUDGET_SECONDS = float(os.getenv("COLD_START_BUDGET", "1.5"))
+LAZY_MODULES = ["langchain_openai", "langchain_core", "openai", "feedparser"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import main
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (LAZY_MODULES,)
+
+
+def measure_cold_start(runs: int = 3) -> dict:
+    """Best-of-N import time of main.py in fresh interpreters"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE],
+            cwd=here, capture_output=True, text=True, check=True
+        )
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return min(results, key=lambda r: r["elapsed"])
+
+
+def test_cold_start_budget():
+    result = measure_cold_start()
+    assert not result["loaded"], f"Eagerly imported at startup: {result['loaded']}"
+    assert result["elapsed"] < BUDGET_SECONDS, (
+        f"Cold start took {result['elapsed']:.2f}s, budget is {BUDGET_SECONDS:.2f}s"
+    )
+
+
+if __name__ == '__main__':
+    result = measure_cold_start()
+    print(f"Import time of main: {result['elapsed']:.3f}s (budget {BUDGET_SECONDS:.2f}s)")
+    print(f"Eagerly loaded heavy modules: {result['loaded'] or 'none'}")
+    test_cold_start_budget()
+    print("✓ Cold start within budget")
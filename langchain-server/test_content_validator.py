@@ -0,0 +1,173 @@
+"""
+Generated content validation checks
+
+1. ContentValidator accepts good content and reports each rule against the
+   part that has to be regenerated
+2. ContentGeneratorService.generate_validated repairs only the broken part,
+   regenerates everything for a bad passage, and raises InvalidContentError
+   after max_repairs instead of returning bad content
+
+The generator runs with stubbed model calls, so no API key is needed.
+
+Usage: python -m pytest test_content_validator.py
+"""
+
+import pytest
+
+from app.metrics import _key, metrics
+from app.services.content_generator import (
+    ComprehensionQuestion, ContentGeneratorService, GeneratedContent, InvalidContentError, VocabularyItem,
+    estimate_tokens,
+)
+from app.services.content_validator import ContentValidator
+
+SENTENCES = [
+    "Scientists study the ocean near the coast every year.",
+    "They measure the water and count the fish they find.",
+    "This year the water was warmer than it was ten years ago.",
+    "Warm water can make it hard for some fish to live.",
+    "Students from a local school helped the scientists with their work.",
+    "They hope people will learn more about the ocean and protect it.",
+]
+WORDS = ["scientists", "ocean", "measure", "warmer", "protect"]
+
+
+def passage(sentence_count: int = 18) -> str:
+    return " ".join(SENTENCES[i % len(SENTENCES)] for i in range(sentence_count))
+
+
+def vocabulary(words=WORDS) -> list[VocabularyItem]:
+    return [VocabularyItem(word=w, definition=f"meaning of {w}") for w in words]
+
+
+def questions(count: int = 3, **overrides) -> list[ComprehensionQuestion]:
+    fields = dict(question="What do the scientists study?", options=["Fish", "Birds", "Trees", "Rocks"], correct_answer=0)
+    fields.update(overrides)
+    return [ComprehensionQuestion(**fields) for _ in range(count)]
+
+
+def content(**overrides) -> GeneratedContent:
+    fields = dict(reading_passage=passage(), vocabulary=vocabulary(), questions=questions())
+    fields.update(overrides)
+    return GeneratedContent(**fields)
+
+
+def test_good_content_is_valid():
+    report = ContentValidator.validate(content())
+    assert report.valid, report.issues
+
+
+def test_vocabulary_matches_inflected_forms():
+    # "measure" and "protect" appear in the passage only as other forms
+    text = passage().replace("measure", "measured").replace("protect it", "protecting it")
+    assert ContentValidator.validate(content(reading_passage=text)).valid
+
+
+@pytest.mark.parametrize("overrides, part, message", [
+    (dict(reading_passage=passage(6)), "passage", "words, expected 150-250"),
+    (dict(reading_passage=passage(40)), "passage", "words, expected 150-250"),
+    (dict(reading_passage=passage().replace(".", ",")), "passage", "splits into only 1 sentences"),
+    (dict(reading_passage=passage(16) + " " + " ".join(["and then they went home"] * 10) + "."),
+     "passage", "longer than 45 words"),
+    (dict(vocabulary=vocabulary(WORDS[:4])), "vocabulary", "4 vocabulary words, expected 5"),
+    (dict(vocabulary=vocabulary(WORDS[:4] + ["volcano"])), "vocabulary", "'volcano' does not appear"),
+    (dict(vocabulary=vocabulary()[:4] + [VocabularyItem(word="ocean", definition=" ")]),
+     "vocabulary", "has no definition"),
+    (dict(vocabulary=vocabulary(WORDS[:4] + ["scientist"])), "vocabulary", "'scientist' is repeated"),
+    (dict(questions=questions(2)), "questions", "2 questions, expected 3"),
+    (dict(questions=questions(question="  ")), "questions", "question 1 is empty"),
+    (dict(questions=questions(options=["Fish", "Birds", "Trees"])), "questions", "has 3 options, expected 4"),
+    (dict(questions=questions(options=["Fish", "Fish", "Trees", "Rocks"])), "questions", "empty or duplicate options"),
+    (dict(questions=questions(options=["Fish", "", "Trees", "Rocks"])), "questions", "empty or duplicate options"),
+    (dict(questions=questions(correct_answer=4)), "questions", "correct_answer 4 is out of range"),
+    (dict(questions=questions(correct_answer=-1)), "questions", "correct_answer -1 is out of range"),
+])
+def test_each_rule_reports_its_part(overrides, part, message):
+    report = ContentValidator.validate(content(**overrides))
+    assert report.invalid_parts == {part}, report.issues
+    assert any(message in issue for issue in report.issues[part]), report.issues
+
+
+class StubGenerator(ContentGeneratorService):
+    """Generator with scripted model responses and no rate limiting"""
+
+    def __init__(self, full_results, part_results=None):
+        self.full_results = list(full_results)
+        self.part_results = {k: list(v) for k, v in (part_results or {}).items()}
+        self.calls = []
+
+    def _acquire_llm_slot(self):
+        pass
+
+    def generate_content(self, title, summary, difficulty, category):
+        self.calls.append("full")
+        return self.full_results.pop(0)
+
+    def _regenerate_part(self, part, passage, difficulty):
+        self.calls.append(part)
+        return self.part_results[part].pop(0)
+
+
+def counter(name, **labels):
+    return metrics.snapshot()["counters"].get(_key(name, labels), 0)
+
+
+def generate(generator, max_repairs=2):
+    return generator.generate_validated("Ocean heat", "Warm water.", "beginner", "science", max_repairs=max_repairs)
+
+
+def test_valid_content_needs_no_repair():
+    generator = StubGenerator([content()])
+    assert generate(generator) == content()
+    assert generator.calls == ["full"]
+
+
+def test_only_the_broken_part_is_regenerated():
+    bad = content(vocabulary=vocabulary(WORDS[:4] + ["volcano"]), questions=questions(correct_answer=9))
+    generator = StubGenerator([bad], {"vocabulary": [vocabulary()], "questions": [questions()]})
+    saved_before = counter("content_tokens_saved_estimate")
+
+    result = generate(generator)
+
+    assert generator.calls == ["full", "questions", "vocabulary"]
+    assert ContentValidator.validate(result).valid
+    assert result.reading_passage == bad.reading_passage
+
+    # Savings are net of each repair prompt, instructions and format spec included
+    full = estimate_tokens("".join(
+        m["content"] for m in ContentGeneratorService.render_messages("Ocean heat", "Warm water.", "beginner", "science")
+    )) + estimate_tokens(bad.model_dump_json())
+    repairs = sum(
+        estimate_tokens("".join(m["content"] for m in ContentGeneratorService.render_partial_messages(
+            part, bad.reading_passage, "beginner"))) + estimate_tokens("".join(i.model_dump_json() for i in items))
+        for part, items in [("questions", questions()), ("vocabulary", vocabulary())]
+    )
+    assert counter("content_tokens_saved_estimate") - saved_before == 2 * full - repairs
+
+
+def test_bad_passage_regenerates_everything():
+    generator = StubGenerator([content(reading_passage=passage(6)), content()])
+    assert ContentValidator.validate(generate(generator)).valid
+    assert generator.calls == ["full", "full"]
+
+
+def test_repairs_stop_after_max_repairs():
+    still_bad = questions(correct_answer=9)
+    generator = StubGenerator([content(questions=still_bad)], {"questions": [still_bad] * 5})
+    unresolved_before = counter("content_validation_total", result="unresolved")
+
+    with pytest.raises(InvalidContentError) as error:
+        generate(generator, max_repairs=3)
+
+    assert generator.calls == ["full", "questions", "questions", "questions"]
+    assert set(error.value.issues) == {"questions"}
+    assert counter("content_validation_total", result="unresolved") == unresolved_before + 1
+
+
+def test_no_repairs_checks_the_first_result():
+    assert generate(StubGenerator([content()]), max_repairs=0) == content()
+
+    generator = StubGenerator([content(questions=questions(2))])
+    with pytest.raises(InvalidContentError):
+        generate(generator, max_repairs=0)
+    assert generator.calls == ["full"]
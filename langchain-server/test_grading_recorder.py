@@ -0,0 +1,142 @@
+"""
+Grading recorder and replay checks (GradingRecorder, replay_grading.py)
+
+1. Records round-trip through GradingRecorder.read, plain and .gz, including
+   appends from a second recorder (extra gzip members)
+2. anonymize masks e-mails, URLs, phone numbers and long digit runs
+3. GRADING_RECORD_SAMPLE records only a fraction of calls
+4. replay() with the fake LLM reports agreement, the confusion matrix,
+   cache hits and token totals
+
+Usage: python -m pytest test_grading_recorder.py
+"""
+
+import random
+
+import pytest
+
+from app.services.content_generator import estimate_tokens
+from app.services.grading_recorder import GradingRecorder, anonymize
+from app.services.translation_service import GradingStats, TranslationFeedback, TranslationService
+from app.shared import MemoryBackend, TokenBucket
+from replay_grading import make_fake_llm, replay
+
+CALLS = [
+    ("The cat sat.", "고양이가 앉았다.", "perfect"),
+    ("It rained.", "비가 왔다.", "good"),
+    ("Bees make honey.", "벌은 우유를 만든다.", "incorrect"),
+]
+
+
+def record_calls(recorder, calls=CALLS, cached=False):
+    for sentence, translation, result in calls:
+        feedback = TranslationFeedback(result=result, feedback="ok", is_correct=result != "incorrect")
+        stats = GradingStats(latency_ms=12.4, input_tokens=100, output_tokens=20, cached=cached)
+        recorder.record(sentence, translation, feedback, stats, "gpt-4o-mini", "v1")
+
+
+@pytest.mark.parametrize("name", ["grading.jsonl", "grading.jsonl.gz"])
+def test_records_round_trip(tmp_path, name):
+    path = str(tmp_path / "nested" / name)
+    record_calls(GradingRecorder(path))
+    # Another worker (or a restart) appends to the same file
+    record_calls(GradingRecorder(path), CALLS[:1], cached=True)
+
+    records = list(GradingRecorder.read(path))
+    assert [(r["s"], r["t"], r["r"], r["ok"], r["c"]) for r in records] == [
+        ("The cat sat.", "고양이가 앉았다.", "perfect", 1, 0),
+        ("It rained.", "비가 왔다.", "good", 1, 0),
+        ("Bees make honey.", "벌은 우유를 만든다.", "incorrect", 0, 0),
+        ("The cat sat.", "고양이가 앉았다.", "perfect", 1, 1),
+    ]
+    first = records[0]
+    assert (first["m"], first["p"], first["ms"], first["ti"], first["to"]) == ("gpt-4o-mini", "v1", 12, 100, 20)
+    assert set(first) == {"h", "m", "p", "s", "t", "r", "ok", "ms", "ti", "to", "c"}
+
+    if name.endswith(".gz"):
+        with open(path, "rb") as f:
+            assert f.read().count(b"\x1f\x8b\x08") == 4  # one gzip member per record
+
+
+@pytest.mark.parametrize("text, masked", [
+    ("제 번호는 010-123-4567 입니다", "제 번호는 <phone> 입니다"),
+    ("010-1234-5678", "<phone>"),
+    ("+82 10 1234 5678", "<phone>"),
+    ("(02) 123-4567", "<phone>"),
+    ("900101-1234567", "<phone>"),
+    ("amy.kim+test@example.co.kr 로 연락", "<email> 로 연락"),
+    ("https://example.com/a?b=1 참고", "<url> 참고"),
+    ("1999년에 태어났다", "<number>년에 태어났다"),
+    ("고양이 3마리와 개 12마리", "고양이 3마리와 개 12마리"),
+])
+def test_anonymize(text, masked):
+    assert anonymize(text) == masked
+
+
+def test_translation_is_anonymized_when_recorded(tmp_path):
+    path = str(tmp_path / "grading.jsonl")
+    record_calls(GradingRecorder(path), [("Call me.", "010-123-4567 로 전화해", "good")])
+    assert [r["t"] for r in GradingRecorder.read(path)] == ["<phone> 로 전화해"]
+
+
+def test_sample_rate(tmp_path, monkeypatch):
+    path = tmp_path / "grading.jsonl"
+    record_calls(GradingRecorder(str(path), sample_rate=0))
+    assert not path.exists()
+
+    random.seed(7)
+    record_calls(GradingRecorder(str(path), sample_rate=0.25), CALLS * 200)
+    assert 100 < len(list(GradingRecorder.read(str(path)))) < 200
+
+    monkeypatch.setenv("GRADING_RECORD_PATH", str(path))
+    monkeypatch.setenv("GRADING_RECORD_SAMPLE", "0.1")
+    assert GradingRecorder.from_env().sample_rate == 0.1
+    monkeypatch.setenv("GRADING_RECORD_PATH", "")
+    assert GradingRecorder.from_env() is None
+
+
+def recording(tmp_path):
+    path = str(tmp_path / "grading.jsonl.gz")
+    record_calls(GradingRecorder(path), CALLS + CALLS[:1])  # the repeat is a cache hit on replay
+    return list(GradingRecorder.read(path))
+
+
+def replay_service(records, flip_rate):
+    return TranslationService(
+        llm=make_fake_llm(records, flip_rate, latency_scale=0),
+        cache=MemoryBackend(),
+        rate_limiter=TokenBucket(MemoryBackend(), "replay", rate=1e9, capacity=1e9),
+        recorder=None,
+    )
+
+
+def prompt_tokens(service, sentence, translation):
+    messages = service.prompt.invoke({
+        "original_sentence": sentence,
+        "user_translation": translation,
+        "format_instructions": service.parser.get_format_instructions(),
+    }).to_messages()
+    return estimate_tokens("".join(m.content for m in messages))
+
+
+def test_replay_with_fake_llm_agrees(tmp_path):
+    records = recording(tmp_path)
+    service = replay_service(records, flip_rate=0)
+    report = replay(records, service, concurrency=1)
+
+    assert report["requests"] == 4 and report["errors"] == 0
+    assert report["agreement_rate"] == 1.0 and report["is_correct_agreement_rate"] == 1.0
+    assert report["confusion"] == {"perfect->perfect": 2, "good->good": 1, "incorrect->incorrect": 1}
+    assert report["cache_hits"] == 1
+    # Cache hits cost nothing; each LLM call is charged for its prompt
+    assert report["input_tokens"] == sum(prompt_tokens(service, s, t) for s, t, _ in CALLS)
+    assert report["output_tokens"] > 0
+
+
+def test_replay_reports_disagreement(tmp_path):
+    records = recording(tmp_path)
+    report = replay(records, replay_service(records, flip_rate=1.0), concurrency=2)
+
+    assert report["agreement_rate"] == 0.0
+    assert report["confusion"] == {"perfect->incorrect": 2, "good->incorrect": 1, "incorrect->good": 1}
+    assert report["is_correct_agreement_rate"] == 0.0
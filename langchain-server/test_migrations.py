@@ -0,0 +1,136 @@
+"""
+Migration checks (app/migrations)
+
+1. A database with the pre-migration (baseline) schema and data reaches head:
+   columns added, vocabulary indexed, orphans removed, cascades in place
+2. Running upgrade again is a no-op
+3. Each migration creates only its own tables
+4. Several processes migrating one SQLite file at once serialize on the lock
+
+Usage: python -m pytest test_migrations.py
+"""
+
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+from sqlalchemy import inspect, text
+
+from app.database import _create_engine
+from app.migrations import current_version, head_version, upgrade
+
+LEGACY_SCHEMA = """
+CREATE TABLE articles (id INTEGER PRIMARY KEY, title VARCHAR(255) NOT NULL, content TEXT NOT NULL, created_at DATETIME);
+CREATE TABLE sentences (id INTEGER PRIMARY KEY, article_id INTEGER NOT NULL REFERENCES articles(id),
+                        text TEXT NOT NULL, "order" INTEGER NOT NULL);
+CREATE TABLE user_progress (id INTEGER PRIMARY KEY, sentence_id INTEGER NOT NULL REFERENCES sentences(id),
+                            user_translation VARCHAR(500), is_correct BOOLEAN, attempts INTEGER,
+                            completed_at DATETIME, created_at DATETIME);
+"""
+
+
+def make_legacy_db(path: str, articles: int = 30):
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA)
+    for i in range(1, articles + 1):
+        conn.execute("INSERT INTO articles (id, title, content) VALUES (?, ?, ?)",
+                     (i, f"Article {i}", "She studies hard. Her teacher is happy."))
+        conn.execute('INSERT INTO sentences (article_id, text, "order") VALUES (?, ?, 1)', (i, "She studies hard."))
+        conn.execute('INSERT INTO sentences (article_id, text, "order") VALUES (?, ?, 2)', (i, "Her teacher is happy."))
+    conn.execute("INSERT INTO user_progress (sentence_id, attempts) VALUES (1, 1)")
+    conn.execute("INSERT INTO user_progress (sentence_id, attempts) VALUES (99999, 1)")  # orphan
+    conn.commit()
+    conn.close()
+
+
+def test_legacy_database_migrates_to_head(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    make_legacy_db(path)
+    engine = _create_engine(f"sqlite:///{path}")
+    assert current_version(engine) == 0
+
+    # Vocabulary JSON arrived with the VOA columns of the baseline migration
+    assert upgrade(engine, target=1) == 1
+    with engine.begin() as conn:
+        conn.execute(text("""UPDATE articles SET vocabulary = '[{"word": "studied", "definition": "learned"}]'"""))
+
+    assert upgrade(engine) == head_version()
+    assert current_version(engine) == head_version()
+
+    with engine.connect() as conn:
+        inspector = inspect(conn)
+        article_columns = {c["name"] for c in inspector.get_columns("articles")}
+        assert {"difficulty", "vocabulary", "reading_grade", "archived_at", "bundle_path"} <= article_columns
+        for table in ["vocabulary_words", "article_changes", "quota_usage", "articles_fts"]:
+            assert inspector.has_table(table), table
+        fk = inspector.get_foreign_keys("sentences")[0]
+        assert fk["options"].get("ondelete") == "CASCADE"
+
+        assert conn.execute(text("SELECT COUNT(*) FROM articles")).scalar() == 30
+        assert conn.execute(text("SELECT COUNT(*) FROM user_progress")).scalar() == 1
+        assert conn.execute(text("SELECT lemma FROM vocabulary_words")).scalars().all() == ["study"]
+        assert conn.execute(text("SELECT COUNT(*) FROM sentence_vocabulary")).scalar() == 30
+        assert conn.execute(text("SELECT COUNT(*) FROM article_changes")).scalar() == 30
+        assert conn.execute(text("SELECT reading_grade FROM sentences WHERE id = 1")).scalar() is not None
+
+    # Cascades work on the rebuilt tables
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM articles WHERE id = 1"))
+        assert conn.execute(text("SELECT COUNT(*) FROM sentences WHERE article_id = 1")).scalar() == 0
+
+    # A second run finds nothing to do
+    messages = []
+    assert upgrade(engine, progress=messages.append) == head_version()
+    assert messages == []
+    engine.dispose()
+
+
+def test_migrations_create_only_their_tables(tmp_path):
+    engine = _create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+
+    def tables():
+        with engine.connect() as conn:
+            return set(inspect(conn).get_table_names())
+
+    upgrade(engine, target=8)
+    assert {"articles", "vocabulary_words"} <= tables()
+    assert not {"article_changes", "quota_usage"} & tables()
+    upgrade(engine, target=9)
+    assert "article_changes" in tables() and "quota_usage" not in tables()
+    upgrade(engine)
+    assert "quota_usage" in tables()
+    engine.dispose()
+
+
+MIGRATOR = """
+import json, sys
+from app.database import _create_engine
+from app.migrations import upgrade
+applied = []
+version = upgrade(_create_engine(sys.argv[1]), progress=lambda m: applied.append(m) if m.startswith("Applying") else None)
+print(json.dumps({"version": version, "applied": applied}))
+"""
+
+
+def test_concurrent_starters_migrate_once(tmp_path):
+    here = os.path.dirname(os.path.abspath(__file__))
+    path = str(tmp_path / "race.db")
+    make_legacy_db(path, articles=200)
+    url = f"sqlite:///{path}"
+
+    starters = [
+        subprocess.Popen([sys.executable, "-c", MIGRATOR, url], cwd=here,
+                         stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        for _ in range(4)
+    ]
+    outputs = [s.communicate(timeout=120) for s in starters]
+    for starter, (_, stderr) in zip(starters, outputs):
+        assert starter.returncode == 0, stderr[-2000:]
+
+    results = [json.loads(stdout.strip().splitlines()[-1]) for stdout, _ in outputs]
+    assert {r["version"] for r in results} == {head_version()}
+    # Every migration was applied by exactly one process
+    applied = [m for r in results for m in r["applied"]]
+    assert len(applied) == len(set(applied)) == head_version()
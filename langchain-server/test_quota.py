@@ -0,0 +1,297 @@
+"""
+LLM quota checks (app/quota.py)
+
+1. The previous window counts in proportion to its overlap with the sliding window
+2. Retry-After is the time until the call would fit
+3. A request larger than the quota is rejected outright
+4. Flushes add deltas to quota_usage, and managers sharing a database see
+   each other's usage after a flush
+5. Database reads happen outside the manager's lock
+6. Refunds give back unused requests, also after the window rolls over,
+   and a failed refresh after a committed flush does not count twice
+7. generate-from-voa returns X-Quota-* headers, 429 + Retry-After, and 422
+   for a `limit` over the cap, and is charged only for articles it generated
+
+Usage: python -m pytest test_quota.py
+"""
+
+import pytest
+
+from app import quota
+from app.endpoints import articles
+from app.models import QuotaUsage
+from app.quota import QuotaExceeded, QuotaLimits, QuotaManager
+from app.services.content_generator import (
+    ComprehensionQuestion, GeneratedContent, InvalidContentError, VocabularyItem
+)
+from app.shared import RateLimitExceeded
+
+LEARNER = ["learner:amy"]
+
+
+class Clock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def manager(clock, session_factory=None, requests=10, tokens=1000):
+    return QuotaManager(
+        window=100,
+        limits={"grading": QuotaLimits(requests=requests, tokens=tokens)},
+        flush_interval=3600,
+        session_factory=session_factory,
+        clock=clock,
+    )
+
+
+def test_previous_window_is_weighted_by_overlap():
+    clock = Clock(100)
+    quotas = manager(clock)
+    assert quotas.acquire(LEARNER, "grading", 8)["requests_remaining"] == 2
+
+    clock.now = 250  # halfway into the next window: 8 * 0.5 still counts
+    status = quotas.acquire(LEARNER, "grading", 6)
+    assert status["requests_remaining"] == 0 and status["reset"] == 50
+
+    with pytest.raises(QuotaExceeded) as exceeded:
+        quotas.acquire(LEARNER, "grading")
+    assert exceeded.value.resource == "requests"
+    # 8 * weight + 6 + 1 <= 10 once weight <= 0.375, i.e. at t = 262.5
+    assert exceeded.value.retry_after == pytest.approx(12.5)
+
+    clock.now = 263
+    quotas.acquire(LEARNER, "grading")
+
+    clock.now = 450  # a whole window later nothing counts
+    assert quotas.acquire(LEARNER, "grading")["requests_remaining"] == 9
+
+
+def test_retry_after_waits_for_the_current_window_to_decay():
+    clock = Clock(210)
+    quotas = manager(clock)
+    quotas.acquire(LEARNER, "grading", 10)
+
+    with pytest.raises(QuotaExceeded) as exceeded:
+        quotas.acquire(LEARNER, "grading")
+    # The 10 become the previous window at 300 and fall to 9 at 310
+    assert exceeded.value.retry_after == pytest.approx(100)
+
+
+def test_tokens_are_charged_after_the_call():
+    quotas = manager(Clock(0), tokens=100)
+    quotas.acquire(LEARNER, "grading")
+    assert quotas.charge_tokens(LEARNER, "grading", 150)["tokens_remaining"] == 0
+
+    with pytest.raises(QuotaExceeded) as exceeded:
+        quotas.acquire(LEARNER, "grading")
+    assert exceeded.value.resource == "tokens"
+
+
+def test_ip_identities_get_the_larger_limit():
+    quotas = manager(Clock(0), requests=2)
+    quotas.ip_factor = 3
+    status = quotas.acquire(["ip:abc"], "grading", 5)
+    assert (status["requests_limit"], status["requests_remaining"]) == (6, 1)
+
+
+def test_request_larger_than_the_quota_is_rejected():
+    quotas = manager(Clock(0), requests=3)
+    with pytest.raises(ValueError):
+        quotas.acquire(LEARNER, "grading", 4)
+    assert quotas.acquire(LEARNER, "grading", 3)["requests_remaining"] == 0
+
+
+def usage(Session):
+    db = Session()
+    try:
+        return [(r.identity, r.window_start, r.requests, r.tokens) for r in db.query(QuotaUsage)]
+    finally:
+        db.close()
+
+
+def test_flush_adds_deltas(sqlite_db):
+    _, Session = sqlite_db
+    clock = Clock(100)
+    first, second = manager(clock, Session), manager(clock, Session)
+
+    first.acquire(LEARNER, "grading", 2)
+    first.charge_tokens(LEARNER, "grading", 50)
+    first.flush()
+    second.acquire(LEARNER, "grading")
+    second.flush()
+    first.acquire(LEARNER, "grading")
+    first.flush()
+
+    assert usage(Session) == [("learner:amy", 100, 4, 50)]
+    first.flush()  # nothing pending: nothing added twice
+    assert usage(Session) == [("learner:amy", 100, 4, 50)]
+
+
+def test_managers_share_the_limit_after_each_flush(sqlite_db):
+    _, Session = sqlite_db
+    clock = Clock(100)
+    workers = [manager(clock, Session, requests=5), manager(clock, Session, requests=5)]
+
+    admitted = 0
+    for _ in range(5):
+        for worker in workers:
+            try:
+                worker.acquire(LEARNER, "grading")
+                admitted += 1
+            except QuotaExceeded:
+                pass
+            # Both flush before the next call, i.e. calls are a flush interval apart
+            for flushing in workers:
+                flushing.flush()
+    assert admitted == 5
+
+    # A restarted worker starts from the persisted total
+    with pytest.raises(QuotaExceeded):
+        manager(clock, Session, requests=5).acquire(LEARNER, "grading")
+
+
+def test_database_is_read_outside_the_lock(sqlite_db):
+    _, Session = sqlite_db
+    quotas = manager(Clock(100), Session)
+    load = quotas._load
+
+    def checked_load(*args):
+        assert not quotas._lock.locked()
+        return load(*args)
+
+    quotas._load = checked_load
+    quotas.acquire(LEARNER + ["ip:abc"], "grading")
+    quotas.charge_tokens(["learner:ben"], "grading", 10)
+    quotas.flush()
+
+
+def test_refund_returns_unused_requests(sqlite_db):
+    _, Session = sqlite_db
+    clock = Clock(100)
+    quotas = manager(clock, Session)
+
+    quotas.acquire(LEARNER, "grading", 5)
+    assert quotas.refund(LEARNER, "grading", 3, charged_at=100)["requests_remaining"] == 8
+    quotas.flush()
+    assert usage(Session) == [("learner:amy", 100, 2, 0)]
+
+    # Charged in the window that is now the previous one
+    quotas.acquire(LEARNER, "grading", 4)
+    clock.now = 200
+    quotas.refund(LEARNER, "grading", 4, charged_at=150)
+    quotas.flush()
+    assert usage(Session) == [("learner:amy", 100, 2, 0)]
+    assert quotas.acquire(LEARNER, "grading")["requests_remaining"] == 7  # 2 * 1.0 + 1
+
+    assert quotas.refund(["learner:ben"], "grading", 1, charged_at=200) is None
+
+
+def test_failed_refresh_does_not_restore_committed_deltas(sqlite_db):
+    _, Session = sqlite_db
+    quotas = manager(Clock(100), Session)
+    quotas.acquire(LEARNER, "grading", 2)
+
+    def broken_refresh(rows):
+        raise RuntimeError("connection lost")
+
+    quotas._refresh = broken_refresh
+    quotas.flush()
+    del quotas._refresh
+    quotas.flush()
+    assert usage(Session) == [("learner:amy", 100, 2, 0)]
+
+
+def test_failed_commit_keeps_deltas_for_the_next_flush(sqlite_db):
+    _, Session = sqlite_db
+    quotas = manager(Clock(100), Session)
+    quotas.acquire(LEARNER, "grading", 2)
+
+    def broken_commit():
+        raise RuntimeError("connection lost")
+
+    def broken_session():
+        session = Session()
+        session.commit = broken_commit
+        return session
+
+    quotas.session_factory = broken_session
+    quotas.flush()
+    quotas.session_factory = Session
+    quotas.flush()
+    assert usage(Session) == [("learner:amy", 100, 2, 0)]
+
+
+class StubVOAService:
+    def __init__(self, available=None):
+        self.available = available
+
+    def fetch_articles(self, difficulty, category=None, limit=10):
+        return [
+            {"title": f"Story {i}", "summary": "About a story.", "category": "science",
+             "source_url": f"https://voa.example/{i}", "published_date": None}
+            for i in range(min(limit, self.available or limit))
+        ]
+
+
+class StubGenerator:
+    def __init__(self, error=None):
+        self.error = error
+
+    def generate_validated(self, title, summary, difficulty, category):
+        if self.error is not None:
+            raise self.error
+        return GeneratedContent(
+            reading_passage=f"{title} is a short story. It has two sentences.",
+            vocabulary=[VocabularyItem(word="story", definition="an account of events")],
+            questions=[ComprehensionQuestion(question="What is it?", options=["A", "B", "C", "D"], correct_answer=0)],
+        )
+
+    def render_messages(self, title, summary, difficulty, category):
+        return [{"content": f"{title} {summary}"}]
+
+
+def test_generation_headers_and_rejections(client, monkeypatch):
+    monkeypatch.setattr(articles, "_voa_service", StubVOAService())
+    monkeypatch.setattr(articles, "_content_generator", StubGenerator())
+    monkeypatch.setattr(quota, "_manager", QuotaManager(
+        limits={"generation": QuotaLimits(requests=3, tokens=100_000)}, ip_factor=1,
+    ))
+    url = "/api/articles/generate-from-voa"
+    headers = {"X-Learner-Id": "amy"}
+
+    response = client.post(url, params={"difficulty": "beginner", "limit": 2}, headers=headers)
+    assert response.status_code == 201, response.text
+    assert response.headers["X-Quota-Requests-Limit"] == "3"
+    assert response.headers["X-Quota-Requests-Remaining"] == "1"
+    assert int(response.headers["X-Quota-Tokens-Remaining"]) < 100_000
+    assert 0 < int(response.headers["X-Quota-Reset"]) <= 3600
+
+    response = client.post(url, params={"difficulty": "beginner", "limit": 2}, headers=headers)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 0
+
+    # Over the quota itself, and over GENERATION_MAX_BATCH
+    assert client.post(url, params={"difficulty": "beginner", "limit": 4}, headers=headers).status_code == 422
+    assert client.post(url, params={"difficulty": "beginner", "limit": 6}, headers=headers).status_code == 422
+
+
+@pytest.mark.parametrize("voa, generator, status, remaining", [
+    (StubVOAService(available=1), StubGenerator(), 201, "2"),  # the feed had one article
+    (StubVOAService(), StubGenerator(InvalidContentError("Story", {"reading_passage": ["too short"]})), 201, "0"),  # model was used
+    (StubVOAService(), StubGenerator(RateLimitExceeded(3)), 503, "3"),
+])
+def test_generation_is_charged_for_articles_it_generated(client, monkeypatch, voa, generator, status, remaining):
+    monkeypatch.setattr(articles, "_voa_service", voa)
+    monkeypatch.setattr(articles, "_content_generator", generator)
+    quotas = QuotaManager(limits={"generation": QuotaLimits(requests=3, tokens=100_000)}, ip_factor=1)
+    monkeypatch.setattr(quota, "_manager", quotas)
+
+    response = client.post("/api/articles/generate-from-voa",
+                           params={"difficulty": "beginner", "limit": 3}, headers={"X-Learner-Id": "amy"})
+    assert response.status_code == status, response.text
+    if status == 201:
+        assert response.headers["X-Quota-Requests-Remaining"] == remaining
+    assert quotas.acquire(LEARNER, "generation", 0)["requests_remaining"] == int(remaining)
@@ -0,0 +1,81 @@
+"""
+Read-replica routing check
+
+Runs the app in a fresh interpreter against two local SQLite files, one as
+the primary and one as the replica. "Replication" is an explicit copy of the
+primary into the replica, so anything written since the last copy is only
+visible on the primary:
+1. Reads from other clients go to the replica (they don't see a new article)
+2. The writing client reads from the primary until REPLICA_STICKY_SECONDS pass
+3. After the window it reads from the replica again
+
+Usage: python test_read_replica.py  (also collected by pytest)
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+STICKY_SECONDS = 1.0
+
+PROBE = """
+import json, sqlite3, sys, time
+from fastapi.testclient import TestClient
+import main
+
+def replicate():
+    src, dst = sqlite3.connect(sys.argv[1]), sqlite3.connect(sys.argv[2])
+    src.backup(dst)
+    src.close(); dst.close()
+
+writer, reader = {"X-Client-Id": "writer"}, {"X-Client-Id": "reader"}
+results = {}
+with TestClient(main.app) as client:
+    replicate()
+    article_id = client.post("/api/articles/", json={"title": "Replica", "content": "I see a cat. The cat is big."}, headers=writer).json()["id"]
+    results["writer_after_write"] = client.get(f"/api/articles/{article_id}", headers=writer).status_code
+    results["reader_before_replication"] = client.get(f"/api/articles/{article_id}", headers=reader).status_code
+    time.sleep(%r + 0.2)
+    results["writer_after_window"] = client.get(f"/api/articles/{article_id}", headers=writer).status_code
+    replicate()
+    results["reader_after_replication"] = client.get(f"/api/articles/{article_id}", headers=reader).status_code
+print(json.dumps(results))
+""" % (STICKY_SECONDS,)
+
+
+def run_probe() -> dict:
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as tmp:
+        primary, replica = os.path.join(tmp, "primary.db"), os.path.join(tmp, "replica.db")
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{primary}",
+            REPLICA_DATABASE_URL=f"sqlite:///{replica}",
+            REPLICA_STICKY_SECONDS=str(STICKY_SECONDS),
+            SHARED_BACKEND_URL="memory://",
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE, primary, replica],
+            cwd=here, env=env, capture_output=True, text=True, check=True
+        )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_read_replica_routing():
+    results = run_probe()
+    assert results == {
+        "writer_after_write": 200,
+        "reader_before_replication": 404,
+        "writer_after_window": 404,
+        "reader_after_replication": 200,
+    }, results
+
+
+if __name__ == '__main__':
+    results = run_probe()
+    for step, status in results.items():
+        print(f"{step}: {status}")
+    test_read_replica_routing()
+    print("✓ Reads routed to the replica with read-your-writes stickiness")
@@ -0,0 +1,99 @@
+"""
+Readability feature checks (ReadabilityService, GET /api/articles)
+
+1. Syllable counts, word ranks and per-sentence scores match hand-computed values
+2. Article scores aggregate the sentence sums (not an average of averages)
+3. sort=easiest|hardest orders by reading grade with unscored articles last,
+   and min_grade/max_grade filter on it
+
+Usage: python -m pytest test_readability.py
+"""
+
+import pytest
+
+from app.models import Article
+from app.services import ArticleService
+from app.services.readability import RARE_RANK, ReadabilityService, count_syllables, word_rank
+
+
+@pytest.mark.parametrize("word, syllables", [
+    ("cat", 1), ("the", 1), ("make", 1), ("table", 2), ("agree", 2),
+    ("beautiful", 3), ("rhythm", 1), ("Education", 4),
+])
+def test_count_syllables(word, syllables):
+    assert count_syllables(word) == syllables
+
+
+def test_word_rank():
+    assert word_rank("the") == 1 and word_rank("The") == 1
+    assert word_rank("of") == 2
+    assert word_rank("day") == 94
+    assert word_rank("animals") == word_rank("animal") == 187  # plural falls back to the singular
+    assert word_rank("zebra") == RARE_RANK
+
+
+def test_analyze_sentences():
+    short, longer, empty = ReadabilityService.analyze_sentences(["The cat sat.", "It was a beautiful day.", ""])
+
+    # the (1) + cat, sat (rare); 3 words, 3 syllables
+    assert (short.token_count, short.syllable_count, short.mean_word_rank) == (3, 3, 667.0)
+    assert short.reading_ease == 119.19  # 206.835 - 1.015 * 3 - 84.6 * 1
+    assert short.reading_grade == -2.62  # 0.39 * 3 + 11.8 * 1 - 15.59
+
+    # it (10), was (12), a (4), beautiful (rare), day (94); 7 syllables
+    assert (longer.token_count, longer.syllable_count, longer.mean_word_rank) == (5, 7, 224.0)
+    assert longer.reading_ease == 83.32
+    assert longer.reading_grade == 2.88
+
+    assert (empty.token_count, empty.mean_word_rank) == (0, 0.0)
+
+
+def test_aggregate_weights_by_words():
+    article = ReadabilityService.aggregate(
+        ReadabilityService.analyze_sentences(["The cat sat.", "It was a beautiful day."])
+    )
+    assert article.word_count == 8
+    assert article.mean_word_rank == pytest.approx((3 * 667.0 + 5 * 224.0) / 8, abs=0.01)
+    # 8 words, 2 sentences, 10 syllables
+    assert article.reading_ease == pytest.approx(206.835 - 1.015 * 4 - 84.6 * 1.25, abs=0.01)
+    assert article.reading_grade == pytest.approx(0.39 * 4 + 11.8 * 1.25 - 15.59, abs=0.01)
+
+    assert ReadabilityService.aggregate([]).word_count == 0
+
+
+def make_articles(db):
+    texts = {
+        "easy": "The cat sat. The dog ran. We had fun.",
+        "middle": "It was a beautiful day. We walked to the river together.",
+        "hard": "Contemporary environmental legislation necessitates comprehensive international cooperation.",
+    }
+    ids = {name: ArticleService.create_article(db=db, title=name, content=text).id for name, text in texts.items()}
+    ids["unscored"] = ArticleService.create_article(db=db, title="unscored", content="Old text.").id
+    db.query(Article).filter(Article.id == ids["unscored"]).update({Article.reading_grade: None})
+    db.commit()
+    return ids
+
+
+def titles(client, **params):
+    response = client.get("/api/articles/", params=params)
+    assert response.status_code == 200
+    return [a["title"] for a in response.json()]
+
+
+def test_sort_by_grade_puts_unscored_last(client, db):
+    make_articles(db)
+    assert titles(client, sort="easiest") == ["easy", "middle", "hard", "unscored"]
+    assert titles(client, sort="hardest") == ["hard", "middle", "easy", "unscored"]
+    assert titles(client, sort="easiest", limit=2) == ["easy", "middle"]
+    assert client.get("/api/articles/", params={"sort": "shortest"}).status_code == 422
+
+
+def test_grade_filters(client, db):
+    make_articles(db)
+    grades = {a["title"]: a["reading_grade"] for a in client.get("/api/articles/").json()}
+    assert grades["easy"] < grades["middle"] < grades["hard"] and grades["unscored"] is None
+
+    between = (grades["easy"] + grades["middle"]) / 2
+    assert titles(client, sort="easiest", min_grade=between) == ["middle", "hard"]
+    assert titles(client, sort="easiest", max_grade=between) == ["easy"]
+    assert titles(client, min_grade=grades["middle"], max_grade=grades["middle"]) == ["middle"]
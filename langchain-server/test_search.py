@@ -0,0 +1,83 @@
+"""
+Full-text search checks (SearchService)
+
+1. User input is quoted term by term, so FTS5 syntax can't be injected
+2. Hits are ranked (title matches first) and carry highlighted snippets
+3. The index follows article create, delete and archive
+4. Backends without an index fall back to a LIKE scan
+
+Usage: python -m pytest test_search.py
+"""
+
+from app.services import ArticleService
+from app.services.search_service import SearchService
+
+
+def add(db, title, content, **fields):
+    return ArticleService.create_article(db=db, title=title, content=content, **fields)
+
+
+def test_fts5_query_quotes_every_term():
+    assert SearchService._fts5_query('sing "loud" OR NEAR(') == '"sing" """loud""" "OR" "NEAR("'
+    assert SearchService._fts5_query("   ") == ""
+
+
+def test_query_syntax_is_treated_as_text(db):
+    add(db, "Choirs", "Singing helps the heart.")
+    for query in ['heart" OR (', "NEAR(heart", "*", "title:heart", '"']:
+        SearchService.search(db, query)  # must not raise an FTS5 syntax error
+    # OR is a literal word every hit must contain, not an operator
+    assert [h["title"] for h in SearchService.search(db, 'heart" OR')] == []
+    # Quotes inside a term are dropped by the tokenizer
+    assert [h["title"] for h in SearchService.search(db, '"heart"')] == ["Choirs"]
+    assert SearchService.search(db, "   ") == []
+
+
+def test_ranking_and_snippets(db):
+    add(db, "Morning walks", "Walking in the morning is good for the heart.")
+    add(db, "Heart health", "Doctors say exercise is important.")
+    add(db, "Cooking", "We cook rice and beans.")
+
+    hits = SearchService.search(db, "heart")
+    assert [h["title"] for h in hits] == ["Heart health", "Morning walks"]
+    assert hits[0]["rank"] >= hits[1]["rank"]
+    assert "<b>heart</b>" in hits[1]["snippet"]
+
+    # Porter stemming: "walk" finds "Walking"
+    assert [h["title"] for h in SearchService.search(db, "walk")] == ["Morning walks"]
+
+
+def test_vocabulary_words_are_searchable(db):
+    add(db, "Weather", "It rains a lot here.", vocabulary=[{"word": "drizzle", "definition": "light rain"}])
+    assert [h["title"] for h in SearchService.search(db, "drizzle")] == ["Weather"]
+
+
+def test_index_follows_delete_and_archive(db):
+    kept = add(db, "Rivers", "The river is long.", category="science")
+    deleted = add(db, "River fish", "Fish live in the river.", category="health")
+    archived = add(db, "River boats", "Boats sail on the river.", category="news")
+
+    ArticleService.delete_article(db, deleted.id)
+    ArticleService.bulk_archive(db, category="news")
+
+    assert [h["id"] for h in SearchService.search(db, "river")] == [kept.id]
+    assert archived.id not in {h["id"] for h in SearchService.search(db, "boats")}
+
+
+def test_like_fallback_for_other_backends(db, monkeypatch):
+    add(db, "Bees", "Bees make honey in summer.")
+    add(db, "Old bees", "Bees sleep in winter.", category="old")
+    ArticleService.bulk_archive(db, category="old")
+
+    monkeypatch.setattr(db.get_bind().dialect, "name", "mysql")
+    hits = SearchService.search(db, "HONEY")
+    assert [(h["title"], h["rank"]) for h in hits] == [("Bees", 0.0)]
+    assert [h["title"] for h in SearchService.search(db, "bees")] == ["Bees"]
+
+
+def test_search_endpoint(client):
+    client.post("/api/articles/", json={"title": "Singing is healthy", "content": "Singing helps the heart."})
+    response = client.get("/api/articles/search", params={"q": "heart"})
+    assert response.status_code == 200
+    assert [h["title"] for h in response.json()] == ["Singing is healthy"]
+    assert client.get("/api/articles/search", params={"q": ""}).status_code == 422
@@ -0,0 +1,117 @@
+"""
+Shared backend checks (app/shared)
+
+1. Memory and SQLite backends honour the same get/set/TTL and token bucket contract
+2. Refunds hand tokens back but never overfill the bucket
+3. A bucket never refills the same interval twice, even if the clock steps back
+4. Two processes sharing one SQLite bucket together stay within rate + burst
+
+Usage: python -m pytest test_shared_backend.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.shared import MemoryBackend, TokenBucket, create_backend
+from app.shared import sqlite_backend
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend()
+    return create_backend(f"sqlite:///{tmp_path / 'shared.db'}")
+
+
+def test_get_set_delete_and_ttl(backend, monkeypatch):
+    backend.set("plain", "1")
+    backend.set("short", "2", ttl=10)
+    assert backend.get("plain") == "1" and backend.get("short") == "2"
+    assert backend.get("missing") is None
+
+    real_time = sqlite_backend.time.time
+    monkeypatch.setattr(sqlite_backend.time, "time", lambda: real_time() + 11)
+    assert backend.get("short") is None
+    assert backend.get("plain") == "1"
+
+    backend.delete("plain")
+    assert backend.get("plain") is None
+
+
+def test_bucket_takes_burst_then_reports_wait(backend):
+    for _ in range(3):
+        assert backend.try_acquire("b", 1, rate=0.5, capacity=3) == 0
+    wait = backend.try_acquire("b", 1, rate=0.5, capacity=3)
+    assert 1.5 < wait <= 2.0
+    # A refused request takes nothing
+    assert backend.try_acquire("b", 1, rate=0.5, capacity=3) > 0
+    # Buckets are independent
+    assert backend.try_acquire("other", 1, rate=0.5, capacity=3) == 0
+
+
+def test_token_bucket_acquire_times_out(backend):
+    bucket = TokenBucket(backend, "slow", rate=0.1, capacity=1)
+    assert bucket.acquire(timeout=0.1)
+    assert not bucket.acquire(timeout=0.1)
+
+
+def test_refund_is_capped_at_capacity(backend):
+    bucket = TokenBucket(backend, "r", rate=0.001, capacity=2)
+    assert bucket.try_acquire(2) == 0
+    bucket.refund()
+    assert bucket.try_acquire() == 0 and bucket.try_acquire() > 0
+
+    for _ in range(3):
+        bucket.refund()
+    assert bucket.try_acquire(2) == 0 and bucket.try_acquire() > 0
+
+
+def test_sqlite_bucket_never_rewinds(tmp_path, monkeypatch):
+    backend = create_backend(f"sqlite:///{tmp_path / 'shared.db'}")
+    clock = iter([100.0, 90.0, 101.0, 101.0])
+    monkeypatch.setattr(sqlite_backend.time, "time", lambda: next(clock))
+
+    assert backend.try_acquire("b", 10, rate=1, capacity=10) == 0  # t=100, empty
+    assert backend.try_acquire("b", 1, rate=1, capacity=10) > 0    # clock stepped back to 90
+    assert backend.try_acquire("b", 1, rate=1, capacity=10) == 0   # t=101: one second refilled
+    assert backend.try_acquire("b", 1, rate=1, capacity=10) > 0    # ... and only one
+
+
+WORKER = """
+import json, sys, time
+from app.shared import create_backend
+
+backend = create_backend(sys.argv[1])
+start = time.time()
+taken = 0
+while time.time() - start < float(sys.argv[2]):
+    if backend.try_acquire("shared", 1, rate=float(sys.argv[3]), capacity=float(sys.argv[4])) == 0:
+        taken += 1
+print(json.dumps({"taken": taken, "start": start, "end": time.time()}))
+"""
+
+
+def test_sqlite_bucket_is_shared_across_processes(tmp_path):
+    here = os.path.dirname(os.path.abspath(__file__))
+    url = f"sqlite:///{tmp_path / 'shared.db'}"
+    rate, capacity, seconds = 20.0, 5.0, 1.5
+    create_backend(url)  # create the tables before the workers race for them
+
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-c", WORKER, url, str(seconds), str(rate), str(capacity)],
+            cwd=here, stdout=subprocess.PIPE, text=True,
+        )
+        for _ in range(3)
+    ]
+    results = [json.loads(w.communicate(timeout=60)[0].strip().splitlines()[-1]) for w in workers]
+
+    taken = sum(r["taken"] for r in results)
+    window = max(r["end"] for r in results) - min(r["start"] for r in results)
+    assert taken <= capacity + rate * window + 1, (taken, window)
+    # Together the workers used most of the budget (lock contention costs a little)
+    assert taken >= rate * seconds * 0.5, (taken, window)
@@ -0,0 +1,120 @@
+"""
+Spaced repetition checks (SRSScheduler, /api/review/next)
+
+1. Intervals grow 1 day, 6 days, then by the ease factor
+2. A lapse resets the repetitions and brings the sentence back in 10 minutes;
+   ease never drops below 1.3
+3. Two first reviews of one sentence racing to insert both count
+4. /api/review/next lists one learner's due sentences, most overdue first
+
+Usage: python -m pytest test_srs_scheduler.py
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app.database import SessionLocal
+from app.models import UserProgress
+from app.services import ArticleService
+from app.services.srs_scheduler import SRSScheduler
+
+NOW = datetime(2026, 1, 1, 12, 0)
+
+
+def test_intervals_grow_with_ease():
+    first = SRSScheduler.schedule("good", now=NOW)
+    assert (first.interval_days, first.repetitions, first.due_at) == (1.0, 1, NOW + timedelta(days=1))
+
+    second = SRSScheduler.schedule("good", first.ease_factor, first.interval_days, first.repetitions, NOW)
+    assert (second.interval_days, second.repetitions) == (6.0, 2)
+
+    third = SRSScheduler.schedule("good", second.ease_factor, second.interval_days, second.repetitions, NOW)
+    assert third.repetitions == 3
+    assert third.interval_days == round(6.0 * third.ease_factor, 2)
+    assert third.due_at == NOW + timedelta(days=third.interval_days)
+
+
+def test_perfect_raises_ease_and_good_lowers_it():
+    assert SRSScheduler.schedule("perfect", now=NOW).ease_factor == 2.6
+    assert SRSScheduler.schedule("good", now=NOW).ease_factor == 2.36
+
+
+def test_lapse_resets_and_relearns_soon():
+    lapse = SRSScheduler.schedule("incorrect", 2.5, 15.0, 4, NOW)
+    assert (lapse.interval_days, lapse.repetitions) == (0.0, 0)
+    assert lapse.due_at == NOW + SRSScheduler.RELEARN_DELAY
+    assert lapse.ease_factor < 2.5
+
+    # The next success starts the ladder again
+    assert SRSScheduler.schedule("good", lapse.ease_factor, 0.0, 0, NOW).interval_days == 1.0
+
+
+def test_ease_has_a_floor():
+    ease = 2.5
+    for _ in range(10):
+        ease = SRSScheduler.schedule("incorrect", ease, now=NOW).ease_factor
+    assert ease == SRSScheduler.MIN_EASE
+    # Unknown results grade as incorrect
+    assert SRSScheduler.schedule("garbled", now=NOW).repetitions == 0
+
+
+def make_sentences(db, count=3):
+    article = ArticleService.create_article(
+        db=db, title="Review", content=" ".join(f"Sentence number {i} is here." for i in range(count))
+    )
+    return [s.id for s in sorted(article.sentences, key=lambda s: s.order)]
+
+
+def test_review_updates_the_same_row(db):
+    sentence_id = make_sentences(db, 1)[0]
+    SRSScheduler.record_review(db, "amy", sentence_id, "x", "good", True)
+    progress = SRSScheduler.record_review(db, "amy", sentence_id, "y", "good", True)
+
+    assert db.query(UserProgress).count() == 1
+    assert (progress.attempts, progress.repetitions, progress.interval_days) == (2, 2, 6.0)
+    assert progress.user_translation == "y"
+
+
+def test_racing_first_reviews_both_count(db):
+    sentence_id = make_sentences(db, 1)[0]
+    other = SessionLocal()
+    raced = []
+
+    # Another request inserts the row after this one looked for it but before it flushes
+    @event.listens_for(db, "before_flush")
+    def competing_review(session, flush_context, instances):
+        if not raced:
+            raced.append(True)
+            SRSScheduler.record_review(other, "amy", sentence_id, "first", "good", True)
+
+    progress = SRSScheduler.record_review(db, "amy", sentence_id, "second", "good", True)
+    other.close()
+
+    assert raced
+    assert db.query(UserProgress).count() == 1
+    assert (progress.attempts, progress.repetitions) == (2, 2)
+    assert progress.user_translation == "second"
+
+
+def test_next_due_lists_overdue_first(client, db):
+    first, second, third = make_sentences(db)
+    for sentence_id in (first, second, third):
+        SRSScheduler.record_review(db, "amy", sentence_id, "x", "good", True)
+    SRSScheduler.record_review(db, "ben", first, "x", "good", True)
+
+    now = datetime.utcnow()
+    due = {first: now - timedelta(hours=1), second: now - timedelta(days=2)}
+    for progress in db.query(UserProgress).filter(UserProgress.learner_id == "amy"):
+        progress.due_at = due.get(progress.sentence_id, progress.due_at)
+    db.commit()
+
+    response = client.get("/api/review/next", params={"learner_id": "amy"})
+    assert response.status_code == 200
+    items = response.json()
+    assert [item["sentence_id"] for item in items] == [second, first]
+    assert items[0]["repetitions"] == 1 and items[0]["last_result"] == "good"
+
+    assert len(client.get("/api/review/next", params={"learner_id": "amy", "limit": 1}).json()) == 1
+    assert client.get("/api/review/next", params={"learner_id": "ben"}).json() == []
+    assert client.get("/api/review/next").status_code == 422
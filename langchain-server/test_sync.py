@@ -0,0 +1,99 @@
+"""
+Delta sync and session bundle checks (/api/sync)
+
+1. Paging through the change log returns every article once, with has_more
+   on all but the last page, and an up-to-date client gets nothing
+2. A version ahead of the log (restored database) resets to the full library
+3. Created-then-deleted or archived inside one window is reported as deleted
+4. The session bundle has sentences in order with next_id, vocabulary hints
+   and the learner's progress; archived articles are not found
+
+Usage: python -m pytest test_sync.py
+"""
+
+from app.services import ArticleService
+from app.services.srs_scheduler import SRSScheduler
+
+
+def make_article(db, title, **fields):
+    return ArticleService.create_article(db=db, title=title, content=f"{title} is here. It is short.", **fields).id
+
+
+def sync(client, **params):
+    response = client.get("/api/sync", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_paging_returns_every_article_once(client, db):
+    ids = [make_article(db, f"Article {i}") for i in range(5)]
+
+    seen, pages, version = [], [], 0
+    while True:
+        page = sync(client, since=version, limit=2)
+        assert not page["reset"]
+        seen += [a["id"] for a in page["created"]]
+        pages.append(page["has_more"])
+        version = page["version"]
+        if not page["has_more"]:
+            break
+
+    assert seen == ids
+    assert pages == [True, True, False]
+    assert sync(client, since=version) == {
+        "version": version, "reset": False, "has_more": False, "created": [], "deleted": [],
+    }
+
+    newer = make_article(db, "Newer")
+    assert [a["id"] for a in sync(client, since=version)["created"]] == [newer]
+
+
+def test_unknown_version_resets(client, db):
+    ids = [make_article(db, f"Article {i}") for i in range(3)]
+    latest = sync(client)["version"]
+
+    page = sync(client, since=latest + 100)
+    assert page["reset"]
+    assert [a["id"] for a in page["created"]] == ids
+    assert page["version"] == latest
+
+
+def test_created_then_removed_collapses_to_deleted(client, db):
+    kept = make_article(db, "Kept")
+    version = sync(client)["version"]
+
+    gone = make_article(db, "Gone")
+    archived = make_article(db, "Archived", category="old")
+    ArticleService.delete_article(db, gone)
+    ArticleService.bulk_archive(db, category="old")
+    ArticleService.delete_article(db, kept)
+
+    page = sync(client, since=version)
+    assert page["created"] == []
+    assert page["deleted"] == sorted([kept, gone, archived])
+
+
+def test_session_bundle(client, db):
+    article_id = ArticleService.create_article(
+        db=db, title="Bees", category="science",
+        content="Bees make honey in summer. They rest in winter. Honey is sweet.",
+        vocabulary=[{"word": "honey", "definition": "sweet food from bees"}],
+    ).id
+    bundle = client.get(f"/api/sync/session/{article_id}").json()
+    first, second, third = bundle["sentences"]
+
+    assert bundle["article"]["title"] == "Bees"
+    assert bundle["first_sentence_id"] == first["id"]
+    assert [first["next_id"], second["next_id"], third["next_id"]] == [second["id"], third["id"], None]
+    assert first["words"] == [{"word": "honey", "definition": "sweet food from bees"}]
+    assert second["words"] == []
+    assert bundle["progress"] == []
+
+    SRSScheduler.record_review(db, "amy", second["id"], "x", "good", True)
+    progress = client.get(f"/api/sync/session/{article_id}", params={"learner_id": "amy"}).json()["progress"]
+    assert [(p["sentence_id"], p["attempts"], p["last_result"]) for p in progress] == [(second["id"], 1, "good")]
+    assert client.get(f"/api/sync/session/{article_id}", params={"learner_id": "ben"}).json()["progress"] == []
+
+    ArticleService.bulk_archive(db, category="science")
+    assert client.get(f"/api/sync/session/{article_id}").status_code == 404
+    assert client.get("/api/sync/session/999999").status_code == 404
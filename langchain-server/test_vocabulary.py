@@ -0,0 +1,124 @@
+"""
+Vocabulary lemmatizer and index checks (VocabularyService)
+
+1. Inflected forms share one key and the key is a real word
+2. Look-alikes stay apart ("news" / "new", "hope" / "hop")
+3. Lookups by any form find the article and its sentences
+4. Two article creations adding the same new word don't collide
+5. Migration 0011 re-keys links made with the old lemmas
+
+Usage: python -m pytest test_vocabulary.py
+"""
+
+import pytest
+from sqlalchemy import event, text
+
+from app.database import SessionLocal
+
+from app.models import VocabularyWord
+from app.services import ArticleService
+from app.services.vocabulary_service import VocabularyService
+
+lemmatize = VocabularyService.lemmatize
+
+
+@pytest.mark.parametrize("forms, lemma", [
+    (["study", "studies", "studied", "studying"], "study"),
+    (["make", "makes", "making", "made"], "make"),
+    (["hope", "hopes", "hoping", "hoped"], "hope"),
+    (["run", "runs", "running", "ran"], "run"),
+    (["stop", "stopped", "stopping"], "stop"),
+    (["change", "changed", "changing"], "change"),
+    (["decide", "decided", "deciding"], "decide"),
+    (["agree", "agreed", "agrees"], "agree"),
+    (["watch", "watches", "watched"], "watch"),
+    (["travel", "traveled", "travelled"], "travel"),
+    (["play", "played", "playing"], "play"),
+    (["child", "children", "children's"], "child"),
+    (["Teacher", "teachers"], "teacher"),
+])
+def test_inflections_share_a_lemma(forms, lemma):
+    assert {form: lemmatize(form) for form in forms} == {form: lemma for form in forms}
+
+
+@pytest.mark.parametrize("word", [
+    "string", "thing", "bring", "spring", "morning", "news", "series", "speed", "need",
+    "bed", "red", "always", "this", "bus", "class", "focus", "analysis",
+])
+def test_words_that_only_look_inflected_stay_whole(word):
+    assert lemmatize(word) == word
+
+
+def test_look_alikes_stay_apart():
+    assert lemmatize("news") != lemmatize("new")
+    assert lemmatize("hoping") != lemmatize("hopping")
+    assert lemmatize("string") != lemmatize("str")
+    assert lemmatize("treated") == "treat" and lemmatize("created") == "create"
+
+
+def test_phrases_lemmatize_every_token():
+    assert VocabularyService.lemmatize_phrase("carried out") == "carry out"
+    assert VocabularyService.lemmatize_phrase("  ") == ""
+
+
+def test_lookups_match_any_form(db):
+    article = ArticleService.create_article(
+        db=db,
+        title="Studying late",
+        content="She studied all night. The news was good. He was making tea.",
+        vocabulary=[{"word": "study", "definition": "learn"}, {"word": "news", "definition": "reports"},
+                    {"word": "make", "definition": "create"}],
+    )
+
+    for form in ["study", "studies", "studied"]:
+        assert [a["article_id"] for a in VocabularyService.find_articles(db, form)] == [article.id]
+    assert [s["text"] for s in VocabularyService.find_sentences(db, "studies")] == ["She studied all night."]
+    assert [s["text"] for s in VocabularyService.find_sentences(db, "made")] == ["He was making tea."]
+    assert VocabularyService.find_articles(db, "new") == []
+
+
+def test_new_word_added_concurrently(db):
+    other = SessionLocal()
+    raced = []
+
+    # Another article adds "tide" after this one looked it up but before it inserts
+    @event.listens_for(db, "do_orm_execute")
+    def competing_insert(state):
+        if raced or not state.is_select:
+            return None
+        raced.append(True)
+        result = state.invoke_statement().freeze()
+        other.add(VocabularyWord(lemma="tide"))
+        other.commit()
+        return result()
+
+    words = VocabularyService._get_or_create_words(db, {"tide", "ocean"})
+    other.close()
+
+    assert raced and sorted(words) == ["ocean", "tide"]
+    assert all(w.id is not None for w in words.values())
+    assert db.query(VocabularyWord).count() == 2
+
+
+def test_migration_rekeys_old_lemmas(sqlite_db):
+    from app.migrations import upgrade
+
+    engine, Session = sqlite_db
+    db = Session()
+    article = ArticleService.create_article(
+        db=db, title="Old keys", content="We studied hard.",
+        vocabulary=[{"word": "studied", "definition": "learned"}],
+    )
+    # Simulate the index as the old rules built it
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE vocabulary_words SET lemma = 'studi'"))
+        conn.execute(text("UPDATE schema_version SET version = 10"))
+    db.close()
+
+    upgrade(engine)
+
+    db = Session()
+    assert [w.lemma for w in db.query(VocabularyWord)] == ["study"]
+    assert [a["article_id"] for a in VocabularyService.find_articles(db, "study")] == [article.id]
+    assert len(VocabularyService.find_sentences(db, "studies")) == 1
+    db.close()